@@ -0,0 +1,65 @@
+"""
+Import-time benchmark for MPCO_Model.
+
+Imports the package in fresh interpreters, reports the median import time and fails (exit code 1)
+if it exceeds the budget or if any heavy dependency is imported eagerly.
+
+    python benchmarks/import_time.py --runs 10 --budget-ms 50
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported when the feature that needs them is used
+HEAVY_MODULES = ['matplotlib', 'matplotlib.pyplot', 'pandas', 'STKO_to_python', 'h5py', 'scipy']
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import MPCO_Model
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure(runs):
+    """
+    Imports MPCO_Model in `runs` fresh interpreters and returns the timings and eagerly imported modules.
+    """
+    timings, heavy = [], set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(heavy=HEAVY_MODULES)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        heavy.update(result['heavy'])
+    return timings, sorted(heavy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='Number of fresh interpreters (default = 10).')
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='Maximum median import time in ms (default = 50).')
+    args = parser.parse_args(argv)
+
+    timings, heavy = measure(args.runs)
+    median_ms = statistics.median(timings) * 1e3
+    print(f"import MPCO_Model: median {median_ms:.1f} ms, min {min(timings) * 1e3:.1f} ms over {args.runs} runs")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(heavy)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: median import time above the {args.budget_ms:.1f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Offline benchmark suite for MPCO_Model.
+
+Generates a synthetic model (MPCO partitions, nodeMassCoord.out and modal.txt) at a configurable size,
+then times and measures the peak traced memory of the main code paths: mass parsing, story lumping,
+pushover / time-history extraction, Model construction and figure export. The results can be saved
+as a baseline and later runs compared against it.
+
+    python benchmarks/run_benchmarks.py --nodes 20000 --stories 20 --steps 1000 --save-baseline
+    python benchmarks/run_benchmarks.py --nodes 20000 --stories 20 --steps 1000
+
+The exit code is 1 when a case is slower or uses more memory than the baseline beyond the tolerance.
+Baselines are machine specific, so keep them local or generate them on the CI runner.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Differences below this are noise, whatever the relative tolerance
+MIN_SECONDS_DELTA = 0.005
+MIN_MB_DELTA = 1.0
+
+
+def measure(fn, setup=None, repeat=3):
+    """
+    Best wall time over `repeat` runs and peak traced memory (MB) of one extra traced run.
+    `setup` runs before every call and is not timed.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'peak_mb': peak / 2 ** 20}
+
+
+def build_cases(workdir, args):
+    """
+    Writes the synthetic model and returns the benchmark cases as {name: (fn, setup)}.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from MPCO_Model.core.model import Model
+    from MPCO_Model.data.synthetic import SyntheticDataSet, write_synthetic_model
+    from MPCO_Model.mass.dynamicMass import Masses
+    from MPCO_Model.plotting.plot import Plot
+
+    stories = write_synthetic_model(workdir, n_nodes=args.nodes, n_stories=args.stories, n_steps=args.steps,
+                                    n_modes=args.modes, partitions=args.partitions)
+    dataset = SyntheticDataSet(workdir, stories)
+    levels = list(range(1, len(stories) + 1))
+
+    def clear_mass_caches():
+        Masses._memo.clear()
+        Masses(workdir, stories).clear_cache()
+
+    def drop_memo():
+        Masses._memo.clear()
+
+    def warm_mass():
+        Masses(workdir, stories)._get_masses()
+
+    plot = Plot(dataset)
+
+    def render():
+        figure = Figure(figsize=(10, 6))
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        plot.time_history_plot(selection_set_id_verticalAxis=levels[-1], ax=ax, decimate='minmax')
+        figure.savefig(os.path.join(workdir, 'bench.svg'), format='svg')
+
+    return {
+        'mass_parse_text': (lambda: Masses(workdir, stories, use_cache=False)._get_masses(), None),
+        'mass_parse_sidecar': (lambda: Masses(workdir, stories)._get_masses(), drop_memo),
+        'mass_parse_memo': (lambda: Masses(workdir, stories)._get_masses(), warm_mass),
+        'mass_sidecar_write': (lambda: Masses(workdir, stories)._get_masses(), clear_mass_caches),
+        'story_lumping': (lambda: Masses(workdir, stories)._aggregated_mass_lumped(), warm_mass),
+        'story_lumping_streaming': (lambda: Masses(workdir, stories).stream_aggregated_masses(chunksize=50_000), None),
+        'modal_periods': (lambda: Masses(workdir, stories).get_first_periods(min(5, args.modes)), None),
+        'model_construction': (lambda: Model(dataset, stories=stories), None),
+        'pushover_extract': (lambda: Plot(dataset).extract_pushover(1, levels[-1], 0), None),
+        'pushover_extract_cached': (lambda: plot.extract_pushover(1, levels[-1], 0), lambda: plot.extract_pushover(1, levels[-1], 0)),
+        'time_history_extract': (lambda: Plot(dataset).extract_time_history('DISPLACEMENT', levels[-1], 0), None),
+        'time_history_batch': (
+            lambda: Plot(dataset).extract_batch([(r, s, [0, 1, 2]) for r in ('DISPLACEMENT', 'ACCELERATION') for s in levels]),
+            None,
+        ),
+        'story_drifts_streaming': (
+            lambda: Model(dataset, stories=stories).story_drifts(levels, direction=0, chunk_size=250),
+            None,
+        ),
+        'figure_export_svg': (render, None),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with a baseline and returns the list of regression messages.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if (current['seconds'] > reference['seconds'] * (1 + tolerance)
+                and current['seconds'] - reference['seconds'] > MIN_SECONDS_DELTA):
+            regressions.append(f"{name}: {current['seconds'] * 1e3:.1f} ms vs baseline {reference['seconds'] * 1e3:.1f} ms")
+        if (current['peak_mb'] > reference['peak_mb'] * (1 + tolerance)
+                and current['peak_mb'] - reference['peak_mb'] > MIN_MB_DELTA):
+            regressions.append(f"{name}: {current['peak_mb']:.1f} MB vs baseline {reference['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, default=20000)
+    parser.add_argument('--stories', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--modes', type=int, default=30)
+    parser.add_argument('--partitions', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cases', nargs='*', help='Only run these cases.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression (default = 0.25).')
+    parser.add_argument('--output', help='Also write the results to this JSON file.')
+    parser.add_argument('--workdir', help='Directory for the synthetic model (default = a temporary directory).')
+    args = parser.parse_args(argv)
+
+    config = {k: getattr(args, k) for k in ('nodes', 'stories', 'steps', 'modes', 'partitions')}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        print(f"Writing synthetic model ({config}) in {workdir}")
+        cases = build_cases(workdir, args)
+
+        results = {}
+        for name, (fn, setup) in cases.items():
+            if args.cases and name not in args.cases:
+                continue
+            results[name] = measure(fn, setup, args.repeat)
+            print(f"{name:28s} {results[name]['seconds'] * 1e3:10.2f} ms {results[name]['peak_mb']:10.2f} MB")
+
+    report = {'config': config, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline).")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('config') != config:
+        print(f"Baseline was recorded with {baseline.get('config')}; not comparing.")
+        return 0
+
+    regressions = compare(results, baseline['results'], args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,37 @@
-from .core.model import Model
+from typing import TYPE_CHECKING
 
-from .dataclass.plotProperties import Pushover_plot_parameters, TH_parameters_plot_parameters
+from MPCO_Model import _lazy
 
-from .plotting.plot import Plot
+# Public names and the module defining them. Modules are only imported on first access (PEP 562),
+# so `import MPCO_Model` does not pull matplotlib, pandas or STKO_to_python.
+_LAZY_IMPORTS = {
+    'Model': '.core.model',
+    'ModelCollection': '.core.collection',
+    'StackedResults': '.core.collection',
+    'Plot': '.plotting.plot',
+    'Pushover_plot_parameters': '.dataclass.plotProperties',
+    'TH_parameters_plot_parameters': '.dataclass.plotProperties',
+    'Masses': '.mass.dynamicMass',
+    'StoryIndex': '.mass.storyIndex',
+    'ModalReport': '.mass.modalReport',
+    'SpatialIndex': '.mass.spatialIndex',
+    'ResultsWarehouse': '.data.warehouse',
+    'SharedResults': '.data.sharedResults',
+    'SharedResultsView': '.data.sharedResults',
+}
 
-from .mass.dynamicMass import Masses
+__all__ = list(_LAZY_IMPORTS)
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
 
-__all__ = [
-    'Model',
-    'Plot',
-    'Pushover_plot_parameters', 
-    'TH_parameters_plot_parameters',
-    'Masses'
-]
\ No newline at end of file
+
+if TYPE_CHECKING:
+    from .core.model import Model
+    from .core.collection import ModelCollection, StackedResults
+    from .dataclass.plotProperties import Pushover_plot_parameters, TH_parameters_plot_parameters
+    from .plotting.plot import Plot
+    from .mass.dynamicMass import Masses
+    from .mass.storyIndex import StoryIndex
+    from .mass.modalReport import ModalReport
+    from .mass.spatialIndex import SpatialIndex
+    from .data.warehouse import ResultsWarehouse
+    from .data.sharedResults import SharedResults, SharedResultsView
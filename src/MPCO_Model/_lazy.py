@@ -0,0 +1,29 @@
+import importlib
+import sys
+
+
+def attach(package_name, lazy_imports):
+    """
+    Lazy exports of a package (PEP 562): the module defining a public name is only imported on first access,
+    then the value is stored in the package so later accesses are plain attribute lookups.
+
+    Used at the end of an `__init__`:
+
+        __getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
+
+    :param package_name: `__name__` of the package.
+    :param lazy_imports: Public name -> module defining it, relative to the package (e.g. '.core.model').
+    :return: The module-level `__getattr__` and `__dir__` functions.
+    """
+    def __getattr__(name):
+        module = lazy_imports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(lazy_imports))
+
+    return __getattr__, __dir__
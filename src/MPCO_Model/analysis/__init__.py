@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+from MPCO_Model import _lazy
+
+_LAZY_IMPORTS = {
+    'EnvelopeReducer': '.envelope',
+    'StoryResponse': '.storyResponse',
+    'story_drifts': '.storyResponse',
+    'story_shears': '.storyResponse',
+    'ResponseSpectrum': '.spectrum',
+    'response_spectrum': '.spectrum',
+    'floor_response_spectra': '.spectrum',
+    'StoryOperator': '.storyOperator',
+    'ElementEnvelope': '.elementEnvelope',
+    'element_envelopes': '.elementEnvelope',
+    'BilinearCurves': '.pushover',
+    'PerformancePoints': '.pushover',
+    'bilinearize': '.pushover',
+    'performance_points': '.pushover',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
+
+
+if TYPE_CHECKING:
+    from .envelope import EnvelopeReducer
+    from .storyResponse import StoryResponse, story_drifts, story_shears
+    from .spectrum import ResponseSpectrum, response_spectrum, floor_response_spectra
+    from .storyOperator import StoryOperator
+    from .elementEnvelope import ElementEnvelope, element_envelopes
+    from .pushover import BilinearCurves, PerformancePoints, bilinearize, performance_points
@@ -0,0 +1,213 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from MPCO_Model.analysis.envelope import EnvelopeReducer
+from MPCO_Model.data.mpcoFiles import ELEMENT_RESULTS_PATH, partition_files, read_rows, step_keys, step_time
+
+# Layout of the element results in the MPCO recorder files, one group per element type and integration rule:
+#   <MODEL_STAGE[k]>/RESULTS/ON_ELEMENTS/<RESULT>/<GROUP>/ID              element tags of the partition
+#   <MODEL_STAGE[k]>/RESULTS/ON_ELEMENTS/<RESULT>/<GROUP>/DATA/STEP_<i>   (elements, components) block
+
+
+@dataclass
+class ElementEnvelope:
+    """
+    Max / min / abs-max envelopes of an element result over every step, for the elements of one group.
+
+    The envelope arrays have shape (n_elements, n_components), rows aligned with `element_ids` (sorted).
+    """
+    group: str
+    element_ids: np.ndarray
+    max: np.ndarray
+    min: np.ndarray
+    abs_max: np.ndarray
+    step_of_max: np.ndarray
+    step_of_min: np.ndarray
+    step_of_abs_max: np.ndarray
+    time_of_abs_max: np.ndarray
+    n_steps: int
+
+    @property
+    def n_components(self) -> int:
+        return self.max.shape[1]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Envelopes as a DataFrame indexed by (element_id, component).
+        """
+        index = pd.MultiIndex.from_product([self.element_ids, range(self.n_components)],
+                                           names=['element_id', 'component'])
+        return pd.DataFrame({
+            'max': self.max.ravel(),
+            'min': self.min.ravel(),
+            'abs_max': self.abs_max.ravel(),
+            'step_of_max': self.step_of_max.ravel(),
+            'step_of_min': self.step_of_min.ravel(),
+            'step_of_abs_max': self.step_of_abs_max.ravel(),
+            'time_of_abs_max': self.time_of_abs_max.ravel(),
+        }, index=index)
+
+
+def element_groups(dataset, model_stage, results_name) -> dict:
+    """
+    Element groups of an element result in every partition.
+
+    :return: Group name -> list of (partition file, HDF5 path of the group).
+    """
+    import h5py
+
+    path = ELEMENT_RESULTS_PATH.format(model_stage=model_stage, results_name=results_name)
+    groups = {}
+    for filepath in partition_files(dataset):
+        with h5py.File(filepath, 'r') as f:
+            if path not in f:
+                continue
+            for name, group in f[path].items():
+                if isinstance(group, h5py.Group) and 'ID' in group and 'DATA' in group:
+                    groups.setdefault(name, []).append((filepath, f"{path}/{name}"))
+    if not groups:
+        raise KeyError(f"Element result '{results_name}' not found in {model_stage}.")
+    return groups
+
+
+def _paths_by_file(jobs) -> dict:
+    paths = {}
+    for _, filepath, group_path in jobs:
+        paths.setdefault(filepath, []).append(group_path)
+    return paths
+
+
+def _common_steps(jobs) -> int:
+    """
+    Number of steps written in every (partition file, group path) of `jobs`; a running analysis may have
+    written more steps in some partitions than in others.
+    """
+    import h5py
+
+    counts = []
+    for filepath, paths in _paths_by_file(jobs).items():
+        with h5py.File(filepath, 'r') as f:
+            counts.extend(len(step_keys(f[path]['DATA'])) for path in paths)
+    return min(counts, default=0)
+
+
+def _group_envelope(filepath, group_path, element_ids=None, chunk_steps=500, chunk_elements=None, n_steps=None):
+    """
+    Envelopes of one element group of one partition over its first `n_steps` steps (all if None), read in
+    blocks of `chunk_elements` × `chunk_steps`. Runs in the workers as well, so it opens the file itself and
+    returns only NumPy arrays.
+    """
+    import h5py
+
+    with h5py.File(filepath, 'r') as f:
+        group = f[group_path]
+        ids = np.asarray(group['ID'][()], dtype=np.int64).ravel()
+        rows = np.arange(ids.size) if element_ids is None else np.flatnonzero(np.isin(ids, element_ids))
+        data = group['DATA']
+        keys = step_keys(data)[:n_steps]
+        time = np.array([step_time(data[key]) for key in keys])
+        n_components = data[keys[0]].shape[1] if keys else 0
+
+        envelope = EnvelopeReducer((rows.size, n_components))
+        chunk_elements = rows.size if chunk_elements is None else int(chunk_elements)
+        for start in range(0, rows.size, max(chunk_elements, 1)):
+            chunk_rows = rows[start:start + chunk_elements]
+            reducer = EnvelopeReducer((chunk_rows.size, n_components))
+            block = np.empty((chunk_rows.size, n_components, min(chunk_steps, len(keys))))
+            for first in range(0, len(keys), chunk_steps):
+                chunk_keys = keys[first:first + chunk_steps]
+                for k, key in enumerate(chunk_keys):
+                    block[:, :, k] = read_rows(data[key], chunk_rows)
+                reducer.update(block[:, :, :len(chunk_keys)], first)
+
+            rows_slice = slice(start, start + chunk_rows.size)
+            for name in ('max', 'min', 'abs_max', 'step_of_max', 'step_of_min', 'step_of_abs_max'):
+                getattr(envelope, name)[rows_slice] = getattr(reducer, name)
+
+    return {
+        'element_ids': ids[rows],
+        'max': envelope.max,
+        'min': envelope.min,
+        'abs_max': envelope.abs_max,
+        'step_of_max': envelope.step_of_max,
+        'step_of_min': envelope.step_of_min,
+        'step_of_abs_max': envelope.step_of_abs_max,
+        'time_of_abs_max': time[np.maximum(envelope.step_of_abs_max, 0)] if time.size else np.full(envelope.shape, np.nan),
+        'n_steps': len(keys),
+    }
+
+
+def _merge_partitions(name, parts) -> ElementEnvelope:
+    """
+    Joins the envelopes of the partitions of one group, sorted by element ID.
+    """
+    parts = [p for p in parts if p['element_ids'].size]
+    if not parts:
+        return None
+    ids = np.concatenate([p['element_ids'] for p in parts])
+    order = np.argsort(ids, kind='stable')
+    merged = {key: np.concatenate([p[key] for p in parts])[order]
+              for key in ('max', 'min', 'abs_max', 'step_of_max', 'step_of_min', 'step_of_abs_max', 'time_of_abs_max')}
+    n_steps = {p['n_steps'] for p in parts}
+    if len(n_steps) != 1:
+        raise ValueError(f"Partitions of group '{name}' were reduced over different numbers of steps {sorted(n_steps)}.")
+    return ElementEnvelope(group=name, element_ids=ids[order], n_steps=n_steps.pop(), **merged)
+
+
+def element_envelopes(dataset, model_stage, results_name, groups=None, element_ids=None, chunk_steps=500,
+                      chunk_elements=None, max_workers=None) -> dict:
+    """
+    Streams an element result (forces, section deformations, ...) from the MPCO files and keeps the running
+    max / min / abs-max envelopes of every element and component, with the step where each extreme occurred.
+
+    Each element group of each partition is read in blocks of `chunk_elements` elements × `chunk_steps` steps,
+    so memory is bounded by the block size plus the envelopes, whatever the length of the analysis. Every
+    partition is reduced over the steps written in all of them, so the step indices of the envelopes refer
+    to the same steps.
+
+    Args:
+        dataset (MPCODataSet): Dataset to read.
+        model_stage (str): Model stage, e.g. 'MODEL_STAGE[5]'.
+        results_name (str): Element result name, e.g. 'force' or 'section.deformation'.
+        groups (list, optional): Element groups to reduce, by name or part of it (e.g. 'ElasticBeam3d').
+            Defaults to every group.
+        element_ids (array-like, optional): Elements to keep. Defaults to every element.
+        chunk_steps (int, optional): Steps read per block. Defaults to 500.
+        chunk_elements (int, optional): Elements read per block. Defaults to every element of the group.
+        max_workers (int, optional): Process pool size used across groups and partitions. None or 1 reduces
+            them in the current process.
+
+    Returns:
+        dict: Group name -> ElementEnvelope. Groups without any of the requested elements are left out.
+    """
+    available = element_groups(dataset, model_stage, results_name)
+    if groups is not None:
+        available = {name: parts for name, parts in available.items()
+                     if any(g == name or g in name for g in groups)}
+        if not available:
+            raise KeyError(f"No element group of '{results_name}' matches {list(groups)}.")
+    if element_ids is not None:
+        element_ids = np.asarray(element_ids, dtype=np.int64).ravel()
+
+    jobs = [(name, filepath, group_path) for name, parts in available.items() for filepath, group_path in parts]
+    args = (element_ids, int(chunk_steps), chunk_elements, _common_steps(jobs))
+    if max_workers is None or max_workers <= 1:
+        results = [_group_envelope(filepath, group_path, *args) for _, filepath, group_path in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_group_envelope, filepath, group_path, *args) for _, filepath, group_path in jobs]
+            results = [f.result() for f in futures]
+
+    per_group = {}
+    for (name, _, _), result in zip(jobs, results):
+        per_group.setdefault(name, []).append(result)
+
+    envelopes = {}
+    for name, parts in per_group.items():
+        envelope = _merge_partitions(name, parts)
+        if envelope is not None:
+            envelopes[name] = envelope
+    return envelopes
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+class EnvelopeReducer:
+    """
+    Running max / min / abs-max envelopes over chunks of steps, keeping the step where every
+    extreme occurred. Only the envelopes are stored, so memory does not grow with the number of steps.
+    """
+    def __init__(self, shape):
+        """
+        :param shape: Shape of the quantity at one step, e.g. (n_stories,) or (n_elements, n_components).
+        """
+        self.shape = tuple(shape) if np.iterable(shape) else (int(shape),)
+        self.max = np.full(self.shape, -np.inf)
+        self.min = np.full(self.shape, np.inf)
+        self.abs_max = np.full(self.shape, -np.inf)
+        self.step_of_max = np.full(self.shape, -1, dtype=np.int64)
+        self.step_of_min = np.full(self.shape, -1, dtype=np.int64)
+        self.step_of_abs_max = np.full(self.shape, -1, dtype=np.int64)
+        self.n_steps = 0
+
+    def update(self, values, step_offset=None):
+        """
+        Folds a chunk of steps into the envelopes.
+
+        :param values: Array of shape `shape + (n_chunk_steps,)`, steps along the last axis.
+        :param step_offset: Position of the first step of the chunk (default = steps seen so far).
+        """
+        values = np.asarray(values)
+        if values.shape[:-1] != self.shape:
+            raise ValueError(f"Expected chunk of shape {self.shape + ('n_steps',)}, got {values.shape}.")
+        if values.shape[-1] == 0:
+            return
+        if step_offset is None:
+            step_offset = self.n_steps
+
+        self._fold(values, self.max, self.step_of_max, step_offset, np.argmax, np.greater)
+        self._fold(values, self.min, self.step_of_min, step_offset, np.argmin, np.less)
+        self._fold(np.abs(values), self.abs_max, self.step_of_abs_max, step_offset, np.argmax, np.greater)
+        self.n_steps = max(self.n_steps, step_offset + values.shape[-1])
+
+    @staticmethod
+    def _fold(values, current, steps, step_offset, arg, better):
+        i = arg(values, axis=-1)
+        candidate = np.take_along_axis(values, i[..., None], axis=-1)[..., 0]
+        improved = better(candidate, current)
+        current[improved] = candidate[improved]
+        steps[improved] = i[improved] + step_offset
+
+    def to_frame(self, index=None, time=None) -> pd.DataFrame:
+        """
+        Envelopes as a DataFrame, one row per entry of a 1D envelope.
+
+        :param index: Row labels (e.g. story elevations).
+        :param time: Analysis time of every step, to add the time of the abs-max.
+        """
+        if len(self.shape) != 1:
+            raise ValueError("to_frame is only available for 1D envelopes.")
+        frame = pd.DataFrame({
+            'max': self.max,
+            'min': self.min,
+            'abs_max': self.abs_max,
+            'step_of_max': self.step_of_max,
+            'step_of_min': self.step_of_min,
+            'step_of_abs_max': self.step_of_abs_max,
+        }, index=index)
+        if time is not None:
+            frame['time_of_abs_max'] = np.asarray(time)[self.step_of_abs_max]
+        return frame
+
@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from MPCO_Model.data.curves import pad_curves
+
+# Bilinearization methods
+METHODS = ('EC8', 'ASCE41')
+
+
+def _dominant_sign(values, valid):
+    # Sign of the value of largest magnitude of every row, +1 for all-zero rows
+    rows = np.arange(values.shape[0])
+    sign = np.sign(values[rows, np.argmax(np.where(valid, np.abs(values), -np.inf), axis=1)])
+    sign[sign == 0] = 1.0
+    return sign
+
+
+def _prepare(x, y):
+    """
+    Pads the curves into (n_curves, n_points) arrays and flips the displacements and the shears of every curve
+    by their own dominant sign, so both are positive whatever the push direction and the sign convention of
+    the shear (e.g. base reactions opposite to the displacements). Invalid samples (padding, NaN) are marked
+    in `valid`.
+    """
+    x, y = pad_curves(x), pad_curves(y)
+    if x.shape != y.shape:
+        raise ValueError("`x` and `y` must have the same shape.")
+    valid = np.isfinite(x) & np.isfinite(y)
+    if not np.all(valid.any(axis=1)):
+        raise ValueError("Every curve needs at least one valid point.")
+
+    sign, shear_sign = _dominant_sign(x, valid), _dominant_sign(y, valid)
+    return x * sign[:, None], y * shear_sign[:, None], valid, sign, shear_sign
+
+
+def _interp_rows(xq, x, y, valid, last):
+    """
+    Row-wise linear interpolation of `y` at `xq` on the first crossing of `x >= xq`, over the points up to
+    `last` of every row. NaN where a row never reaches `xq`.
+    """
+    n, m = x.shape
+    rows = np.arange(n)
+    usable = valid & (np.arange(m)[None, :] <= last[:, None])
+    reached = usable & (x >= xq[:, None])
+    i = np.argmax(reached, axis=1)
+    found = reached[rows, i]
+
+    j = np.maximum(i - 1, 0)
+    x0, x1 = x[rows, j], x[rows, i]
+    y0, y1 = y[rows, j], y[rows, i]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.where(x1 > x0, (xq - x0) / (x1 - x0), 1.0)
+    out = y0 + np.clip(t, 0.0, 1.0) * (y1 - y0)
+    return np.where(found, out, np.nan)
+
+
+def _interp_rows_y(yq, x, y, valid, last):
+    """
+    Displacement of every row where the shear first reaches `yq`, on the points up to `last`.
+    """
+    return _interp_rows(yq, y, x, valid, last)
+
+
+@dataclass
+class BilinearCurves:
+    """
+    Bilinear idealizations of a batch of pushover curves, one entry per curve.
+
+    The idealized curve of curve `i` goes through (0, 0), (dy[i], Vy[i]) and (du[i], Vu[i]); EC8 curves
+    are elastic-perfectly plastic (Vu == Vy). `x` and `y` are the padded curves the idealization was fitted
+    on, with the displacements flipped by `sign` and the shears by `shear_sign` so that both are positive.
+    """
+    method: str
+    x: np.ndarray
+    y: np.ndarray
+    valid: np.ndarray
+    sign: np.ndarray
+    shear_sign: np.ndarray
+    ultimate_index: np.ndarray
+    Vmax: np.ndarray
+    d_Vmax: np.ndarray
+    du: np.ndarray
+    Vu: np.ndarray
+    dy: np.ndarray
+    Vy: np.ndarray
+    Ke: np.ndarray
+    alpha: np.ndarray
+    energy: np.ndarray
+    ductility: np.ndarray
+    overstrength: np.ndarray
+
+    def __len__(self):
+        return self.x.shape[0]
+
+    def curves(self) -> tuple:
+        """
+        Bilinear curves as (x, y) arrays of shape (n_curves, 3), in the original direction of every curve.
+        """
+        zeros = np.zeros_like(self.dy)
+        x = np.stack([zeros, self.dy, self.du], axis=1) * self.sign[:, None]
+        y = np.stack([zeros, self.Vy, self.Vu], axis=1) * self.shear_sign[:, None]
+        return x, y
+
+    def shear_at(self, d) -> np.ndarray:
+        """
+        Base shear of every pushover curve at displacement(s) `d` (positive, one per curve or a scalar),
+        interpolated on the curve up to its ultimate point. NaN beyond it.
+        """
+        d = np.broadcast_to(np.asarray(d, dtype=np.float64), self.dy.shape)
+        return _interp_rows(d, self.x, self.y, self.valid, self.ultimate_index)
+
+
+def bilinearize(x_array, y_array, method='EC8', ultimate_drop=0.2, design_shear=None, n_iterations=50,
+                tolerance=1e-8) -> BilinearCurves:
+    """
+    Bilinear idealization of many pushover curves at once.
+
+    The curves are padded with NaN into (n_curves, n_points) arrays and every step (peak, ultimate point,
+    areas, crossings) is computed over the whole batch with array operations, so a 1000-curve study is a
+    single call.
+
+    The ultimate point of a curve is its last point before the shear drops below (1 - `ultimate_drop`) of its
+    peak after the peak, or its last point. The energy is the area under the curve up to that point.
+
+    - 'EC8' (EN 1998-1 Annex B): elastic-perfectly plastic with Vy = Vmax and the same energy as the curve,
+      dy = 2 (du - E / Vy).
+    - 'ASCE41' (ASCE 41 / FEMA 356): the elastic branch is the secant through the curve at 0.6 Vy and the
+      post-yield branch ends on the curve at du; Vy is iterated so that both curves have the same energy.
+
+    Args:
+        x_array (array-like): Displacements, 2-D NaN-padded (e.g. `ModelCollection.pushover()['x_array']`)
+            or a list of 1-D arrays.
+        y_array (array-like): Base shears, same layout as `x_array`.
+        method (str, optional): 'EC8' or 'ASCE41'. Defaults to 'EC8'.
+        ultimate_drop (float, optional): Strength drop defining the ultimate point. Defaults to 0.2.
+        design_shear (float or array-like, optional): Design base shear(s), for the overstrength Vmax / Vd.
+        n_iterations (int, optional): Maximum iterations of the ASCE41 fit. Defaults to 50.
+        tolerance (float, optional): Relative convergence tolerance of the ASCE41 fit. Defaults to 1e-8.
+
+    Returns:
+        BilinearCurves: The idealized curves, ductility du / dy and overstrength of every curve.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Valid options are {list(METHODS)}.")
+
+    x, y, valid, sign, shear_sign = _prepare(x_array, y_array)
+    n, m = x.shape
+    rows = np.arange(n)
+    columns = np.arange(m)[None, :]
+
+    # Peak and ultimate point
+    peak = np.argmax(np.where(valid, y, -np.inf), axis=1)
+    Vmax = y[rows, peak]
+    dropped = valid & (columns > peak[:, None]) & (y < (1.0 - ultimate_drop) * Vmax[:, None])
+    last_valid = m - 1 - np.argmax(valid[:, ::-1], axis=1)
+    ultimate = np.where(dropped.any(axis=1), np.argmax(dropped, axis=1) - 1, last_valid)
+    du, Vu = x[rows, ultimate], y[rows, ultimate]
+
+    # Energy up to the ultimate point, trapezoids over the valid segments
+    segment = valid[:, :-1] & valid[:, 1:] & (columns[:, 1:] <= ultimate[:, None])
+    areas = 0.5 * (y[:, :-1] + y[:, 1:]) * np.diff(x, axis=1)
+    energy = np.where(segment, areas, 0.0).sum(axis=1)
+
+    if method == 'EC8':
+        Vy = Vmax.copy()
+        dy = 2.0 * (du - energy / Vy)
+        Vu = Vy.copy()
+        Ke = Vy / dy
+        alpha = np.zeros(n)
+    else:
+        Vy = Vmax.copy()
+        for _ in range(n_iterations):
+            # Secant stiffness through the curve at 0.6 Vy, on the rising branch
+            d60 = _interp_rows_y(0.6 * Vy, x, y, valid, peak)
+            Ke = 0.6 * Vy / d60
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Equal energy: E = Vy du / 2 + Vu (du - Vy / Ke) / 2
+                updated = (2.0 * energy - Vu * du) / (du - Vu / Ke)
+            updated = np.clip(updated, 0.0, Vmax)
+            converged = np.abs(updated - Vy) <= tolerance * np.abs(Vmax)
+            Vy = np.where(np.isfinite(updated), updated, Vy)
+            if np.all(converged | ~np.isfinite(updated)):
+                break
+        d60 = _interp_rows_y(0.6 * Vy, x, y, valid, peak)
+        Ke = 0.6 * Vy / d60
+        dy = Vy / Ke
+        with np.errstate(invalid='ignore', divide='ignore'):
+            alpha = (Vu - Vy) / (du - dy) / Ke
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ductility = du / dy
+        if design_shear is None:
+            overstrength = np.full(n, np.nan)
+        else:
+            overstrength = Vmax / np.broadcast_to(np.asarray(design_shear, dtype=np.float64), (n,))
+
+    return BilinearCurves(
+        method=method,
+        x=x,
+        y=y,
+        valid=valid,
+        sign=sign,
+        shear_sign=shear_sign,
+        ultimate_index=ultimate,
+        Vmax=Vmax,
+        d_Vmax=x[rows, peak],
+        du=du,
+        Vu=Vu,
+        dy=dy,
+        Vy=Vy,
+        Ke=Ke,
+        alpha=alpha,
+        energy=energy,
+        ductility=ductility,
+        overstrength=overstrength,
+    )
+
+
+@dataclass
+class PerformancePoints:
+    """
+    Target displacements of a batch of pushover curves for a demand spectrum (N2 / capacity spectrum method).
+
+    `T_star` is the period of the equivalent SDOF system, `d_elastic` the elastic SDOF demand, `d_target`
+    the MDOF target displacement and `V_target` the base shear of the pushover curve there (NaN when the
+    target lies beyond the ultimate point, flagged in `exceeded`).
+    """
+    T_star: np.ndarray
+    Se: np.ndarray
+    d_elastic: np.ndarray
+    d_target: np.ndarray
+    V_target: np.ndarray
+    ductility_demand: np.ndarray
+    exceeded: np.ndarray
+
+
+def performance_points(curves: BilinearCurves, periods, Sa, m_star, gamma=1.0, Tc=None) -> PerformancePoints:
+    """
+    Performance points of many pushover curves with the N2 method (EN 1998-1 Annex B), vectorized over the
+    curves.
+
+    The curves are transformed to the equivalent SDOF system (F* = F / gamma, d* = d / gamma), whose
+    elastic-perfectly plastic idealization gives T* = 2 pi sqrt(m* dy* / Fy*). The elastic demand
+    Se(T*) (T* / 2 pi)^2 is used as is in the medium and long period range; for T* < Tc it is amplified by
+    (1 + (qu - 1) Tc / T*) / qu, qu = Se(T*) m* / Fy*, when the system yields. As in EN 1998-1 B.5, the
+    SDOF target displacement is capped at 3 times the elastic demand.
+
+    Args:
+        curves (BilinearCurves): Bilinearized pushover curves (any method; Fy* = Vy / gamma, dy* = dy / gamma).
+        periods (array-like): Periods of the demand spectrum, increasing.
+        Sa (array-like): Elastic spectral accelerations, shape (n_periods,) shared by every curve or
+            (n_curves, n_periods), e.g. one record per curve. Same units as force / mass.
+        m_star (float or array-like): Mass of the equivalent SDOF system, sum(m_i phi_i), per curve or shared.
+        gamma (float or array-like, optional): Transformation factor m* / sum(m_i phi_i^2). Defaults to 1.
+        Tc (float or array-like, optional): Corner period of the spectrum. Defaults to
+            max(Sa T) / max(Sa), the period where the constant-velocity branch starts.
+
+    Returns:
+        PerformancePoints: The target displacement and shear of every curve.
+    """
+    n = len(curves)
+    periods = np.asarray(periods, dtype=np.float64)
+    Sa = np.broadcast_to(np.asarray(Sa, dtype=np.float64), (n, periods.size))
+    m_star = np.broadcast_to(np.asarray(m_star, dtype=np.float64), (n,))
+    gamma = np.broadcast_to(np.asarray(gamma, dtype=np.float64), (n,))
+    if Tc is None:
+        Tc = np.max(Sa * periods, axis=1) / np.max(Sa, axis=1)
+    Tc = np.broadcast_to(np.asarray(Tc, dtype=np.float64), (n,))
+
+    Fy_star = curves.Vy / gamma
+    dy_star = curves.dy / gamma
+    T_star = 2.0 * np.pi * np.sqrt(m_star * dy_star / Fy_star)
+
+    # Row-wise interpolation of the spectra at T*, on the shared period grid
+    i = np.clip(np.searchsorted(periods, T_star), 1, periods.size - 1)
+    rows = np.arange(n)
+    t = np.clip((T_star - periods[i - 1]) / (periods[i] - periods[i - 1]), 0.0, 1.0)
+    Se = Sa[rows, i - 1] + t * (Sa[rows, i] - Sa[rows, i - 1])
+
+    d_elastic = Se * (T_star / (2.0 * np.pi)) ** 2
+    qu = Se * m_star / Fy_star
+    short = (T_star < Tc) & (qu > 1.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        amplified = d_elastic / qu * (1.0 + (qu - 1.0) * Tc / T_star)
+    d_star = np.where(short, np.clip(amplified, d_elastic, 3.0 * d_elastic), d_elastic)
+
+    d_target = gamma * d_star
+    exceeded = d_target > curves.du
+    return PerformancePoints(
+        T_star=T_star,
+        Se=Se,
+        d_elastic=d_elastic,
+        d_target=d_target,
+        V_target=curves.shear_at(d_target),
+        ductility_demand=d_target / curves.dy,
+        exceeded=exceeded,
+    )
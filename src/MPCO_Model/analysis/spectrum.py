@@ -0,0 +1,211 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Default period grid of the spectra (s), log-spaced from 0.02 s to 5 s
+DEFAULT_PERIODS = np.logspace(np.log10(0.02), np.log10(5.0), 200)
+
+
+def period_grid(marks=None, periods=None):
+    """
+    Periods at which the spectra are evaluated: `periods` (or `DEFAULT_PERIODS`) plus the `marks`,
+    so the spectral ordinates at the reference periods are exact rather than interpolated.
+    """
+    periods = DEFAULT_PERIODS if periods is None else np.asarray(periods, dtype=np.float64)
+    if marks is None:
+        return np.unique(periods)
+    return np.unique(np.concatenate([periods, np.asarray(marks, dtype=np.float64)]))
+
+
+@dataclass
+class ResponseSpectrum:
+    """
+    Elastic response spectra of one or many acceleration records.
+
+    The spectral arrays have shape (..., n_damping, n_periods), where the leading axes follow the records
+    (e.g. one per floor). `marks` holds reference periods, such as the first modal periods of the model.
+    """
+    periods: np.ndarray
+    damping: np.ndarray
+    Sd: np.ndarray
+    Sv: np.ndarray
+    Sa: np.ndarray
+    PSa: np.ndarray
+    marks: Optional[np.ndarray] = None
+
+    def at(self, period, spectrum='Sa'):
+        """
+        Spectral values at any period, interpolated linearly between the computed periods.
+        """
+        values = getattr(self, spectrum)
+        flat = values.reshape(-1, values.shape[-1])
+        result = np.array([np.interp(period, self.periods, row) for row in flat])
+        return result.reshape(values.shape[:-1] + np.shape(period))
+
+
+def _recurrence_coefficients(omega, zeta, dt):
+    """
+    Exact piecewise-linear (Nigam-Jennings) recurrence coefficients for unit-mass oscillators.
+
+    Returns the eight arrays A, B, C, D, A', B', C', D' of
+        u[i+1] = A u[i] + B v[i] + C p[i] + D p[i+1]
+        v[i+1] = A'u[i] + B'v[i] + C'p[i] + D'p[i+1]
+    (Chopra, Dynamics of Structures, Table 5.2.1), vectorized over `omega` and `zeta`.
+    """
+    k = omega ** 2
+    sq = np.sqrt(1.0 - zeta ** 2)
+    omega_d = omega * sq
+    e = np.exp(-zeta * omega * dt)
+    s = np.sin(omega_d * dt)
+    c = np.cos(omega_d * dt)
+    r = zeta / sq
+
+    A = e * (r * s + c)
+    B = e * s / omega_d
+    C = (2 * zeta / (omega * dt)
+         + e * (((1 - 2 * zeta ** 2) / (omega_d * dt) - r) * s - (1 + 2 * zeta / (omega * dt)) * c)) / k
+    D = (1 - 2 * zeta / (omega * dt)
+         + e * ((2 * zeta ** 2 - 1) / (omega_d * dt) * s + 2 * zeta / (omega * dt) * c)) / k
+    Ap = -e * omega / sq * s
+    Bp = e * (c - r * s)
+    Cp = (-1 / dt + e * ((omega / sq + r / dt) * s + c / dt)) / k
+    Dp = (1 - e * (r * s + c)) / (k * dt)
+    return A, B, C, D, Ap, Bp, Cp, Dp
+
+
+def uniform_record(acceleration, time=None, dt=None):
+    """
+    Returns (acceleration, dt) on a uniform time step.
+
+    Records with a variable time step (adaptive analyses) are resampled linearly at their median step.
+    """
+    acceleration = np.asarray(acceleration, dtype=np.float64)
+    if time is None:
+        if dt is None:
+            raise ValueError("Either `time` or `dt` must be provided.")
+        return acceleration, float(dt)
+
+    time = np.asarray(time, dtype=np.float64)
+    steps = np.diff(time)
+    dt = float(np.median(steps))
+    if np.allclose(steps, dt, rtol=1e-6, atol=0.0):
+        return acceleration, dt
+
+    logging.info(f"Resampling a variable time step record at dt={dt}")
+    uniform_time = np.arange(time[0], time[-1] + 0.5 * dt, dt)
+    resampled = np.apply_along_axis(lambda a: np.interp(uniform_time, time, a), -1, acceleration)
+    return resampled, dt
+
+
+def response_spectrum(acceleration, periods, damping=0.05, dt=None, time=None, marks=None) -> ResponseSpectrum:
+    """
+    Elastic response spectrum of an acceleration record for many periods and damping ratios at once.
+
+    Every (damping, period) oscillator is advanced together with the exact piecewise-linear recurrence, so
+    the loop runs over time steps only, not over periods. Sa is the peak absolute acceleration of the
+    oscillator and PSa = omega² Sd.
+
+    Args:
+        acceleration (array-like): Base (or floor) acceleration record, shape (n_steps,).
+        periods (array-like): Oscillator periods, all > 0.
+        damping (float or array-like, optional): Damping ratio(s), 0 <= zeta < 1. Defaults to 0.05.
+        dt (float, optional): Time step of the record.
+        time (array-like, optional): Time of every sample, used instead of `dt`.
+        marks (array-like, optional): Reference periods stored with the spectrum.
+
+    Returns:
+        ResponseSpectrum: Spectra of shape (n_damping, n_periods).
+    """
+    acceleration, dt = uniform_record(acceleration, time=time, dt=dt)
+    if acceleration.ndim != 1:
+        raise ValueError("`acceleration` must be a single record; use `floor_response_spectra` for many.")
+
+    periods = np.atleast_1d(np.asarray(periods, dtype=np.float64))
+    damping = np.atleast_1d(np.asarray(damping, dtype=np.float64))
+    if np.any(periods <= 0):
+        raise ValueError("`periods` must be positive.")
+    if np.any((damping < 0) | (damping >= 1)):
+        raise ValueError("`damping` must be in [0, 1).")
+
+    # One oscillator per (damping, period) pair
+    zeta, T = np.meshgrid(damping, periods, indexing='ij')
+    omega = (2 * np.pi / T).ravel()
+    zeta = zeta.ravel()
+    A, B, C, D, Ap, Bp, Cp, Dp = _recurrence_coefficients(omega, zeta, dt)
+
+    # Unit-mass load p = -ag
+    p = -acceleration
+    u = np.zeros_like(omega)
+    v = np.zeros_like(omega)
+    max_u = np.zeros_like(omega)
+    max_v = np.zeros_like(omega)
+    max_a = np.zeros_like(omega)
+    two_zeta_omega = 2 * zeta * omega
+    k = omega ** 2
+
+    for i in range(p.size - 1):
+        u, v = A * u + B * v + C * p[i] + D * p[i + 1], Ap * u + Bp * v + Cp * p[i] + Dp * p[i + 1]
+        np.maximum(max_u, np.abs(u), out=max_u)
+        np.maximum(max_v, np.abs(v), out=max_v)
+        # Absolute acceleration from equilibrium: a + ag = -(2 zeta omega v + omega² u)
+        np.maximum(max_a, np.abs(two_zeta_omega * v + k * u), out=max_a)
+
+    shape = (damping.size, periods.size)
+    Sd = max_u.reshape(shape)
+    return ResponseSpectrum(
+        periods=periods,
+        damping=damping,
+        Sd=Sd,
+        Sv=max_v.reshape(shape),
+        Sa=max_a.reshape(shape),
+        PSa=Sd * (2 * np.pi / periods) ** 2,
+        marks=None if marks is None else np.asarray(marks, dtype=np.float64),
+    )
+
+
+def _spectrum_arrays(acceleration, periods, damping, dt):
+    spectrum = response_spectrum(acceleration, periods, damping=damping, dt=dt)
+    return spectrum.Sd, spectrum.Sv, spectrum.Sa, spectrum.PSa
+
+
+def floor_response_spectra(accelerations, periods, damping=0.05, dt=None, time=None, marks=None,
+                           max_workers=None) -> ResponseSpectrum:
+    """
+    Floor response spectra of many acceleration records, optionally computed in a process pool.
+
+    Args:
+        accelerations (array-like): Records, shape (n_floors, n_steps).
+        periods (array-like): Oscillator periods.
+        damping (float or array-like, optional): Damping ratio(s). Defaults to 0.05.
+        dt (float, optional): Time step of the records.
+        time (array-like, optional): Time of every sample, used instead of `dt`.
+        marks (array-like, optional): Reference periods stored with the spectra (e.g. modal periods).
+        max_workers (int, optional): Process pool size. None or 1 computes the floors in the current process.
+
+    Returns:
+        ResponseSpectrum: Spectra of shape (n_floors, n_damping, n_periods).
+    """
+    accelerations, dt = uniform_record(np.atleast_2d(accelerations), time=time, dt=dt)
+    periods = np.atleast_1d(np.asarray(periods, dtype=np.float64))
+    damping = np.atleast_1d(np.asarray(damping, dtype=np.float64))
+
+    if max_workers is None or max_workers <= 1:
+        results = [_spectrum_arrays(a, periods, damping, dt) for a in accelerations]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_spectrum_arrays, a, periods, damping, dt) for a in accelerations]
+            results = [f.result() for f in futures]
+
+    Sd, Sv, Sa, PSa = (np.stack(arrays) for arrays in zip(*results))
+    return ResponseSpectrum(
+        periods=periods,
+        damping=damping,
+        Sd=Sd,
+        Sv=Sv,
+        Sa=Sa,
+        PSa=PSa,
+        marks=None if marks is None else np.asarray(marks, dtype=np.float64),
+    )
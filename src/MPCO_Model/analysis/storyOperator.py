@@ -0,0 +1,173 @@
+import numpy as np
+import scipy.sparse as sp
+
+from MPCO_Model.mass.storyIndex import StoryIndex
+
+
+class StoryOperator:
+    """
+    Sparse (n_levels × n_nodes) operator that sums nodal quantities per story level.
+
+    The operator is built once from the node coordinates and the story elevations (same level
+    assignment as `StoryIndex`), and applying it to a nodal block of shape (n_nodes, ...) is a single
+    sparse product over every trailing axis, e.g. every component and every time step at once.
+    Row `i` of the result is the level at elevation `stories[i]`.
+    """
+    def __init__(self, node_ids, z, stories, weights=None):
+        """
+        :param node_ids: Node IDs, one per node.
+        :param z: Node z coordinates, aligned with `node_ids`.
+        :param stories: Story elevations, in ascending order.
+        :param weights: Optional nodal weights (e.g. masses), shape (n_nodes,) or (n_nodes, k),
+                        used by `weighted_average`.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        z = np.asarray(z, dtype=np.float64)
+        if node_ids.shape != z.shape:
+            raise ValueError("`node_ids` and `z` must have the same length.")
+
+        # Columns follow the sorted node IDs so blocks read by node ID line up without reordering
+        order = np.argsort(node_ids, kind='stable')
+        self.node_ids = node_ids[order]
+        if np.any(np.diff(self.node_ids) == 0):
+            raise ValueError("`node_ids` must be unique.")
+        self.z = z[order]
+
+        self.index = StoryIndex(stories, self.z)
+        self.stories = self.index.stories
+        self.n_levels = self.index.n_stories
+        self.n_nodes = self.node_ids.size
+
+        levels = self.index.story_of_node
+        columns = np.flatnonzero(levels >= 0)
+        shape = (self.n_levels, self.n_nodes)
+        self.matrix = sp.csr_matrix((np.ones(columns.size), (levels[columns], columns)), shape=shape)
+        # Same pattern weighted by the elevation, for the overturning moments
+        self.z_matrix = sp.csr_matrix((self.z[columns], (levels[columns], columns)), shape=shape)
+
+        self.weights = None
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape[0] != self.n_nodes:
+                raise ValueError(f"Expected {self.n_nodes} nodal weights, got {weights.shape[0]}.")
+            self.weights = weights[order]
+
+    @classmethod
+    def from_masses(cls, masses, columns=('Mx', 'My', 'Mz')):
+        """
+        Operator over the nodes of a mass file, weighted by the translational masses.
+
+        :param masses: Masses instance with `stories` defined.
+        :param columns: Mass columns used as weights, one per result component.
+        """
+        if masses.stories is None:
+            raise ValueError("Stories are not defined. Please define `stories` before using this method.")
+        df = masses._get_masses()
+        return cls(df['nodeID'].to_numpy(), df['zCrd'].to_numpy(), masses.stories,
+                   weights=df[list(columns)].to_numpy(dtype=np.float64))
+
+    def __repr__(self):
+        return f"<StoryOperator {self.n_levels} levels × {self.n_nodes} nodes, {self.matrix.nnz} entries>"
+
+    def positions(self, node_ids):
+        """
+        Columns of the operator for the given node IDs.
+
+        :raises KeyError: If a node is not part of the operator.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        positions = np.searchsorted(self.node_ids, node_ids)
+        positions = np.clip(positions, 0, max(self.n_nodes - 1, 0))
+        missing = self.node_ids[positions] != node_ids if self.n_nodes else np.ones(node_ids.shape, bool)
+        if np.any(missing):
+            raise KeyError(f"{int(missing.sum())} node(s) not in the story operator, e.g. {node_ids[missing][:5].tolist()}.")
+        return positions
+
+    def _columns(self, matrix, node_ids):
+        if node_ids is None:
+            return matrix
+        return matrix[:, self.positions(node_ids)]
+
+    @staticmethod
+    def _product(matrix, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Expected {matrix.shape[1]} nodal rows, got {values.shape[0]}.")
+        flat = values.reshape(values.shape[0], -1)
+        return np.asarray(matrix @ flat).reshape((matrix.shape[0],) + values.shape[1:])
+
+    def apply(self, values, node_ids=None):
+        """
+        Sums a nodal block per level.
+
+        :param values: Array of shape (n_nodes, ...), e.g. (n_nodes, n_components, n_steps).
+        :param node_ids: Node IDs of the rows of `values` when they are a subset (or another order)
+                         of the operator nodes. Defaults to the operator nodes.
+        :return: Array of shape (n_levels, ...).
+        """
+        matrix = self._columns(self.matrix, node_ids)
+        return self._product(matrix, values)
+
+    def story_forces(self, values, node_ids=None):
+        """
+        Level forces: sum of the nodal forces of every level. Alias of `apply`.
+        """
+        return self.apply(values, node_ids)
+
+    def story_shears(self, values, node_ids=None):
+        """
+        Story shears, with the same convention as `storyResponse.story_shears`: row `j` is the story between
+        levels `j` and `j + 1`, labelled with its upper level `stories[j + 1]`, and carries the forces of its
+        upper level and every level above it, V[j] = sum(F[j+1:]).
+
+        :return: Array of shape (n_levels - 1, ...).
+        """
+        forces = self.apply(values, node_ids)
+        return np.cumsum(forces[::-1], axis=0)[::-1][1:]
+
+    def overturning_moments(self, values, node_ids=None):
+        """
+        Overturning moment at every level elevation from horizontal nodal forces,
+        M[i] = sum over the nodes above level `i` of F * (z - stories[i]).
+
+        :return: Array of shape (n_levels, ...).
+        """
+        forces = self.apply(values, node_ids)
+        z_matrix = self._columns(self.z_matrix, node_ids)
+        moments = self._product(z_matrix, values)
+        levels = self.stories.reshape((-1,) + (1,) * (forces.ndim - 1))
+        return self._sum_above(moments) - levels * self._sum_above(forces)
+
+    def weighted_average(self, values, node_ids=None, weights=None):
+        """
+        Weighted average of a nodal block per level, e.g. mass-weighted story displacements.
+
+        :param values: Array of shape (n_nodes, ...).
+        :param weights: Nodal weights broadcastable against `values` along the leading axes, e.g.
+                        (n_nodes,) or (n_nodes, n_components). Defaults to the operator weights.
+        :return: Array of shape (n_levels, ...); NaN for levels with zero total weight.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if weights is None:
+            if self.weights is None:
+                raise ValueError("The operator has no weights; pass `weights` explicitly.")
+            weights = self.weights if node_ids is None else self.weights[self.positions(node_ids)]
+        weights = np.asarray(weights, dtype=np.float64)
+        weights = weights.reshape(weights.shape + (1,) * (values.ndim - weights.ndim))
+
+        matrix = self._columns(self.matrix, node_ids)
+        numerator = self._product(matrix, values * weights)
+        # Trailing singleton axes of the weights broadcast over the steps
+        denominator = self._product(matrix, weights)
+        safe = np.where(denominator != 0, denominator, 1.0)
+        return np.where(denominator != 0, numerator / safe, np.nan)
+
+    @staticmethod
+    def _sum_above(level_values):
+        """
+        Sum of the values of every level strictly above each level.
+        """
+        total = np.cumsum(level_values[::-1], axis=0)[::-1]
+        above = np.zeros_like(total)
+        above[:-1] = total[1:]
+        return above
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from MPCO_Model.analysis.envelope import EnvelopeReducer
+from MPCO_Model.data.mpcoFiles import NodalResultStream
+from MPCO_Model.data.nodalResults import selection_set_node_ids
+
+
+@dataclass
+class StoryResponse:
+    """
+    Story-level time histories and their peak envelopes.
+
+    `histories` has shape (n_stories, n_steps), one row per story, where story `i` is the story between
+    levels `i` and `i + 1` and is labelled with the elevation of its upper level. It is None when the
+    histories were not kept.
+    """
+    quantity: str
+    stories: np.ndarray
+    time: np.ndarray
+    envelope: pd.DataFrame
+    histories: Optional[np.ndarray] = None
+
+
+def _level_groups(dataset, stories, level_selection_sets, index=None):
+    """
+    Node IDs of every level selection set, checked against the story elevations.
+    """
+    if stories is None:
+        raise ValueError("Stories are not defined. Please define `stories` before using this method.")
+    if len(level_selection_sets) != len(stories):
+        raise ValueError(
+            f"Expected one selection set per level ({len(stories)}), got {len(level_selection_sets)}."
+        )
+    if len(stories) < 2:
+        raise ValueError("At least two levels are needed to define a story.")
+    if index is not None:
+        return [index.node_ids(set_id) for set_id in level_selection_sets]
+    return [selection_set_node_ids(dataset, set_id) for set_id in level_selection_sets]
+
+
+def _stream_story_quantity(dataset, stories, level_selection_sets, results_name, operation, model_stage,
+                           chunk_size, keep_histories, to_story, index=None):
+    """
+    Streams a nodal result reduced per level and maps every chunk to a story quantity with `to_story`,
+    folding it into the envelopes as it goes.
+    """
+    groups = _level_groups(dataset, stories, level_selection_sets, index)
+    n_stories = len(stories) - 1
+
+    reducer = EnvelopeReducer((n_stories,))
+    time_chunks, history_chunks = [], []
+
+    stream = NodalResultStream(dataset, model_stage, results_name, groups, operation=operation, chunk_size=chunk_size,
+                               index=index, selection_set_ids=level_selection_sets)
+    for steps, time, level_values in stream:
+        story_values = to_story(level_values)
+        reducer.update(story_values, steps.start)
+        time_chunks.append(time)
+        if keep_histories:
+            history_chunks.append(story_values)
+
+    time = np.concatenate(time_chunks) if time_chunks else np.empty(0)
+    histories = np.concatenate(history_chunks, axis=1) if keep_histories and history_chunks else None
+    upper_levels = np.asarray(stories, dtype=np.float64)[1:]
+    envelope = reducer.to_frame(index=pd.Index(upper_levels, name='story'), time=time)
+    return upper_levels, time, envelope, histories
+
+
+def story_drifts(dataset, stories, level_selection_sets, direction, model_stage,
+                 results_name='DISPLACEMENT', chunk_size=1000, keep_histories=True, index=None) -> StoryResponse:
+    """
+    Interstory drift ratio time histories of every story, computed in one vectorized pass per chunk of steps.
+
+    The displacement of a level is the mean over the nodes of its selection set, and the drift ratio of
+    story `i` is (u[i+1] - u[i]) / (stories[i+1] - stories[i]).
+
+    Args:
+        dataset (MPCODataSet): Dataset to read from.
+        stories (array-like): Level elevations, in ascending order.
+        level_selection_sets (list): One selection set ID per level, aligned with `stories`.
+        direction (int): Displacement component.
+        model_stage (str): Model stage to read.
+        results_name (str, optional): Nodal displacement result. Defaults to 'DISPLACEMENT'.
+        chunk_size (int, optional): Steps read per chunk; bounds the memory used by the envelopes.
+        keep_histories (bool, optional): Keep the (n_stories, n_steps) drift histories. Defaults to True.
+        index (SelectionIndex, optional): Resolves the level selection sets and their rows from its cache.
+
+    Returns:
+        StoryResponse: Drift ratio histories and envelopes.
+    """
+    heights = np.diff(np.asarray(stories, dtype=np.float64))
+    if np.any(heights <= 0):
+        raise ValueError("`stories` must be sorted in strictly ascending order.")
+
+    def to_story(level_values):
+        return np.diff(level_values[:, direction, :], axis=0) / heights[:, None]
+
+    upper_levels, time, envelope, histories = _stream_story_quantity(
+        dataset, stories, level_selection_sets, results_name, 'Mean', model_stage, chunk_size, keep_histories, to_story,
+        index=index,
+    )
+    return StoryResponse('drift_ratio', upper_levels, time, envelope, histories)
+
+
+def story_shears(dataset, stories, level_selection_sets, force_results_name, direction, model_stage,
+                 scaling_factor=1.0, chunk_size=1000, keep_histories=True, index=None) -> StoryResponse:
+    """
+    Story shear time histories from a nodal force result (e.g. inertial or applied forces).
+
+    The force of a level is the sum over the nodes of its selection set, and the shear of story `i` is the
+    sum of the forces of every level above it, V[i] = sum(F[i+1:]).
+
+    Args:
+        dataset (MPCODataSet): Dataset to read from.
+        stories (array-like): Level elevations, in ascending order.
+        level_selection_sets (list): One selection set ID per level, aligned with `stories`.
+        force_results_name (str): Nodal force result to accumulate.
+        direction (int): Force component.
+        model_stage (str): Model stage to read.
+        scaling_factor (float, optional): Factor applied to the shears, e.g. -1 to flip the sign convention.
+        chunk_size (int, optional): Steps read per chunk; bounds the memory used by the envelopes.
+        keep_histories (bool, optional): Keep the (n_stories, n_steps) shear histories. Defaults to True.
+        index (SelectionIndex, optional): Resolves the level selection sets and their rows from its cache.
+
+    Returns:
+        StoryResponse: Story shear histories and envelopes.
+    """
+    def to_story(level_values):
+        forces = level_values[1:, direction, :]
+        # Reverse cumulative sum: the shear of a story carries every level above it
+        return scaling_factor * np.cumsum(forces[::-1], axis=0)[::-1]
+
+    upper_levels, time, envelope, histories = _stream_story_quantity(
+        dataset, stories, level_selection_sets, force_results_name, 'Sum', model_stage, chunk_size, keep_histories, to_story,
+        index=index,
+    )
+    return StoryResponse('story_shear', upper_levels, time, envelope, histories)
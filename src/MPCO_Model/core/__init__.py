@@ -1,5 +1,19 @@
-from .model import Model
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "Model",
-]
\ No newline at end of file
+from MPCO_Model import _lazy
+
+_LAZY_IMPORTS = {
+    "Model": ".model",
+    "ModelCollection": ".collection",
+    "StackedResults": ".collection",
+    "Profiler": ".profiling",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
+
+
+if TYPE_CHECKING:
+    from .model import Model
+    from .collection import ModelCollection, StackedResults
+    from .profiling import Profiler
@@ -0,0 +1,291 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+
+def _pushover_task(model, **kwargs):
+    return model.plot.extract_pushover(**kwargs)
+
+
+def _time_history_peaks_task(model, **kwargs):
+    results = model.plot.extract_time_history(**kwargs)
+    x_array, y_array = results['x_array'], results['y_array']
+    i = int(np.argmax(np.abs(y_array)))
+    return {
+        'peak': np.float64(np.abs(y_array[i])),
+        'time_of_peak': np.float64(x_array[i]),
+        'max': np.float64(np.max(y_array)),
+        'min': np.float64(np.min(y_array)),
+    }
+
+
+def _mass_summary_task(model, **kwargs):
+    if model.mass is None:
+        raise ValueError(f"Model '{model.name}' has no mass file or no stories defined.")
+    lumped = model.mass._aggregated_mass_lumped(**kwargs)
+    return {
+        'story': lumped['story'].to_numpy(dtype=np.float64),
+        'masses': lumped[model.mass.MASS_COLUMNS].to_numpy(dtype=np.float64),
+    }
+
+
+def _modal_periods_task(model, n=5, modal_filename='modal.txt'):
+    # The modal report does not depend on the mass file or the stories
+    return {'periods': np.asarray(model.modal_report(modal_filename).periods(n), dtype=np.float64)}
+
+
+def _warehouse_task(model, **kwargs):
+    from MPCO_Model.data.warehouse import model_payload
+    return model_payload(model, **kwargs)
+
+
+# How ModelCollection handles a task failing on one model
+ERROR_MODES = ('raise', 'collect')
+
+# Extraction tasks that can be run over a collection: name -> function(model, **kwargs) -> dict of arrays
+TASKS = {
+    'pushover': _pushover_task,
+    'time_history_peaks': _time_history_peaks_task,
+    'mass_summary': _mass_summary_task,
+    'modal_periods': _modal_periods_task,
+    'warehouse': _warehouse_task,
+}
+
+
+def open_model(directory, recorder_name='results', stories=None, dataset_kwargs=None, snapshot=False):
+    """
+    Opens a Model from its directory. Each process opens its own dataset so no HDF5 handle is shared.
+    """
+    from MPCO_Model.core.model import Model
+
+    return Model.open(directory, recorder_name, stories=stories, snapshot=snapshot, dataset_kwargs=dataset_kwargs)
+
+
+@dataclass
+class TaskError:
+    """
+    Failure of a task on one model, yielded by `ModelCollection.imap` with `errors='collect'`.
+    """
+    name: str
+    task: str
+    error: str
+
+
+def _run_task(name, directory, recorder_name, stories, dataset_kwargs, snapshot, task, kwargs):
+    """
+    Worker entry point: opens the model, runs one task and returns only NumPy data to the parent.
+    A failure is returned as a TaskError so it reaches the parent without pickling the exception.
+    """
+    try:
+        model = open_model(directory, recorder_name, stories, dataset_kwargs, snapshot)
+        return name, TASKS[task](model, **kwargs)
+    except Exception as e:
+        return name, TaskError(name, task, f"{type(e).__name__}: {e}")
+
+
+def _stack(arrays):
+    """
+    Stacks arrays along a new first axis, padding with NaN when their shapes differ.
+    """
+    arrays = [np.asarray(a) for a in arrays]
+    shapes = {a.shape for a in arrays}
+    if len(shapes) == 1:
+        return np.stack(arrays)
+
+    ndim = max(a.ndim for a in arrays)
+    arrays = [a.reshape(a.shape + (1,) * (ndim - a.ndim)) for a in arrays]
+    max_shape = tuple(max(a.shape[d] for a in arrays) for d in range(ndim))
+    out = np.full((len(arrays),) + max_shape, np.nan)
+    for i, a in enumerate(arrays):
+        out[(i,) + tuple(slice(0, s) for s in a.shape)] = a
+    return out
+
+
+@dataclass
+class StackedResults:
+    """
+    Results of one task over a collection, stacked along the first axis in the order of `names`.
+    Curves of different length are padded with NaN, and so are the rows of the models listed in `errors`.
+    """
+    names: List[str]
+    data: Dict[str, np.ndarray] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.data[key]
+
+    def keys(self):
+        return self.data.keys()
+
+    def row(self, name) -> int:
+        return self.names.index(name)
+
+    def get(self, name) -> Dict[str, np.ndarray]:
+        """
+        Returns the results of one model by name.
+        """
+        i = self.row(name)
+        return {key: values[i] for key, values in self.data.items()}
+
+
+class ModelCollection:
+    """
+    A set of models (e.g. the records of an IDA or the variants of a parametric study) whose
+    extractions are run in a process pool.
+
+    Only the directories are kept in the parent process. Every worker opens its own MPCODataSet,
+    so HDF5 handles are never shared between processes, and only NumPy arrays are sent back.
+    """
+    def __init__(self, directories, recorder_name='results', names=None, stories=None,
+                 max_workers=None, dataset_kwargs=None, snapshot=False):
+        """
+        :param directories: Model directories (the `hdf5_directory` of each dataset).
+        :param recorder_name: MPCO recorder name passed to MPCODataSet.
+        :param names: Model names used to index the results (default = directory basenames).
+        :param stories: Story elevations passed to every Model.
+        :param max_workers: Size of the process pool. 0 or 1 runs everything in the current process.
+        :param dataset_kwargs: Extra keyword arguments passed to MPCODataSet.
+        :param snapshot: Open the models from their metadata snapshots, see `Model.open`.
+        """
+        self.directories = [os.fspath(d) for d in directories]
+        if names is None:
+            names = [os.path.basename(os.path.normpath(d)) for d in self.directories]
+        if len(names) != len(self.directories):
+            raise ValueError("`names` must have the same length as `directories`.")
+        if len(set(names)) != len(names):
+            raise ValueError("Model names must be unique.")
+
+        self.names = list(names)
+        self.recorder_name = recorder_name
+        self.stories = stories
+        self.max_workers = max_workers
+        self.dataset_kwargs = dataset_kwargs or {}
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return len(self.directories)
+
+    def __repr__(self):
+        return f"<ModelCollection {len(self)} models>"
+
+    def model(self, name):
+        """
+        Opens a single Model of the collection in the current process.
+        """
+        directory = self.directories[self.names.index(name)]
+        return open_model(directory, self.recorder_name, self.stories, self.dataset_kwargs, self.snapshot)
+
+    def models(self):
+        """
+        Yields the Models of the collection one at a time, opened in the current process.
+        """
+        for directory in self.directories:
+            yield open_model(directory, self.recorder_name, self.stories, self.dataset_kwargs, self.snapshot)
+
+    def imap(self, task, ordered=True, errors='raise', **kwargs):
+        """
+        Runs an extraction task over every model and yields `(name, result)` pairs.
+
+        :param task: Task name, one of `TASKS`.
+        :param ordered: If True, results are yielded in collection order; otherwise as they complete.
+        :param errors: 'raise' to stop at the first failing model (RuntimeError naming it), or 'collect' to
+                       yield a TaskError as the result of every failing model and carry on with the others.
+        :param kwargs: Keyword arguments forwarded to the task.
+        """
+        if task not in TASKS:
+            raise ValueError(f"Unknown task '{task}'. Valid options are {list(TASKS)}.")
+        if errors not in ERROR_MODES:
+            raise ValueError(f"Unknown error mode '{errors}'. Valid options are {list(ERROR_MODES)}.")
+        for name, result in self._imap(task, ordered, kwargs):
+            if isinstance(result, TaskError) and errors == 'raise':
+                raise RuntimeError(f"Task '{task}' failed for model '{name}': {result.error}")
+            yield name, result
+
+    def _imap(self, task, ordered, kwargs):
+
+        jobs = [
+            (name, directory, self.recorder_name, self.stories, self.dataset_kwargs, self.snapshot, task, kwargs)
+            for name, directory in zip(self.names, self.directories)
+        ]
+
+        if self.max_workers is not None and self.max_workers <= 1:
+            for job in jobs:
+                yield _run_task(*job)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(_run_task, *job) for job in jobs]
+            iterator = futures if ordered else as_completed(futures)
+            for future in iterator:
+                yield future.result()
+
+    def run(self, task, errors='raise', **kwargs) -> StackedResults:
+        """
+        Runs an extraction task over every model and stacks the results in collection order.
+
+        :param task: Task name, one of `TASKS`.
+        :param errors: 'raise' or 'collect', see `imap`. Collected failures are reported in
+                       `StackedResults.errors` and their rows are NaN.
+        :param kwargs: Keyword arguments forwarded to the task.
+        :return: A StackedResults indexed by model name.
+        """
+        results = dict(self.imap(task, ordered=False, errors=errors, **kwargs))
+        failed = {name: r.error for name, r in results.items() if isinstance(r, TaskError)}
+        succeeded = [results[name] for name in self.names if name not in failed]
+        if not succeeded:
+            return StackedResults(names=list(self.names), errors=failed)
+        keys = succeeded[0].keys()
+        ordered = [{key: np.nan for key in keys} if name in failed else results[name] for name in self.names]
+        return StackedResults(
+            names=list(self.names),
+            data={key: _stack([r[key] for r in ordered]) for key in keys},
+            errors=failed,
+        )
+
+    def pushover(self, **kwargs) -> StackedResults:
+        """
+        Pushover curves of every model (`x_array`, `y_array`), see `Plot.extract_pushover`.
+        """
+        return self.run('pushover', **kwargs)
+
+    def time_history_peaks(self, **kwargs) -> StackedResults:
+        """
+        Peak, time of peak, max and min of a time history of every model, see `Plot.extract_time_history`.
+        """
+        return self.run('time_history_peaks', **kwargs)
+
+    def mass_summary(self, **kwargs) -> StackedResults:
+        """
+        Story elevations and lumped story masses of every model, see `Masses._aggregated_mass_lumped`.
+        """
+        return self.run('mass_summary', **kwargs)
+
+    def modal_periods(self, n=5, **kwargs) -> StackedResults:
+        """
+        First `n` modal periods of every model, read from their modal reports (see `Model.modal_report`).
+        """
+        return self.run('modal_periods', n=n, **kwargs)
+
+    def to_warehouse(self, path, pushovers=(), time_histories=(), n_periods=None, masses=True):
+        """
+        Extracts the results of every model in the process pool and writes them into one ResultsWarehouse.
+        The workers only extract; the file is written by the current process as the results arrive.
+
+        :param path: Warehouse HDF5 file, created or appended to.
+        :param pushovers: (selection_set_id_verticalAxis, selection_set_id_horizontalAxis, direction) tuples.
+        :param time_histories: (results_name, selection_set_id, direction) tuples.
+        :param n_periods: Number of modal periods to store (default = None, none).
+        :param masses: Store the lumped story masses when available (default = True).
+        :return: The path of the warehouse.
+        """
+        from MPCO_Model.data.warehouse import ResultsWarehouse
+
+        kwargs = dict(pushovers=list(pushovers), time_histories=list(time_histories),
+                      n_periods=n_periods, masses=masses)
+        with ResultsWarehouse(path) as warehouse:
+            for name, payload in self.imap('warehouse', ordered=False, **kwargs):
+                warehouse.add_payload(name, payload)
+        return path
@@ -1,31 +1,500 @@
 import os
-from numpy import ndarray
+import logging
+from typing import TYPE_CHECKING, Optional
 
-from STKO_to_python import MPCODataSet
-from MPCO_Model.plotting.plot import Plot
-from MPCO_Model.mass.dynamicMass import Masses
+from MPCO_Model.core.profiling import Profiler
+
+if TYPE_CHECKING:
+    from STKO_to_python import MPCODataSet
+    from MPCO_Model.plotting.plot import Plot
+    from MPCO_Model.mass.dynamicMass import Masses
+    from MPCO_Model.analysis.storyResponse import StoryResponse
+    from MPCO_Model.analysis.spectrum import ResponseSpectrum
+    from MPCO_Model.analysis.storyOperator import StoryOperator
+    from MPCO_Model.data.sharedResults import SharedResults
+    from MPCO_Model.data.selectionIndex import SelectionIndex
+    from MPCO_Model.mass.spatialIndex import SpatialIndex
+    from MPCO_Model.mass.modalReport import ModalReport
+    import pandas as pd
+
+# Sentinel for composite classes that have not been built yet
+_UNSET = object()
 
 
 class Model:
-    def __init__(self, dataset: MPCODataSet, stories = None):
+    def __init__(self, dataset: "MPCODataSet", stories = None, profile: bool = False):
         self.dataset = dataset
         self.stories = stories
 
-        # Define composite classes for added functionality
-        self.plot:Plot = Plot(dataset)
-        
-        # Create info related to the masses
-        masses_folder = self.dataset.hdf5_directory
-        masses_file = os.path.join(masses_folder, 'results','nodeMassCoord.out')
-        
-        if os.path.exists(masses_file) and stories is not None:
-            self.mass:Masses = Masses(folder_path=masses_folder,
-                                    stories=stories)
-        else:
-            self.mass=None
+        # Opt-in instrumentation shared with the composite classes
+        self.profiler = Profiler(enabled=profile)
+
+        # Composite classes for added functionality, built on first access
+        self._plot = _UNSET
+        self._mass = _UNSET
+        self._story_operator = _UNSET
+        self._index = _UNSET
+        self._spatial_index = _UNSET
+
+        # Metadata snapshot the dataset was restored from, see `Model.open`
+        self.snapshot = None
 
         # Validation
-        print("Model initialized with dataset:", dataset.info.name)
+        logging.info(f"Model initialized with dataset: {dataset.info.name}")
+
+    @classmethod
+    def open(cls, directory: str, recorder_name: str = 'results', stories=None, snapshot: bool = False,
+             profile: bool = False, dataset_kwargs: dict = None) -> "Model":
+        """
+        Opens a Model from its directory.
+
+        With `snapshot` enabled, the stages, selection sets, step/time table and mass file availability are
+        restored from a metadata sidecar in the directory (`<recorder_name>.snapshot.npz`) instead of scanning
+        the partitions, and the MPCODataSet is only opened when results are first extracted. The sidecar is
+        validated against the sizes and modification times of the MPCO, .cdata and mass files, and rebuilt
+        automatically when it is missing or stale.
+
+        Args:
+            directory (str): Model directory (the `hdf5_directory` of the dataset).
+            recorder_name (str, optional): MPCO recorder name. Defaults to 'results'.
+            stories (array-like, optional): Story elevations.
+            snapshot (bool, optional): Use and maintain the metadata snapshot. Defaults to False.
+            profile (bool, optional): Enable the profiler. Defaults to False.
+            dataset_kwargs (dict, optional): Extra keyword arguments passed to MPCODataSet.
+
+        Returns:
+            Model: The opened model.
+        """
+        from MPCO_Model.data.snapshot import open_dataset
+
+        dataset, restored = open_dataset(os.fspath(directory), recorder_name, snapshot=snapshot,
+                                         dataset_kwargs=dataset_kwargs)
+        model = cls(dataset, stories=stories, profile=profile)
+        model.snapshot = restored
+        return model
+
+    @property
+    def index(self) -> "SelectionIndex":
+        """
+        Selection set -> node IDs -> per-partition rows index, kept for the life of the model and shared by
+        every extraction path (plots, batches, streams, watchers).
+        """
+        if self._index is _UNSET:
+            from MPCO_Model.data.selectionIndex import SelectionIndex
+            self._index = SelectionIndex(self.dataset)
+        return self._index
+
+    @property
+    def plot(self) -> "Plot":
+        if self._plot is _UNSET:
+            from MPCO_Model.plotting.plot import Plot
+            self._plot = Plot(self.dataset, profiler=self.profiler, index=self.index)
+        return self._plot
+
+    @plot.setter
+    def plot(self, value: "Plot"):
+        self._plot = value
+
+    @property
+    def mass(self) -> Optional["Masses"]:
+        """
+        Masses of the model, or None if there is no nodeMassCoord.out file or no stories are defined.
+        """
+        if self._mass is _UNSET:
+            # Create info related to the masses
+            masses_folder = self.dataset.hdf5_directory
+            masses_file = os.path.join(masses_folder, 'results','nodeMassCoord.out')
+            if self.snapshot is not None:
+                available = self.snapshot.masses_available
+            else:
+                available = os.path.exists(masses_file)
+
+            if available and self.stories is not None:
+                from MPCO_Model.mass.dynamicMass import Masses
+                self._mass = Masses(folder_path=masses_folder,
+                                    stories=self.stories,
+                                    profiler=self.profiler)
+            else:
+                self._mass = None
+        return self._mass
+
+    @mass.setter
+    def mass(self, value: Optional["Masses"]):
+        self._mass = value
+        self._story_operator = _UNSET
+        self._spatial_index = _UNSET
+
+    @property
+    def spatial_index(self) -> Optional["SpatialIndex"]:
+        """
+        Geometric index over the node coordinates of the mass file (nearest, box, slab, story band and
+        plane-proximity queries returning node IDs), or None if there is no mass file. The IDs can be
+        extracted with `plot.extract_nodes` or passed as `node_ids` to the other extraction functions.
+        """
+        if self._spatial_index is _UNSET:
+            masses = self.mass
+            if masses is None:
+                # The coordinates do not need stories
+                masses_folder = self.dataset.hdf5_directory
+                if os.path.exists(os.path.join(masses_folder, 'results', 'nodeMassCoord.out')):
+                    from MPCO_Model.mass.dynamicMass import Masses
+                    masses = Masses(folder_path=masses_folder, profiler=self.profiler)
+            if masses is None:
+                self._spatial_index = None
+            else:
+                with self.profiler.span('model.spatial_index'):
+                    self._spatial_index = masses.spatial_index()
+        return self._spatial_index
+
+    @property
+    def story_operator(self) -> Optional["StoryOperator"]:
+        """
+        Sparse node-to-level aggregation operator built once from the mass file coordinates and
+        `stories`, weighted by the translational masses. None if the masses are not available.
+        """
+        if self._story_operator is _UNSET:
+            if self.mass is None:
+                self._story_operator = None
+            else:
+                from MPCO_Model.analysis.storyOperator import StoryOperator
+                with self.profiler.span('model.story_operator'):
+                    self._story_operator = StoryOperator.from_masses(self.mass)
+        return self._story_operator
+
+    def _require_story_operator(self) -> "StoryOperator":
+        operator = self.story_operator
+        if operator is None:
+            raise ValueError("Story aggregation needs the nodeMassCoord.out file and `stories` to be defined.")
+        return operator
+
+    def story_force_histories(self, results_name: str, model_stage: str = None, scaling_factor: float = 1.0) -> dict:
+        """
+        Level forces, story shears and overturning moments of a nodal force result over every step.
+
+        The result of every node of the mass file is read once and reduced with one sparse product per
+        quantity, so all components and time steps are aggregated at once.
+
+        Args:
+            results_name (str): Nodal force result (e.g. inertial or applied forces, reactions).
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+            scaling_factor (float, optional): Factor applied to the forces. Defaults to 1.0.
+
+        Returns:
+            dict: `time`, `stories`, `forces` and `overturning_moments` of shape (n_levels, n_components,
+            n_steps), one row per level, and `shears` of shape (n_levels - 1, n_components, n_steps), one row
+            per story labelled with its upper level in `upper_levels` (same convention as `story_shears`).
+            Moments are computed per force component about the level elevation.
+        """
+        from MPCO_Model.data.nodalResults import get_time, nodal_block
+
+        operator = self._require_story_operator()
+        model_stage = model_stage or self.plot.default_parameters_TH.model_stage
+
+        with self.profiler.span('model.story_force_histories', results_name=results_name):
+            node_ids, block = nodal_block(self.dataset, results_name, model_stage, node_ids=operator.node_ids)
+            if scaling_factor != 1:
+                block *= scaling_factor
+            forces = operator.story_forces(block, node_ids)
+            return {
+                'time': get_time(self.dataset, model_stage),
+                'stories': operator.stories,
+                'upper_levels': operator.stories[1:],
+                'forces': forces,
+                'shears': operator.story_shears(block, node_ids),
+                'overturning_moments': operator.overturning_moments(block, node_ids),
+            }
+
+    def story_displacement_histories(self, results_name: str = 'DISPLACEMENT', model_stage: str = None) -> dict:
+        """
+        Mass-weighted displacement of every level over every step, sum(m * u) / sum(m) per level and
+        component, using Mx, My and Mz as the weights of the first three components.
+
+        Args:
+            results_name (str, optional): Nodal result to average. Defaults to 'DISPLACEMENT'.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+
+        Returns:
+            dict: `time`, `stories` and `displacements` of shape (n_levels, 3, n_steps).
+        """
+        from MPCO_Model.data.nodalResults import get_time, nodal_block
+
+        operator = self._require_story_operator()
+        model_stage = model_stage or self.plot.default_parameters_TH.model_stage
+
+        with self.profiler.span('model.story_displacement_histories', results_name=results_name):
+            node_ids, block = nodal_block(self.dataset, results_name, model_stage, node_ids=operator.node_ids)
+            displacements = operator.weighted_average(block[:, :3], node_ids)
+            return {
+                'time': get_time(self.dataset, model_stage),
+                'stories': operator.stories,
+                'displacements': displacements,
+            }
+
+    def story_drifts(self, level_selection_sets, direction: int = 1, model_stage: str = None,
+                     results_name: str = 'DISPLACEMENT', chunk_size: int = 1000,
+                     keep_histories: bool = True) -> "StoryResponse":
+        """
+        Interstory drift ratio time histories and peak envelopes of every story.
+
+        The displacements are streamed from the MPCO files in chunks of `chunk_size` steps and only the
+        nodes of the level selection sets are read, so the full displacement history is never in memory.
+
+        Args:
+            level_selection_sets (list): One selection set ID per level, aligned with `self.stories`.
+            direction (int, optional): Displacement component. Defaults to 1.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+            results_name (str, optional): Nodal displacement result. Defaults to 'DISPLACEMENT'.
+            chunk_size (int, optional): Steps read per chunk. Defaults to 1000.
+            keep_histories (bool, optional): Keep the drift histories, not only the envelopes. Defaults to True.
+
+        Returns:
+            StoryResponse: Drift ratio histories (stories × steps) and envelopes per story.
+        """
+        from MPCO_Model.analysis.storyResponse import story_drifts
+
+        with self.profiler.span('model.story_drifts', results_name=results_name, direction=direction):
+            return story_drifts(
+                self.dataset,
+                self.stories,
+                level_selection_sets,
+                direction,
+                model_stage or self.plot.default_parameters_TH.model_stage,
+                results_name=results_name,
+                chunk_size=chunk_size,
+                keep_histories=keep_histories,
+                index=self.index,
+            )
+
+    def story_shears(self, level_selection_sets, force_results_name: str, direction: int = 1,
+                     model_stage: str = None, scaling_factor: float = 1.0, chunk_size: int = 1000,
+                     keep_histories: bool = True) -> "StoryResponse":
+        """
+        Story shear time histories and peak envelopes from a nodal force result.
+
+        Args:
+            level_selection_sets (list): One selection set ID per level, aligned with `self.stories`.
+            force_results_name (str): Nodal force result summed per level (e.g. inertial forces).
+            direction (int, optional): Force component. Defaults to 1.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+            scaling_factor (float, optional): Factor applied to the shears. Defaults to 1.0.
+            chunk_size (int, optional): Steps read per chunk. Defaults to 1000.
+            keep_histories (bool, optional): Keep the shear histories, not only the envelopes. Defaults to True.
+
+        Returns:
+            StoryResponse: Story shear histories (stories × steps) and envelopes per story.
+        """
+        from MPCO_Model.analysis.storyResponse import story_shears
+
+        with self.profiler.span('model.story_shears', results_name=force_results_name, direction=direction):
+            return story_shears(
+                self.dataset,
+                self.stories,
+                level_selection_sets,
+                force_results_name,
+                direction,
+                model_stage or self.plot.default_parameters_TH.model_stage,
+                scaling_factor=scaling_factor,
+                chunk_size=chunk_size,
+                keep_histories=keep_histories,
+                index=self.index,
+            )
+
+    def modal_report(self, modal_filename: str = 'modal.txt') -> "ModalReport":
+        """
+        Parsed modal analysis report of the model directory, cached until the file changes. Unlike `mass`,
+        it needs neither the mass file nor the stories.
+
+        Args:
+            modal_filename (str, optional): Name of the modal report file. Defaults to 'modal.txt'.
+
+        Returns:
+            ModalReport: Periods, frequencies and participation data per mode.
+
+        Raises:
+            FileNotFoundError: If the modal report file is not found.
+            ValueError: If the eigenvalue table could not be parsed.
+        """
+        from MPCO_Model.mass.modalReport import ModalReport
+
+        with self.profiler.span('model.modal_report', file=modal_filename):
+            return ModalReport.load(os.path.join(self.dataset.hdf5_directory, modal_filename))
+
+    def floor_spectra(self, selection_set_ids, direction: int = 1, periods=None, damping=0.05,
+                      results_name: str = 'ACCELERATION', n_modes: int = 3, model_stage: str = None,
+                      max_workers: int = None) -> "ResponseSpectrum":
+        """
+        Floor response spectra of the acceleration time histories at several selection sets.
+
+        The accelerations of every floor are read in a single batch extraction, and all the periods and
+        damping ratios are evaluated at once with the exact piecewise-linear recurrence. When the modal
+        report is available, its first `n_modes` periods are added to the period grid and stored as `marks`.
+
+        Args:
+            selection_set_ids (list): One selection set per floor.
+            direction (int, optional): Acceleration component. Defaults to 1.
+            periods (array-like, optional): Periods to evaluate. Defaults to a log-spaced 0.02-5 s grid.
+            damping (float or array-like, optional): Damping ratio(s). Defaults to 0.05.
+            results_name (str, optional): Nodal acceleration result. Defaults to 'ACCELERATION'. The spectra
+                assume absolute floor accelerations.
+            n_modes (int, optional): Number of modal periods used as marks. Defaults to 3.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+            max_workers (int, optional): Process pool size used across floors. Defaults to None (serial).
+
+        Returns:
+            ResponseSpectrum: Spectra of shape (n_floors, n_damping, n_periods).
+        """
+        import numpy as np
+        from MPCO_Model.analysis.spectrum import floor_response_spectra, period_grid
+
+        batch = self.plot.extract_batch([(results_name, set_id, direction) for set_id in selection_set_ids],
+                                        model_stage=model_stage)
+        accelerations = np.stack([batch.get(results_name, set_id, direction) for set_id in selection_set_ids])
+
+        # Modal periods as default period marks
+        try:
+            marks = list(self.modal_report().periods(n_modes))
+        except (FileNotFoundError, ValueError):
+            marks = None
+
+        with self.profiler.span('model.floor_spectra', n_floors=len(accelerations)):
+            return floor_response_spectra(
+                accelerations,
+                period_grid(marks, periods),
+                damping=damping,
+                time=batch.time,
+                marks=marks,
+                max_workers=max_workers,
+            )
+
+    def element_envelopes(self, results_name: str, model_stage: str = None, groups=None, element_ids=None,
+                          chunk_steps: int = 500, chunk_elements: int = None, max_workers: int = None) -> dict:
+        """
+        Max / min / abs-max envelopes of an element result over every element and step, with the step of
+        every extreme, for member-level checks.
+
+        The element result datasets are streamed from the MPCO files in blocks of `chunk_elements` elements
+        × `chunk_steps` steps, so memory stays bounded by the block size on big models.
+
+        Args:
+            results_name (str): Element result name, e.g. 'force' or 'section.deformation'.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+            groups (list, optional): Element groups, by name or part of it (e.g. 'ElasticBeam3d'). Defaults to all.
+            element_ids (array-like, optional): Elements to keep. Defaults to every element.
+            chunk_steps (int, optional): Steps read per block. Defaults to 500.
+            chunk_elements (int, optional): Elements read per block. Defaults to every element of a group.
+            max_workers (int, optional): Process pool size used across element groups. Defaults to None (serial).
+
+        Returns:
+            dict: Element group name -> ElementEnvelope.
+        """
+        from MPCO_Model.analysis.elementEnvelope import element_envelopes
+
+        with self.profiler.span('model.element_envelopes', results_name=results_name):
+            return element_envelopes(
+                self.dataset,
+                model_stage or self.plot.default_parameters_TH.model_stage,
+                results_name,
+                groups=groups,
+                element_ids=element_ids,
+                chunk_steps=chunk_steps,
+                chunk_elements=chunk_elements,
+                max_workers=max_workers,
+            )
+
+    def to_warehouse(self, path: str, pushovers=(), time_histories=(), n_periods: int = None,
+                     masses: bool = True) -> str:
+        """
+        Extracts pushover curves, time histories, story masses and modal periods and appends them to a
+        ResultsWarehouse, so later comparisons do not need the MPCO files.
+
+        Args:
+            path (str): Warehouse HDF5 file, created or appended to.
+            pushovers (iterable, optional): (selection_set_id_verticalAxis, selection_set_id_horizontalAxis,
+                direction) tuples.
+            time_histories (iterable, optional): (results_name, selection_set_id, direction) tuples.
+            n_periods (int, optional): Number of modal periods to store. Defaults to None (none).
+            masses (bool, optional): Store the lumped story masses when available. Defaults to True.
+
+        Returns:
+            str: The path of the warehouse.
+        """
+        from MPCO_Model.data.warehouse import ResultsWarehouse
+
+        with self.profiler.span('model.to_warehouse', file=path):
+            with ResultsWarehouse(path) as warehouse:
+                warehouse.add_model(self, pushovers, time_histories, n_periods, masses)
+        return path
+
+    def publish(self, prefix: str = None, pushovers=(), time_histories=(), masses: bool = False) -> "SharedResults":
+        """
+        Publishes extracted results into named shared memory blocks, so other local processes read them
+        zero-copy with `SharedResultsView(prefix)` instead of extracting them again.
+
+        Keys are 'pushover/<sel_v>/<sel_h>/<direction>/x_array' (and y_array),
+        'time_history/<results_name>/<selection_set_id>/<direction>/x_array' (and y_array), and
+        'masses/story' / 'masses/values' for the lumped story masses.
+
+        Args:
+            prefix (str, optional): Publication name given to the readers. Defaults to a unique name.
+            pushovers (iterable, optional): (selection_set_id_verticalAxis, selection_set_id_horizontalAxis,
+                direction) tuples.
+            time_histories (iterable, optional): (results_name, selection_set_id, direction) tuples.
+            masses (bool, optional): Also publish the lumped story masses. Defaults to False.
+
+        Returns:
+            SharedResults: The owner of the blocks; close it (or use it as a context manager) to stop publishing.
+        """
+        from MPCO_Model.data.sharedResults import SharedResults
+
+        shared = SharedResults(prefix)
+        try:
+            for selection_set_v, selection_set_h, direction in pushovers:
+                results = self.plot.extract_pushover(selection_set_v, selection_set_h, direction)
+                shared.publish_many(results, key_prefix=f"pushover/{selection_set_v}/{selection_set_h}/{direction}/",
+                                    model=self.name)
+            for results_name, selection_set_id, direction in time_histories:
+                results = self.plot.extract_time_history(results_name, selection_set_id, direction)
+                shared.publish_many(results, key_prefix=f"time_history/{results_name}/{selection_set_id}/{direction}/",
+                                    model=self.name)
+            if masses:
+                if self.mass is None:
+                    raise ValueError("Story masses need the nodeMassCoord.out file and `stories` to be defined.")
+                lumped = self.mass._aggregated_mass_lumped()
+                shared.publish('masses/story', lumped['story'].to_numpy(dtype='float64'), model=self.name)
+                shared.publish('masses/values', lumped[self.mass.MASS_COLUMNS].to_numpy(dtype='float64'),
+                               model=self.name, columns=self.mass.MASS_COLUMNS)
+        except Exception:
+            shared.close()
+            raise
+        return shared
+
+    @property
+    def stats(self) -> "pd.DataFrame":
+        """
+        Recorded profiling spans (name, parent, depth, start, wall_time, bytes_read, peak_memory and
+        the span arguments), one row per span. Empty unless the model was built with `profile=True`
+        or `profiler.enabled` was set.
+        """
+        return self.profiler.stats()
+
+    def export_trace(self, path: str) -> str:
+        """
+        Writes the recorded spans as a Chrome trace JSON file (open it in chrome://tracing or Perfetto).
+
+        Args:
+            path (str): Output JSON file.
+
+        Returns:
+            str: The written path.
+        """
+        return self.profiler.to_chrome_trace(path)
+
+    @property
+    def model_stages(self) -> list:
+        """
+        Model stages of the dataset, in analysis order. See `Plot.extract_stages` to extract several at once.
+        """
+        return self.plot.model_stages()
 
     @property
     def name(self) -> str:
@@ -38,7 +507,6 @@ class Model:
     @property
     def directory(self) -> str:
         return self.dataset.hdf5_directory
-    
+
     def __repr__(self):
         return f"<Model {self.name} at {self.directory}>"
-
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+def _bytes_read():
+    """
+    Bytes read by the process so far (`rchar` of /proc/self/io, which includes HDF5 and text reads).
+    Returns None where the counter is not available.
+    """
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+# Bytes counted by reading the counter itself, subtracted from every span
+_first, _second = _bytes_read(), _bytes_read()
+_PROBE_BYTES = 0 if _first is None else _second - _first
+
+# tracemalloc is process-wide, so the memory-traced spans open in every thread (of every Profiler) are tracked
+# together: tracing is stopped only when the last one closes, and the peak is only reset when no other thread
+# has a span open.
+_memory_lock = threading.Lock()
+_memory_spans = []
+_memory_started = False
+
+
+class Profiler:
+    """
+    Opt-in instrumentation shared by Model, Plot and Masses.
+
+    Every instrumented stage is recorded as a span with its wall time, bytes read and, when
+    `trace_memory` is enabled, the peak traced memory reached inside the span. Spans nest, and
+    each record keeps its parent and depth. When disabled, `span` returns a no-op context and
+    nothing is recorded.
+
+    The traced peak is process-wide: a span that overlaps spans of other threads (e.g. under
+    `Plot.extract_stages`) cannot tell its allocations apart, so its `peak_memory` is None.
+    """
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.records = []
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name, **meta):
+        """
+        Context manager recording one stage, e.g. `with profiler.span('masses.parse', file=path): ...`.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, meta)
+
+    @contextmanager
+    def _span(self, name, meta):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+
+        record = {
+            'name': name,
+            'parent': parent['name'] if parent else None,
+            'depth': len(stack),
+            'thread': threading.get_ident(),
+            'start': time.perf_counter() - self._origin,
+            'wall_time': None,
+            'bytes_read': None,
+            'peak_memory': None,
+            **meta,
+        }
+        base_memory = self._enter_memory(record, parent) if self.trace_memory else 0
+
+        stack.append(record)
+        read_start = _bytes_read()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['wall_time'] = time.perf_counter() - start
+            read_end = _bytes_read()
+            if read_start is not None and read_end is not None:
+                record['bytes_read'] = max(read_end - read_start - _PROBE_BYTES, 0)
+            if self.trace_memory:
+                self._exit_memory(record, parent, base_memory)
+            stack.pop()
+            self.records.append(record)
+
+    @staticmethod
+    def _enter_memory(record, parent):
+        global _memory_started
+        with _memory_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _memory_started = True
+            current, peak = tracemalloc.get_traced_memory()
+            if any(r['thread'] != record['thread'] for r in _memory_spans):
+                # Another thread is inside a span: the peak is shared, do not reset it under its feet
+                for r in _memory_spans:
+                    r['_shared'] = True
+                record['_shared'] = True
+            else:
+                if parent is not None:
+                    # The peak is reset below, keep the parent's peak so far
+                    parent['_peak'] = max(parent.get('_peak', 0), peak)
+                tracemalloc.reset_peak()
+            _memory_spans.append(record)
+        return current
+
+    @staticmethod
+    def _exit_memory(record, parent, base_memory):
+        global _memory_started
+        with _memory_lock:
+            peak = max(tracemalloc.get_traced_memory()[1], record.pop('_peak', 0))
+            if not record.pop('_shared', False):
+                record['peak_memory'] = max(peak - base_memory, 0)
+                if parent is not None:
+                    parent['_peak'] = max(parent.get('_peak', 0), peak)
+            _memory_spans[:] = [r for r in _memory_spans if r is not record]
+            if not _memory_spans and _memory_started:
+                tracemalloc.stop()
+                _memory_started = False
+
+    def clear(self):
+        self.records = []
+        self._origin = time.perf_counter()
+
+    def stats(self):
+        """
+        Recorded spans as a pandas DataFrame, in completion order.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.records)
+
+    def summary(self):
+        """
+        Total wall time, bytes read and call count per span name.
+        """
+        frame = self.stats()
+        if frame.empty:
+            return frame
+        return frame.groupby('name').agg(
+            calls=('wall_time', 'size'),
+            wall_time=('wall_time', 'sum'),
+            bytes_read=('bytes_read', 'sum'),
+            peak_memory=('peak_memory', 'max'),
+        ).sort_values('wall_time', ascending=False)
+
+    def to_chrome_trace(self, path):
+        """
+        Writes the spans as a Chrome trace (chrome://tracing, Perfetto) JSON file.
+        """
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {k: v for k, v in record.items() if k not in ('name', 'start', 'wall_time', 'thread', 'depth')}
+            events.append({
+                'name': record['name'],
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['wall_time'] * 1e6,
+                'pid': pid,
+                'tid': record['thread'],
+                'args': {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v) for k, v in args.items()},
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+# Shared disabled profiler used when instrumentation is off
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,15 @@
+import numpy as np
+
+
+def pad_curves(curves):
+    """
+    Stacks 1-D curves of different lengths into a NaN-padded 2-D array of shape (n_curves, max_length).
+    2-D input is returned as float64 unchanged.
+    """
+    if isinstance(curves, np.ndarray) and curves.ndim == 2:
+        return curves.astype(np.float64, copy=False)
+    curves = [np.asarray(c, dtype=np.float64).ravel() for c in curves]
+    out = np.full((len(curves), max((c.size for c in curves), default=0)), np.nan)
+    for i, c in enumerate(curves):
+        out[i, :c.size] = c
+    return out
@@ -0,0 +1,250 @@
+import glob
+import os
+import re
+from contextlib import contextmanager
+
+import numpy as np
+
+# Layout of the MPCO recorder files:
+#   <MODEL_STAGE[k]>/RESULTS/ON_NODES/<RESULT>/ID               node tags of the partition
+#   <MODEL_STAGE[k]>/RESULTS/ON_NODES/<RESULT>/DATA/STEP_<i>    (nodes, components) block, attrs TIME and STEP
+NODAL_RESULTS_PATH = '{model_stage}/RESULTS/ON_NODES/{results_name}'
+ELEMENT_RESULTS_PATH = '{model_stage}/RESULTS/ON_ELEMENTS/{results_name}'
+
+_STEP_PATTERN = re.compile(r'STEP_(\d+)$')
+
+# Reductions that can be combined across partitions
+STREAM_OPERATIONS = ('Sum', 'Mean', 'Max', 'Min')
+
+
+def partition_files(dataset):
+    """
+    Returns the MPCO result files (one per partition) of a dataset, sorted by partition number.
+    """
+    partitions = getattr(dataset, 'results_partitions', None)
+    if isinstance(partitions, dict) and partitions:
+        return [partitions[k] for k in sorted(partitions)]
+
+    directory = dataset.hdf5_directory
+    recorder_name = getattr(dataset, 'recorder_name', None)
+    pattern = f"{recorder_name}.part-*.mpco" if recorder_name else '*.mpco'
+    files = glob.glob(os.path.join(directory, pattern)) or glob.glob(os.path.join(directory, '*.mpco'))
+    if not files:
+        raise FileNotFoundError(f"No MPCO result files found in '{directory}'.")
+
+    def part_number(path):
+        match = re.search(r'part-(\d+)', os.path.basename(path))
+        return int(match.group(1)) if match else 0
+
+    return sorted(files, key=part_number)
+
+
+@contextmanager
+def open_partitions(dataset):
+    """
+    Opens every partition file of a dataset read-only and closes them on exit.
+    """
+    import h5py
+
+    files = []
+    try:
+        for path in partition_files(dataset):
+            files.append(h5py.File(path, 'r'))
+        yield files
+    finally:
+        for f in files:
+            f.close()
+
+
+def step_keys(data_group):
+    """
+    Names of the STEP_<i> datasets of a DATA group, sorted by step number.
+    """
+    keys = [k for k in data_group.keys() if _STEP_PATTERN.match(k)]
+    return sorted(keys, key=lambda k: int(_STEP_PATTERN.match(k).group(1)))
+
+
+def count_steps(data_group, known=0) -> int:
+    """
+    Number of STEP_<i> datasets of a DATA group written so far, assuming they are numbered from STEP_0 without
+    gaps (as MPCO writes them). Only the names after `known` (a count seen before) are probed, so the cost
+    depends on the number of new steps and the group is never listed.
+    """
+    if known and f"STEP_{known - 1}" not in data_group:
+        # The file was rewritten since, count again
+        known = 0
+    n = known
+    while f"STEP_{n}" in data_group:
+        n += 1
+    return n
+
+
+def step_time(step_dataset) -> float:
+    """
+    Analysis time stored in the attributes of a STEP_<i> dataset.
+    """
+    return float(np.asarray(step_dataset.attrs['TIME']).ravel()[0])
+
+
+def node_rows(result_group, node_ids):
+    """
+    Locates nodes in the ID dataset of a partition result group.
+
+    :return: (rows, found) where `rows` are the sorted row positions of the nodes present in the
+             partition and `found` the node IDs of those rows, in the same order.
+    """
+    ids = np.asarray(result_group['ID'][()], dtype=np.int64).ravel()
+    rows = np.flatnonzero(np.isin(ids, node_ids))
+    return rows, ids[rows]
+
+
+def read_rows(step_dataset, rows):
+    """
+    Reads `rows` (sorted) of a STEP dataset, with a contiguous slice or a single full read when it is cheaper
+    than point selection.
+    """
+    if rows.size == 0:
+        return np.empty((0,) + step_dataset.shape[1:], dtype=step_dataset.dtype)
+    if rows[-1] - rows[0] + 1 == rows.size:
+        return step_dataset[rows[0]:rows[-1] + 1]
+    if rows.size > step_dataset.shape[0] // 2:
+        return step_dataset[()][rows]
+    return step_dataset[rows]
+
+
+class NodalResultStream:
+    """
+    Streams a nodal result straight from the MPCO files, in chunks of steps.
+
+    Every chunk holds, for each group of nodes, the result reduced over the nodes of the group
+    (Sum, Mean, Max or Min) for every component. Only the rows of the requested nodes are read, and
+    memory is bounded by `chunk_size` × number of groups, whatever the length of the analysis.
+    """
+    def __init__(self, dataset, model_stage, results_name, groups, operation='Mean', chunk_size=1000, start_step=0,
+                 index=None, step_counts=None, selection_set_ids=None):
+        """
+        :param dataset: MPCODataSet to read.
+        :param model_stage: Model stage, e.g. 'MODEL_STAGE[5]'.
+        :param results_name: Nodal result name, e.g. 'DISPLACEMENT'.
+        :param groups: Sequence of node ID arrays, one per group (e.g. one per story level).
+        :param operation: Reduction over the nodes of each group.
+        :param chunk_size: Number of steps per chunk.
+        :param start_step: Position of the first step to read; earlier steps are skipped without reading them.
+        :param index: SelectionIndex of the dataset, used to locate the rows without reading the ID datasets again.
+        :param step_counts: Dict of partition file -> number of steps already seen, updated in place. When given,
+                            the steps are counted with `count_steps` instead of listing and sorting every
+                            STEP_<i> name, so polling a running analysis only probes the new steps.
+        :param selection_set_ids: Selection set of every group, when the groups are selection sets. With `index`,
+                                  their rows are then taken from its per-set cache instead of being searched.
+        """
+        if operation not in STREAM_OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'. Valid options are {list(STREAM_OPERATIONS)}.")
+        if len(groups) == 0:
+            raise ValueError("At least one group of nodes is required.")
+        if selection_set_ids is not None and len(selection_set_ids) != len(groups):
+            raise ValueError("`selection_set_ids` must have one selection set per group.")
+        self.dataset = dataset
+        self.model_stage = model_stage
+        self.results_name = results_name
+        self.groups = [np.asarray(g, dtype=np.int64) for g in groups]
+        self.operation = operation
+        self.chunk_size = int(chunk_size)
+        self.start_step = int(start_step)
+        self.index = index
+        self.step_counts = step_counts
+        self.selection_set_ids = None if selection_set_ids is None else list(selection_set_ids)
+
+    def __iter__(self):
+        """
+        Yields (steps, time, values) with `steps` a slice of step positions, `time` the analysis time of those
+        steps and `values` an array of shape (n_groups, n_components, n_chunk_steps).
+        """
+        path = NODAL_RESULTS_PATH.format(model_stage=self.model_stage, results_name=self.results_name)
+        n_groups = len(self.groups)
+
+        with open_partitions(self.dataset) as files:
+            # Per partition: (DATA group, rows to read, positions within the rows read, group of each position)
+            layout = []
+            counts = np.zeros(n_groups, dtype=np.int64)
+            keys, n_steps = None, None
+            for f in files:
+                if path not in f:
+                    continue
+                group = f[path]
+                selections = []
+                for g, nodes in enumerate(self.groups):
+                    if self.index is not None and self.selection_set_ids is not None:
+                        rows = self.index.selection_rows(f.filename, self.model_stage, self.results_name,
+                                                         self.selection_set_ids[g], group)
+                    elif self.index is not None:
+                        rows = self.index.rows(f.filename, self.model_stage, self.results_name, nodes, group)
+                    else:
+                        rows = node_rows(group, nodes)[0]
+                    if rows.size:
+                        selections.append((g, rows))
+                        counts[g] += rows.size
+                if selections:
+                    union = np.unique(np.concatenate([rows for _, rows in selections]))
+                    positions = np.concatenate([np.searchsorted(union, rows) for _, rows in selections])
+                    labels = np.concatenate([np.full(rows.size, g) for g, rows in selections])
+                    layout.append((group['DATA'], union, positions, labels))
+                # Only the steps written in every partition (the analysis may still be running)
+                if self.step_counts is not None:
+                    partition_steps = count_steps(group['DATA'], self.step_counts.get(f.filename, 0))
+                    self.step_counts[f.filename] = partition_steps
+                else:
+                    partition_keys = step_keys(group['DATA'])
+                    partition_steps = len(partition_keys)
+                    if keys is None or partition_steps < len(keys):
+                        keys = partition_keys
+                n_steps = partition_steps if n_steps is None else min(n_steps, partition_steps)
+
+            if n_steps is None:
+                raise KeyError(f"Result '{self.results_name}' not found in {self.model_stage}.")
+            missing = np.flatnonzero(counts == 0)
+            if missing.size:
+                raise ValueError(f"Node groups {missing.tolist()} have no nodes in '{self.results_name}'.")
+
+            if self.start_step >= n_steps:
+                return
+            if keys is None:
+                keys = [f"STEP_{i}" for i in range(self.start_step, n_steps)]
+            else:
+                keys = keys[self.start_step:n_steps]
+            n_components = layout[0][0][keys[0]].shape[1]
+            for start in range(0, len(keys), self.chunk_size):
+                chunk_keys = keys[start:start + self.chunk_size]
+                values = self._empty(n_groups, n_components, len(chunk_keys))
+                time = np.empty(len(chunk_keys))
+
+                for data_group, union, positions, labels in layout:
+                    for k, key in enumerate(chunk_keys):
+                        step = data_group[key]
+                        time[k] = step_time(step)
+                        # A single read per step and partition for all the groups
+                        block = read_rows(step, union)
+                        self._fold(values[:, :, k], labels, block[positions])
+
+                if self.operation == 'Mean':
+                    values /= counts[:, None, None]
+                first = self.start_step + start
+                yield slice(first, first + len(chunk_keys)), time, values
+
+    def _empty(self, n_groups, n_components, n_steps):
+        if self.operation == 'Max':
+            return np.full((n_groups, n_components, n_steps), -np.inf)
+        if self.operation == 'Min':
+            return np.full((n_groups, n_components, n_steps), np.inf)
+        return np.zeros((n_groups, n_components, n_steps))
+
+    def _fold(self, out, labels, rows_values):
+        """
+        Folds the rows read for one step into `out` (n_groups, n_components), group by group.
+        """
+        if self.operation == 'Max':
+            np.maximum.at(out, labels, rows_values)
+        elif self.operation == 'Min':
+            np.minimum.at(out, labels, rows_values)
+        else:
+            for c in range(out.shape[1]):
+                out[:, c] += np.bincount(labels, weights=rows_values[:, c], minlength=out.shape[0])
@@ -0,0 +1,322 @@
+import logging
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from MPCO_Model.data.mpcoFiles import STREAM_OPERATIONS, NodalResultStream
+
+# Operation names accepted by the STKO_to_python plotter -> pandas groupby reductions
+OPERATIONS = {
+    'Sum': 'sum',
+    'Mean': 'mean',
+    'Max': 'max',
+    'Min': 'min',
+    'Std': 'std',
+}
+
+# Results that are not nodal results but the abscissa of the analysis
+TIME_RESULTS = ('TIME', 'STEP')
+
+
+def get_nodal_results(dataset, results_name, model_stage, selection_set_id=None, node_ids=None) -> pd.DataFrame:
+    """
+    Reads a nodal result for a selection set (or explicit node IDs) at a model stage.
+
+    Returns the DataFrame produced by STKO_to_python, indexed by (node_id, step) with one column per component.
+    """
+    if selection_set_id is None and node_ids is None:
+        raise ValueError("Either `selection_set_id` or `node_ids` must be provided.")
+
+    return dataset.nodes.get_nodal_results(
+        results_name=results_name,
+        model_stage=model_stage,
+        node_ids=node_ids,
+        selection_set_id=selection_set_id,
+    )
+
+
+def selection_set_node_ids(dataset, selection_set_id) -> np.ndarray:
+    """
+    Returns the sorted node IDs of a selection set.
+    """
+    try:
+        nodes = dataset.selection_set[selection_set_id]['NODES']
+    except KeyError:
+        raise KeyError(f"Selection set {selection_set_id!r} not found or has no nodes.")
+    return np.unique(np.asarray(nodes, dtype=np.int64))
+
+
+def select_direction(df: pd.DataFrame, direction) -> pd.Series:
+    """
+    Selects one component from a nodal results DataFrame.
+
+    The direction is matched against the column labels first and used as a position otherwise.
+    """
+    if direction in df.columns:
+        return df[direction]
+    if isinstance(direction, (int, np.integer)) and 0 <= direction < df.shape[1]:
+        return df.iloc[:, direction]
+    raise KeyError(f"Direction {direction!r} not found in the result components {list(df.columns)}.")
+
+
+def reduce_over_nodes(values: pd.Series, operation: str = 'Sum') -> np.ndarray:
+    """
+    Reduces a per-node, per-step series to one value per step with the given operation.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'. Valid options are {list(OPERATIONS)}.")
+
+    step_level = values.index.nlevels - 1
+    return values.groupby(level=step_level, sort=True).agg(OPERATIONS[operation]).to_numpy(dtype=np.float64)
+
+
+def component_positions(directions, n_components) -> list:
+    """
+    Positions of the requested directions (0=x, 1=y, 2=z, ...) among the components read from the MPCO files.
+    """
+    positions = []
+    for direction in directions:
+        if not (isinstance(direction, (int, np.integer)) and 0 <= direction < n_components):
+            raise KeyError(f"Direction {direction!r} not found in the {n_components} result components.")
+        positions.append(int(direction))
+    return positions
+
+
+def stream_reduced(dataset, model_stage, results_name, groups, operation, index=None, selection_set_ids=None,
+                   chunk_size=1000) -> np.ndarray:
+    """
+    Reduces a nodal result over groups of nodes, reading only their rows straight from the partitions
+    (see `NodalResultStream`).
+
+    Args:
+        dataset (MPCODataSet): Dataset to read from.
+        model_stage (str): Model stage, e.g. 'MODEL_STAGE[5]'.
+        results_name (str): Nodal result name.
+        groups (list): Node IDs of every group.
+        operation (str): Reduction over the nodes of each group ('Sum', 'Mean', 'Max' or 'Min').
+        index (SelectionIndex, optional): Provides the cached rows of the partitions.
+        selection_set_ids (list, optional): Selection set of every group, so their rows are cached per set.
+        chunk_size (int, optional): Steps read per chunk.
+
+    Returns:
+        numpy.ndarray: Shape (n_groups, n_components, n_steps).
+    """
+    stream = NodalResultStream(dataset, model_stage, results_name, groups, operation=operation, chunk_size=chunk_size,
+                               index=index, selection_set_ids=selection_set_ids)
+    chunks = [values for _, _, values in stream]
+    if not chunks:
+        raise ValueError(f"Result '{results_name}' has no steps in {model_stage}.")
+    return np.concatenate(chunks, axis=2)
+
+
+def nodal_block(dataset, results_name, model_stage, selection_set_id=None, node_ids=None):
+    """
+    Reads a nodal result as a dense block of every node, component and step.
+
+    Returns:
+        tuple: (node_ids, block) with the sorted node IDs and `block` of shape (n_nodes, n_components, n_steps).
+    """
+    df = get_nodal_results(dataset, results_name, model_stage, selection_set_id=selection_set_id, node_ids=node_ids)
+    df = df.sort_index()
+    ids = np.asarray(df.index.get_level_values(0).unique(), dtype=np.int64)
+    n_steps, remainder = divmod(len(df), max(ids.size, 1))
+    if remainder:
+        raise ValueError(f"Result '{results_name}' does not have the same number of steps for every node.")
+    block = df.to_numpy(dtype=np.float64).reshape(ids.size, n_steps, df.shape[1]).transpose(0, 2, 1)
+    return ids, block
+
+
+def get_time(dataset, model_stage) -> np.ndarray:
+    """
+    Returns the analysis time of every step of a model stage.
+    """
+    return np.asarray(dataset.time.loc[model_stage]['TIME'], dtype=np.float64)
+
+
+def get_steps(dataset, model_stage) -> np.ndarray:
+    """
+    Returns the step numbers of a model stage.
+    """
+    return np.asarray(dataset.time.loc[model_stage].index, dtype=np.float64)
+
+
+def extract_axis(dataset, model_stage, results_name, selection_set_id=None, direction=None,
+                 values_operation='Sum', scaling_factor=1.0, node_ids=None, index=None) -> np.ndarray:
+    """
+    Extracts one plot axis, i.e. a nodal result reduced over the nodes of a selection set,
+    or the TIME / STEP vector of the stage.
+
+    With a SelectionIndex, Sum/Mean/Max/Min reductions read the rows of the nodes straight from the
+    partitions using the cached row positions, instead of going through `get_nodal_results`.
+
+    Args:
+        dataset (MPCODataSet): Dataset to read from.
+        model_stage (str): Model stage, e.g. 'MODEL_STAGE[5]'.
+        results_name (str): Nodal result name (e.g. 'DISPLACEMENT'), or 'TIME' / 'STEP'.
+        selection_set_id (int, optional): Selection set whose nodes are reduced.
+        direction (int, optional): Result component to extract.
+        values_operation (str, optional): Reduction over the nodes ('Sum', 'Mean', 'Max', 'Min', 'Std').
+        scaling_factor (float, optional): Factor applied to the reduced values.
+        node_ids (array-like, optional): Explicit node IDs, used instead of the selection set.
+        index (SelectionIndex, optional): Resolves the selection set and its rows from its cache.
+
+    Returns:
+        numpy.ndarray: One value per step.
+    """
+    if results_name == 'TIME':
+        values = get_time(dataset, model_stage)
+    elif results_name == 'STEP':
+        values = get_steps(dataset, model_stage)
+    elif index is not None and values_operation in STREAM_OPERATIONS:
+        if node_ids is None:
+            if selection_set_id is None:
+                raise ValueError("Either `selection_set_id` or `node_ids` must be provided.")
+            groups, selection_set_ids = [index.node_ids(selection_set_id)], [selection_set_id]
+        else:
+            groups, selection_set_ids = [np.asarray(node_ids, dtype=np.int64).ravel()], None
+        reduced = stream_reduced(dataset, model_stage, results_name, groups, values_operation, index, selection_set_ids)
+        values = reduced[0, component_positions([direction], reduced.shape[1])[0]]
+    else:
+        df = get_nodal_results(dataset, results_name, model_stage, selection_set_id=selection_set_id, node_ids=node_ids)
+        values = reduce_over_nodes(select_direction(df, direction), values_operation)
+
+    if scaling_factor != 1:
+        values = values * scaling_factor
+    return values
+
+
+@dataclass
+class BatchResults:
+    """
+    Labelled result of a batch extraction.
+
+    `data` has shape (len(rows), len(components), len(time)); row `i` holds the result `rows[i][0]`
+    reduced over the selection set `rows[i][1]`, for every component in `components`.
+    """
+    model_stage: str
+    rows: List[Tuple[str, int]]
+    components: list
+    time: np.ndarray
+    data: np.ndarray
+    values_operation: str = 'Mean'
+    scaling_factor: float = 1.0
+    _row_index: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._row_index = {row: i for i, row in enumerate(self.rows)}
+
+    def get(self, results_name, selection_set_id, direction) -> np.ndarray:
+        """
+        Returns the time history of one (result, selection set, direction) request.
+        """
+        return self.data[self._row_index[(results_name, selection_set_id)], self.components.index(direction)]
+
+
+def _reduce_sets(dataset, model_stage, results_name, selection_set_ids, components, values_operation, index):
+    """
+    Yields (selection_set_id, values of shape (n_components, n_steps)) for every selection set of one result,
+    reading the result a single time.
+    """
+    if index is not None and values_operation in STREAM_OPERATIONS:
+        groups = [index.node_ids(set_id) for set_id in selection_set_ids]
+        reduced = stream_reduced(dataset, model_stage, results_name, groups, values_operation, index,
+                                 selection_set_ids)
+        positions = component_positions(components, reduced.shape[1])
+        for g, set_id in enumerate(selection_set_ids):
+            yield set_id, reduced[g, positions]
+        return
+
+    if index is not None:
+        set_nodes = {set_id: index.node_ids(set_id) for set_id in selection_set_ids}
+    else:
+        set_nodes = {set_id: selection_set_node_ids(dataset, set_id) for set_id in selection_set_ids}
+    all_nodes = np.unique(np.concatenate(list(set_nodes.values())))
+
+    # One read per result for the union of the selection sets
+    df = get_nodal_results(dataset, results_name, model_stage, node_ids=all_nodes)
+    columns = [select_direction(df, d).name for d in components]
+    node_level = df.index.get_level_values(0).to_numpy()
+    step_level = df.index.nlevels - 1
+
+    for set_id, nodes in set_nodes.items():
+        subset = df.loc[np.isin(node_level, nodes), columns]
+        reduced = subset.groupby(level=step_level, sort=True).agg(OPERATIONS[values_operation])
+        yield set_id, reduced.to_numpy(dtype=np.float64).T
+
+
+def extract_batch(dataset, model_stage, requests, values_operation='Mean', scaling_factor=1.0, index=None) -> BatchResults:
+    """
+    Extracts many (result, selection set, direction) time histories reading every result only once.
+
+    The requests are grouped by result: the nodes of all the selection sets requested for a result are
+    read in a single pass, then split per selection set and reduced over the nodes for every component.
+    With a SelectionIndex and a Sum/Mean/Max/Min reduction, the pass reads the partitions directly with
+    the cached rows of every selection set (see `stream_reduced`).
+
+    Args:
+        dataset (MPCODataSet): Dataset to read from.
+        model_stage (str): Model stage, e.g. 'MODEL_STAGE[5]'.
+        requests (iterable): Tuples (results_name, selection_set_id, direction). `direction` may also be
+            a sequence of directions.
+        values_operation (str, optional): Reduction over the nodes of each selection set.
+        scaling_factor (float, optional): Factor applied to the reduced values.
+        index (SelectionIndex, optional): Resolves the selection sets and their rows from its cache.
+
+    Returns:
+        BatchResults: The labelled (row × component × time) array. Results with fewer steps than the time
+        vector (e.g. still being written) are padded with NaN and logged as a warning.
+
+    Raises:
+        ValueError: If a result has more steps than the time vector of the stage.
+    """
+    if values_operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{values_operation}'. Valid options are {list(OPERATIONS)}.")
+
+    # Group the requested selection sets by result, keeping the order of first appearance
+    rows, components, sets_by_result = [], [], {}
+    for results_name, selection_set_id, direction in requests:
+        directions = direction if isinstance(direction, (list, tuple, np.ndarray)) else [direction]
+        for d in directions:
+            if d not in components:
+                components.append(d)
+        if (results_name, selection_set_id) not in rows:
+            rows.append((results_name, selection_set_id))
+            sets_by_result.setdefault(results_name, []).append(selection_set_id)
+
+    if not rows:
+        raise ValueError("No requests to extract.")
+
+    time = get_time(dataset, model_stage)
+    data = np.full((len(rows), len(components), time.size), np.nan)
+    row_index = {row: i for i, row in enumerate(rows)}
+
+    for results_name, selection_set_ids in sets_by_result.items():
+        reduced_sets = _reduce_sets(dataset, model_stage, results_name, selection_set_ids, components,
+                                    values_operation, index)
+        for set_id, values in reduced_sets:
+            if values.shape[1] > time.size:
+                raise ValueError(
+                    f"Result '{results_name}' (selection set {set_id}) has {values.shape[1]} steps but "
+                    f"{model_stage} has {time.size} time steps."
+                )
+            if values.shape[1] < time.size:
+                logging.warning(
+                    f"Result '{results_name}' (selection set {set_id}) has {values.shape[1]} steps but "
+                    f"{model_stage} has {time.size} time steps; the missing steps are NaN."
+                )
+            data[row_index[(results_name, set_id)], :, :values.shape[1]] = values
+
+    if scaling_factor != 1:
+        data *= scaling_factor
+
+    return BatchResults(
+        model_stage=model_stage,
+        rows=rows,
+        components=components,
+        time=time,
+        data=data,
+        values_operation=values_operation,
+        scaling_factor=scaling_factor,
+    )
@@ -0,0 +1,132 @@
+import os
+import threading
+
+import numpy as np
+
+from MPCO_Model.data.mpcoFiles import NODAL_RESULTS_PATH, partition_files
+from MPCO_Model.data.nodalResults import selection_set_node_ids
+
+
+class SelectionIndex:
+    """
+    Persistent resolution of selection sets to node IDs and to HDF5 rows, shared by every extraction path
+    of a model.
+
+    - selection set ID -> sorted node IDs, resolved once;
+    - (partition file, model stage, result) -> the sorted ID dataset of the partition and its sort order,
+      read once;
+    - (partition file, model stage, result, selection set ID) -> sorted row positions, found by binary search.
+
+    `NodalResultStream` takes its rows from here, so the plot, batch, story and watch extractions all share
+    the resolution. Layouts are keyed by partition file, so partitions appearing while an analysis is
+    running are resolved when first seen, and a result missing from a partition is looked up again on the
+    next call instead of being cached. `read_rows` turns contiguous row positions into a slice read, so the
+    rows are kept as plain positions. The index is thread-safe; call `clear` if the selection sets or the
+    files change.
+    """
+    def __init__(self, dataset):
+        """
+        :param dataset: MPCODataSet whose selection sets and partition files are indexed.
+        """
+        self.dataset = dataset
+        self._lock = threading.Lock()
+        self._node_ids = {}
+        self._layouts = {}
+        self._set_rows = {}
+
+    def __repr__(self):
+        return (f"<SelectionIndex {len(self._node_ids)} selection sets, "
+                f"{len(self._layouts)} partition layouts>")
+
+    def clear(self):
+        with self._lock:
+            self._node_ids.clear()
+            self._layouts.clear()
+            self._set_rows.clear()
+
+    def node_ids(self, selection_set_id) -> np.ndarray:
+        """
+        Sorted node IDs of a selection set (read-only, shared between callers).
+        """
+        with self._lock:
+            nodes = self._node_ids.get(selection_set_id)
+        if nodes is None:
+            nodes = selection_set_node_ids(self.dataset, selection_set_id)
+            nodes.flags.writeable = False
+            with self._lock:
+                nodes = self._node_ids.setdefault(selection_set_id, nodes)
+        return nodes
+
+    def layout(self, filepath, model_stage, results_name, result_group=None):
+        """
+        Row layout of a nodal result in one partition file.
+
+        :param result_group: The result group of the file if it is already open, so it is not opened again.
+        :return: (sorted_ids, order) with `order` the rows sorted by node tag and `sorted_ids` the tags in
+                 that order, or None if the partition does not hold the result (not cached).
+        """
+        key = (os.path.abspath(filepath), model_stage, results_name)
+        with self._lock:
+            entry = self._layouts.get(key)
+        if entry is not None:
+            return entry
+
+        if result_group is not None:
+            ids = np.asarray(result_group['ID'][()], dtype=np.int64).ravel()
+        else:
+            import h5py
+
+            path = NODAL_RESULTS_PATH.format(model_stage=model_stage, results_name=results_name)
+            with h5py.File(filepath, 'r') as f:
+                if path not in f:
+                    return None
+                ids = np.asarray(f[path]['ID'][()], dtype=np.int64).ravel()
+        order = np.argsort(ids, kind='stable')
+        entry = (ids[order], order)
+        with self._lock:
+            return self._layouts.setdefault(key, entry)
+
+    def rows(self, filepath, model_stage, results_name, node_ids, result_group=None):
+        """
+        Sorted row positions of `node_ids` in one partition file (same convention as `node_rows`).
+
+        :return: The rows, empty when the partition has none of the nodes, or None when it does not hold
+                 the result.
+        """
+        entry = self.layout(filepath, model_stage, results_name, result_group)
+        if entry is None:
+            return None
+        sorted_ids, order = entry
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        if sorted_ids.size == 0:
+            return np.empty(0, dtype=np.int64)
+        i = np.clip(np.searchsorted(sorted_ids, node_ids), 0, sorted_ids.size - 1)
+        return np.unique(order[i[sorted_ids[i] == node_ids]])
+
+    def partition_rows(self, model_stage, results_name, node_ids) -> list:
+        """
+        `rows` of `node_ids` in every partition, in the order of `partition_files`.
+        """
+        return [self.rows(filepath, model_stage, results_name, node_ids)
+                for filepath in partition_files(self.dataset)]
+
+    def selection_rows(self, filepath, model_stage, results_name, selection_set_id, result_group=None):
+        """
+        `rows` of a selection set in one partition file, cached per partition file, model stage and result.
+        """
+        key = (os.path.abspath(filepath), model_stage, results_name, selection_set_id)
+        with self._lock:
+            rows = self._set_rows.get(key)
+        if rows is None:
+            rows = self.rows(filepath, model_stage, results_name, self.node_ids(selection_set_id), result_group)
+            if rows is not None:
+                with self._lock:
+                    rows = self._set_rows.setdefault(key, rows)
+        return rows
+
+    def set_rows(self, model_stage, results_name, selection_set_id) -> list:
+        """
+        `selection_rows` of a selection set in every partition, in the order of `partition_files`.
+        """
+        return [self.selection_rows(filepath, model_stage, results_name, selection_set_id)
+                for filepath in partition_files(self.dataset)]
@@ -0,0 +1,325 @@
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def catalog_path(prefix):
+    """
+    Path of the JSON catalog of a publication.
+    """
+    return os.path.join(tempfile.gettempdir(), f"{prefix}.catalog.json")
+
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _try_lock(fd):
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _catalog_lock(prefix, timeout=10.0):
+    """
+    Inter-process lock around catalog updates: an advisory lock (flock, or msvcrt on Windows) on a lock file.
+
+    The operating system releases the lock when its holder exits, so a crashed publisher never leaves the
+    catalog locked. The lock file itself is kept, removing it could let two processes lock different files.
+    """
+    path = catalog_path(prefix) + '.lock'
+    fd = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not lock the shared results catalog '{path}'.")
+            time.sleep(0.001)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_catalog(prefix):
+    try:
+        with open(catalog_path(prefix), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise KeyError(f"No shared results published under '{prefix}'.")
+
+
+def _write_catalog(prefix, catalog):
+    path = catalog_path(prefix)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f)
+    os.replace(tmp, path)
+
+
+def _attach_block(name):
+    """
+    Attaches an existing block without registering it with this process' resource tracker, which would
+    otherwise unlink it when the consumer exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    block = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+def _close_block(block):
+    """
+    Closes a handle; if arrays built on it are still alive, the mapping is left to the garbage collector.
+    """
+    try:
+        block.close()
+    except BufferError:
+        pass
+
+
+def _untrack_block(block):
+    """
+    Hands the unlinking of a block created by this process over to its readers.
+    """
+    if os.name == 'posix':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+
+
+def _unlink_block(name):
+    # Tracked attach: `unlink` unregisters it again
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+class SharedResults:
+    """
+    Publishes NumPy arrays into named shared memory blocks so other local processes can read them
+    without copying or extracting them again.
+
+    Every array gets its own block, and a small JSON catalog (in the temporary directory, named after
+    `prefix`) maps keys to block names, shapes, dtypes and metadata, and counts the attached readers.
+    Readers use `SharedResultsView(prefix)`. When the owner closes, blocks without readers are unlinked
+    right away and the others are unlinked by their last reader.
+    """
+    def __init__(self, prefix=None):
+        """
+        Args:
+            prefix (str, optional): Name of the publication, shared with the readers. Defaults to a unique name.
+        """
+        self.prefix = prefix or f"mpco_{os.getpid()}_{secrets.token_hex(4)}"
+        self._blocks = {}
+        self._closed = False
+        with _catalog_lock(self.prefix):
+            if os.path.exists(catalog_path(self.prefix)):
+                raise FileExistsError(f"Shared results '{self.prefix}' are already published.")
+            _write_catalog(self.prefix, {'owner': os.getpid(), 'closing': False, 'entries': {}})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<SharedResults '{self.prefix}', {len(self._blocks)} arrays>"
+
+    def keys(self):
+        return list(self._blocks)
+
+    def publish(self, key, array, **metadata):
+        """
+        Copies an array into a new shared block and registers it in the catalog.
+
+        Args:
+            key (str): Name used by the readers, e.g. 'pushover/2/1/1/y_array'.
+            array (array-like): Array to publish.
+            **metadata: JSON-serializable metadata stored with the entry.
+
+        Returns:
+            numpy.ndarray: The published array, backed by the shared block.
+        """
+        if self._closed:
+            raise ValueError("The shared results are closed.")
+        if key in self._blocks:
+            raise KeyError(f"'{key}' is already published.")
+
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1),
+                                           name=f"{self.prefix}_{len(self._blocks)}")
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        self._blocks[key] = block
+
+        with _catalog_lock(self.prefix):
+            catalog = _read_catalog(self.prefix)
+            catalog['entries'][key] = {
+                'block': block.name,
+                'shape': list(array.shape),
+                'dtype': array.dtype.str,
+                'refs': 0,
+                'metadata': metadata,
+            }
+            _write_catalog(self.prefix, catalog)
+        return shared
+
+    def publish_many(self, arrays, key_prefix='', **metadata):
+        """
+        Publishes a dict of arrays, e.g. the result of `Plot.extract_pushover`, under `key_prefix + key`.
+        """
+        return {key: self.publish(key_prefix + key, array, **metadata) for key, array in arrays.items()}
+
+    def close(self):
+        """
+        Stops publishing: releases the owner's handles and unlinks every block no reader holds.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        with _catalog_lock(self.prefix):
+            catalog = _read_catalog(self.prefix)
+            catalog['closing'] = True
+            for key, entry in list(catalog['entries'].items()):
+                if entry['refs'] <= 0:
+                    _unlink_block(entry['block'])
+                    del catalog['entries'][key]
+                elif key in self._blocks:
+                    _untrack_block(self._blocks[key])
+            for block in self._blocks.values():
+                _close_block(block)
+            self._blocks.clear()
+
+            if catalog['entries']:
+                _write_catalog(self.prefix, catalog)
+            else:
+                os.remove(catalog_path(self.prefix))
+
+
+class SharedResultsView:
+    """
+    Read-only, zero-copy access to the arrays published by a `SharedResults` in another process.
+
+    Every `get` attaches the block once and increments its reader count; `close` releases them, and the
+    last reader of a closed publication unlinks the block.
+    """
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._blocks = {}
+        self._arrays = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<SharedResultsView '{self.prefix}', {len(self._arrays)} attached>"
+
+    def catalog(self) -> dict:
+        """
+        Published entries: key -> {'block', 'shape', 'dtype', 'refs', 'metadata'}.
+        """
+        return _read_catalog(self.prefix)['entries']
+
+    def keys(self):
+        return list(self.catalog())
+
+    def get(self, key) -> np.ndarray:
+        """
+        Zero-copy, read-only view of a published array.
+
+        :raises KeyError: If the key is not published.
+        """
+        if key in self._arrays:
+            return self._arrays[key]
+
+        with _catalog_lock(self.prefix):
+            catalog = _read_catalog(self.prefix)
+            entry = catalog['entries'].get(key)
+            if entry is None:
+                raise KeyError(f"'{key}' is not published under '{self.prefix}'.")
+            block = _attach_block(entry['block'])
+            entry['refs'] += 1
+            _write_catalog(self.prefix, catalog)
+
+        array = np.ndarray(tuple(entry['shape']), dtype=np.dtype(entry['dtype']), buffer=block.buf)
+        array.flags.writeable = False
+        self._blocks[key] = block
+        self._arrays[key] = array
+        return array
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.get(key)
+
+    def metadata(self, key) -> dict:
+        return self.catalog()[key]['metadata']
+
+    def release(self, key):
+        """
+        Detaches one array. The views returned by `get` for it must not be used afterwards.
+        """
+        block = self._blocks.pop(key, None)
+        if block is None:
+            return
+        self._arrays.pop(key, None)
+        _close_block(block)
+
+        with _catalog_lock(self.prefix):
+            try:
+                catalog = _read_catalog(self.prefix)
+            except KeyError:
+                return
+            entry = catalog['entries'].get(key)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            if catalog['closing'] and entry['refs'] <= 0:
+                _unlink_block(entry['block'])
+                del catalog['entries'][key]
+            if catalog['closing'] and not catalog['entries']:
+                os.remove(catalog_path(self.prefix))
+            else:
+                _write_catalog(self.prefix, catalog)
+
+    def close(self):
+        """
+        Detaches every array of this view.
+        """
+        for key in list(self._blocks):
+            self.release(key)
@@ -0,0 +1,250 @@
+import glob
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from MPCO_Model.data.mpcoFiles import partition_files
+
+# Snapshot layout version, bump it if the stored fields change
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = '{recorder_name}.snapshot.npz'
+
+# Mass file whose availability is recorded, relative to hdf5_directory
+MASS_FILE = os.path.join('results', 'nodeMassCoord.out')
+
+# Selection set entries stored as concatenated arrays + offsets
+_SET_ARRAYS = ('NODES', 'ELEMENTS')
+
+
+def snapshot_path(directory, recorder_name='results') -> str:
+    return os.path.join(directory, SNAPSHOT_FILENAME.format(recorder_name=recorder_name))
+
+
+def file_signatures(directory, recorder_name='results') -> dict:
+    """
+    (size, mtime_ns) of every file the metadata is read from: the MPCO partitions, the .cdata files and
+    the mass file. Any file added, removed, rewritten or touched changes the signatures.
+    """
+    files = (glob.glob(os.path.join(directory, f"{recorder_name}.part-*.mpco"))
+             or glob.glob(os.path.join(directory, '*.mpco')))
+    files += glob.glob(os.path.join(directory, '*.cdata'))
+    mass_file = os.path.join(directory, MASS_FILE)
+    if os.path.exists(mass_file):
+        files.append(mass_file)
+
+    signatures = {}
+    for path in sorted(files):
+        stat = os.stat(path)
+        signatures[os.path.relpath(path, directory)] = [stat.st_size, stat.st_mtime_ns]
+    return signatures
+
+
+def _plain(values) -> np.ndarray:
+    # Object columns (e.g. stage names) are stored as strings so the snapshot never needs pickling
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype == object else values
+
+
+class MetadataSnapshot:
+    """
+    Metadata of a dataset restored from its snapshot: model stages, selection sets, the step/time table,
+    the dataset name, the partition files and whether the mass file exists.
+    """
+    def __init__(self, directory, recorder_name, name, model_stages, selection_set, time, masses_available,
+                 partitions):
+        self.directory = directory
+        self.recorder_name = recorder_name
+        self.name = name
+        self.model_stages = model_stages
+        self.selection_set = selection_set
+        self.time = time
+        self.masses_available = masses_available
+        self.partitions = partitions
+
+    def __repr__(self):
+        return (f"<MetadataSnapshot '{self.name}', {len(self.model_stages)} stages, "
+                f"{len(self.selection_set)} selection sets>")
+
+
+def write_snapshot(dataset, path=None) -> str:
+    """
+    Writes the metadata snapshot of an opened dataset in its `hdf5_directory`.
+
+    The snapshot is a single uncompressed .npz: a JSON header (version, file signatures, stages, set names)
+    and flat arrays for the selection sets and the time table, so it loads without pickling. Failures
+    (e.g. read-only folders) are only logged.
+
+    :return: The path of the snapshot, or None if it could not be written.
+    """
+    directory = dataset.hdf5_directory
+    recorder_name = getattr(dataset, 'recorder_name', 'results')
+    path = path or snapshot_path(directory, recorder_name)
+
+    signatures = file_signatures(directory, recorder_name)
+    sets = []
+    arrays = {}
+    for key in _SET_ARRAYS:
+        values, offsets = [], [0]
+        for set_id, entry in dataset.selection_set.items():
+            v = np.asarray(entry.get(key, ()), dtype=np.int64).ravel()
+            values.append(v)
+            offsets.append(offsets[-1] + v.size)
+        arrays[f'set_{key}'] = np.concatenate(values) if values else np.empty(0, dtype=np.int64)
+        arrays[f'set_{key}_offsets'] = np.asarray(offsets, dtype=np.int64)
+    for set_id, entry in dataset.selection_set.items():
+        sets.append({'id': set_id if isinstance(set_id, str) else int(set_id), 'name': entry.get('SET_NAME'),
+                     'keys': [key for key in _SET_ARRAYS if key in entry]})
+
+    time = dataset.time
+    index = time.index
+    for level, name in enumerate(index.names):
+        arrays[f'time_index_{level}'] = _plain(index.get_level_values(level))
+    for c, column in enumerate(time.columns):
+        arrays[f'time_column_{c}'] = _plain(time[column])
+
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'recorder_name': recorder_name,
+        'signatures': signatures,
+        'name': str(dataset.info.name),
+        'model_stages': list(dataset.model_stages),
+        'selection_sets': sets,
+        'time_index_names': list(index.names),
+        'time_columns': [str(column) for column in time.columns],
+        'masses_available': MASS_FILE in signatures,
+        'partitions': [os.path.relpath(f, directory) for f in partition_files(dataset)],
+    }
+    arrays['header'] = np.array(json.dumps(header))
+
+    try:
+        # Write to a temporary file first so a crash never leaves a half written snapshot behind
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except OSError as e:
+        logging.warning(f"Could not write metadata snapshot '{path}': {e}")
+        return None
+    return path
+
+
+def read_snapshot(directory, recorder_name='results', path=None):
+    """
+    Restores the metadata snapshot of a directory.
+
+    :return: A MetadataSnapshot, or None if there is no snapshot, it is unreadable, or any file it was
+             built from changed since (sizes and modification times).
+    """
+    path = path or snapshot_path(directory, recorder_name)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            if (header.get('version') != SNAPSHOT_VERSION
+                    or header.get('recorder_name') != recorder_name
+                    or header.get('signatures') != file_signatures(directory, recorder_name)):
+                return None
+            arrays = {key: npz[key] for key in npz.files if key != 'header'}
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Ignoring unreadable metadata snapshot '{path}': {e}")
+        return None
+
+    selection_set = {}
+    for i, entry in enumerate(header['selection_sets']):
+        restored = {'SET_NAME': entry['name']}
+        for key in entry['keys']:
+            offsets = arrays[f'set_{key}_offsets']
+            restored[key] = arrays[f'set_{key}'][offsets[i]:offsets[i + 1]]
+        selection_set[entry['id']] = restored
+
+    names = header['time_index_names']
+    levels = [arrays[f'time_index_{level}'] for level in range(len(names))]
+    index = pd.MultiIndex.from_arrays(levels, names=names) if len(levels) > 1 else pd.Index(levels[0], name=names[0])
+    time = pd.DataFrame({column: arrays[f'time_column_{c}'] for c, column in enumerate(header['time_columns'])},
+                        index=index)
+
+    return MetadataSnapshot(
+        directory=directory,
+        recorder_name=recorder_name,
+        name=header['name'],
+        model_stages=header['model_stages'],
+        selection_set=selection_set,
+        time=time,
+        masses_available=header['masses_available'],
+        partitions=[os.path.join(directory, f) for f in header['partitions']],
+    )
+
+
+class _Info:
+    def __init__(self, name):
+        self.name = name
+
+
+class SnapshotDataSet:
+    """
+    Dataset restored from a metadata snapshot.
+
+    The metadata (`info.name`, `hdf5_directory`, `recorder_name`, `model_stages`, `selection_set`, `time`,
+    `results_partitions`) comes from the snapshot; the MPCODataSet itself is only opened on the first access to anything else
+    (e.g. `nodes` when results are extracted).
+    """
+    def __init__(self, snapshot: MetadataSnapshot, dataset_kwargs=None):
+        self.snapshot = snapshot
+        self.hdf5_directory = snapshot.directory
+        self.recorder_name = snapshot.recorder_name
+        self.model_stages = snapshot.model_stages
+        self.selection_set = snapshot.selection_set
+        self.time = snapshot.time
+        self.results_partitions = dict(enumerate(snapshot.partitions))
+        self.info = _Info(snapshot.name)
+        self._dataset_kwargs = dataset_kwargs or {}
+        self._dataset = None
+        self._lock = threading.Lock()
+
+    @property
+    def dataset(self):
+        """
+        The underlying MPCODataSet, opened on first access.
+        """
+        with self._lock:
+            if self._dataset is None:
+                from STKO_to_python import MPCODataSet
+                self._dataset = MPCODataSet(self.hdf5_directory, self.recorder_name, **self._dataset_kwargs)
+        return self._dataset
+
+    def __getattr__(self, name):
+        # Only called for attributes the snapshot does not provide
+        if name.startswith('_') or name in ('snapshot', 'dataset'):
+            raise AttributeError(name)
+        return getattr(self.dataset, name)
+
+    def __repr__(self):
+        state = 'opened' if self._dataset is not None else 'not opened'
+        return f"<SnapshotDataSet '{self.info.name}', MPCODataSet {state}>"
+
+
+def open_dataset(directory, recorder_name='results', snapshot=True, dataset_kwargs=None):
+    """
+    Opens the dataset of a directory, from its metadata snapshot when it is up to date.
+
+    With `snapshot` enabled, a missing or stale snapshot is rebuilt from a freshly opened MPCODataSet.
+
+    :return: (dataset, MetadataSnapshot or None).
+    """
+    if snapshot:
+        restored = read_snapshot(directory, recorder_name)
+        if restored is not None:
+            return SnapshotDataSet(restored, dataset_kwargs), restored
+
+    from STKO_to_python import MPCODataSet
+    dataset = MPCODataSet(directory, recorder_name, **(dataset_kwargs or {}))
+    if snapshot:
+        write_snapshot(dataset)
+        return dataset, read_snapshot(directory, recorder_name)
+    return dataset, None
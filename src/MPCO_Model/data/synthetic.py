@@ -0,0 +1,194 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from MPCO_Model.data.mpcoFiles import NODAL_RESULTS_PATH, open_partitions, step_keys, step_time
+
+
+def synthetic_stories(n_stories, story_height=3.0):
+    """
+    Story elevations of a regular building: ground level plus `n_stories` floors.
+    """
+    return [float(h) for h in np.arange(n_stories + 1) * story_height]
+
+
+def node_coordinates(n_nodes, stories, plan_size=30.0, seed=0):
+    """
+    Node IDs and coordinates spread uniformly over the levels of a building.
+
+    :return: (node_ids, xyz) with `xyz` of shape (n_nodes, 3).
+    """
+    rng = np.random.default_rng(seed)
+    node_ids = np.arange(1, n_nodes + 1, dtype=np.int64)
+    levels = np.asarray(stories, dtype=np.float64)
+    z = levels[np.arange(n_nodes) % levels.size]
+    xy = rng.uniform(0.0, plan_size, size=(n_nodes, 2))
+    return node_ids, np.column_stack([xy, z])
+
+
+def write_mass_file(folder_path, n_nodes, stories, results_path='results', filename='nodeMassCoord.out', seed=0):
+    """
+    Writes a nodeMassCoord.out file with random nodal masses on a synthetic building.
+
+    :return: Path of the written file.
+    """
+    rng = np.random.default_rng(seed)
+    node_ids, xyz = node_coordinates(n_nodes, stories, seed=seed)
+    masses = rng.uniform(0.5, 2.0, size=(n_nodes, 1)) * np.array([1, 1, 1, 0.1, 0.1, 0.1])
+
+    directory = os.path.join(folder_path, results_path)
+    os.makedirs(directory, exist_ok=True)
+    filepath = os.path.join(directory, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('# nodeID  xCrd  yCrd  zCrd  Mx  My  Mz  Mrx  Mry  Mrz\n')
+        np.savetxt(f, np.column_stack([node_ids, xyz, masses]), fmt=['%d'] + ['%.6g'] * 9)
+    return filepath
+
+
+def write_modal_report(folder_path, n_modes, first_period=1.5, filename='modal.txt'):
+    """
+    Writes an OpenSees-style modal report (eigenvalues and mass participation ratios) with `n_modes` modes.
+
+    :return: Path of the written file.
+    """
+    modes = np.arange(1, n_modes + 1)
+    period = first_period / (2 * modes - 1)
+    omega = 2 * np.pi / period
+    ratios = np.column_stack([80.0 / modes ** 2, 75.0 / modes ** 2, np.zeros(n_modes)])
+
+    filepath = os.path.join(folder_path, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('MODAL ANALYSIS REPORT\n\n* 2. EIGENVALUE ANALYSIS:\n')
+        f.write('    MODE        LAMBDA         OMEGA     FREQUENCY        PERIOD\n')
+        f.write('       -   [rad/sec]^2       [rad/sec]       [1/sec]         [sec]\n')
+        np.savetxt(f, np.column_stack([modes, omega ** 2, omega, omega / (2 * np.pi), period]),
+                   fmt=['%8d'] + ['%14.6g'] * 4)
+        f.write('\n* 8. MODAL PARTICIPATION MASS RATIOS (%):\n')
+        f.write('    MODE            MX            MY            MZ\n')
+        np.savetxt(f, np.column_stack([modes, ratios]), fmt=['%8d'] + ['%14.6g'] * 3)
+        f.write('\n* 9. MODAL PARTICIPATION MASS RATIOS (%) - CUMULATIVE:\n')
+        f.write('    MODE            MX            MY            MZ\n')
+        np.savetxt(f, np.column_stack([modes, np.cumsum(ratios, axis=0)]), fmt=['%8d'] + ['%14.6g'] * 3)
+    return filepath
+
+
+def write_mpco(folder_path, n_nodes, stories, n_steps, dt=0.01, partitions=2, recorder_name='results',
+               model_stage='MODEL_STAGE[5]', results=('DISPLACEMENT', 'VELOCITY', 'ACCELERATION', 'REACTION_FORCE'),
+               seed=0):
+    """
+    Writes MPCO-layout HDF5 partition files with smooth nodal responses that grow with the elevation,
+    like a building shaking in its first mode.
+
+    :return: List of the written partition files.
+    """
+    import h5py
+
+    rng = np.random.default_rng(seed)
+    node_ids, xyz = node_coordinates(n_nodes, stories, seed=seed)
+    height = max(float(np.max(stories)), 1.0)
+    shape = (xyz[:, 2] / height)[:, None] * np.array([1.0, 0.6, 0.05])
+    time = np.arange(n_steps) * dt
+    signals = {name: (i + 1) * np.sin(2 * np.pi * (0.5 + 0.3 * i) * time) for i, name in enumerate(results)}
+
+    os.makedirs(folder_path, exist_ok=True)
+    files = []
+    for part, part_nodes in enumerate(np.array_split(rng.permutation(n_nodes), partitions)):
+        part_nodes = np.sort(part_nodes)
+        filepath = os.path.join(folder_path, f"{recorder_name}.part-{part}.mpco")
+        with h5py.File(filepath, 'w') as f:
+            for name in results:
+                group = f.create_group(NODAL_RESULTS_PATH.format(model_stage=model_stage, results_name=name))
+                group['ID'] = node_ids[part_nodes].reshape(-1, 1)
+                data = group.create_group('DATA')
+                part_shape = shape[part_nodes]
+                for step in range(n_steps):
+                    dataset = data.create_dataset(f"STEP_{step}", data=part_shape * signals[name][step])
+                    dataset.attrs['TIME'] = np.array([time[step]])
+                    dataset.attrs['STEP'] = np.array([step])
+        files.append(filepath)
+    return files
+
+
+def write_synthetic_model(folder_path, n_nodes=1000, n_stories=10, n_steps=500, n_modes=12, partitions=2,
+                          recorder_name='results', model_stage='MODEL_STAGE[5]', seed=0):
+    """
+    Writes a complete synthetic model directory: MPCO partitions, nodeMassCoord.out and modal.txt.
+
+    :return: The story elevations of the model.
+    """
+    stories = synthetic_stories(n_stories)
+    write_mpco(folder_path, n_nodes, stories, n_steps, partitions=partitions, recorder_name=recorder_name,
+               model_stage=model_stage, seed=seed)
+    write_mass_file(folder_path, n_nodes, stories, seed=seed)
+    write_modal_report(folder_path, n_modes)
+    return stories
+
+
+class _Info:
+    def __init__(self, name):
+        self.name = name
+
+
+class _SyntheticNodes:
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def get_nodal_results(self, results_name, model_stage=None, node_ids=None, selection_set_id=None):
+        """
+        Nodal results indexed by (node_id, step) with one column per component, read from the partitions.
+        """
+        if node_ids is None:
+            node_ids = self.dataset.selection_set[selection_set_id]['NODES']
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        path = NODAL_RESULTS_PATH.format(model_stage=model_stage, results_name=results_name)
+
+        frames = []
+        with open_partitions(self.dataset) as files:
+            for f in files:
+                group = f[path]
+                ids = np.asarray(group['ID'][()], dtype=np.int64).ravel()
+                rows = np.flatnonzero(np.isin(ids, node_ids))
+                if rows.size == 0:
+                    continue
+                data = group['DATA']
+                keys = step_keys(data)
+                # (steps, nodes, components) -> rows ordered by node, then step
+                values = np.stack([data[k][()][rows] for k in keys]).transpose(1, 0, 2)
+                index = pd.MultiIndex.from_product([ids[rows], np.arange(len(keys))], names=['node_id', 'step'])
+                frames.append(pd.DataFrame(values.reshape(-1, values.shape[2]), index=index))
+        return pd.concat(frames).sort_index()
+
+
+class SyntheticDataSet:
+    """
+    Minimal MPCODataSet stand-in over files written by `write_synthetic_model`, for benchmarks and demos.
+
+    It provides the attributes used by this package: info.name, hdf5_directory, recorder_name,
+    model_stages, selection_set (one set per level plus set 0 with every node), time and
+    nodes.get_nodal_results.
+    """
+    def __init__(self, folder_path, stories, recorder_name='results', model_stage='MODEL_STAGE[5]', name=None):
+        self.hdf5_directory = folder_path
+        self.recorder_name = recorder_name
+        self.model_stages = [model_stage]
+        self.info = _Info(name or os.path.basename(os.path.normpath(folder_path)))
+        self.nodes = _SyntheticNodes(self)
+
+        with open_partitions(self) as files:
+            group = files[0][NODAL_RESULTS_PATH.format(model_stage=model_stage, results_name='DISPLACEMENT')]
+            data = group['DATA']
+            time = np.array([step_time(data[k]) for k in step_keys(data)])
+            ids = np.concatenate([
+                np.asarray(f[group.name]['ID'][()], dtype=np.int64).ravel() for f in files
+            ])
+
+        index = pd.MultiIndex.from_product([[model_stage], np.arange(time.size)], names=['MODEL_STAGE', 'STEP'])
+        self.time = pd.DataFrame({'TIME': time}, index=index)
+
+        # Selection set 0 holds every node, sets 1..n the nodes of each level
+        ids = np.sort(ids)
+        n_levels = len(stories)
+        self.selection_set = {0: {'SET_NAME': 'ALL', 'NODES': ids}}
+        for level in range(n_levels):
+            self.selection_set[level + 1] = {'SET_NAME': f'LEVEL_{level}', 'NODES': ids[(ids - 1) % n_levels == level]}
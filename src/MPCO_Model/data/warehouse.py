@@ -0,0 +1,334 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Curve index: one record per stored curve, the values live in the /curves/x and /curves/y columns
+CURVE_INDEX_DTYPE = np.dtype([
+    ('model', 'S128'),
+    ('kind', 'S16'),
+    ('results_name', 'S64'),
+    ('model_stage', 'S64'),
+    ('selection_set', np.int64),
+    ('selection_set_x', np.int64),
+    ('direction', np.int64),
+    ('offset', np.int64),
+    ('length', np.int64),
+])
+CURVE_KEY = ('model', 'kind', 'results_name', 'model_stage', 'selection_set', 'selection_set_x', 'direction')
+
+MASS_COLUMNS = ['Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']
+MASS_DTYPE = np.dtype([('model', 'S128'), ('story', np.float64)] + [(c, np.float64) for c in MASS_COLUMNS])
+PERIOD_DTYPE = np.dtype([('model', 'S128'), ('mode', np.int64), ('period', np.float64)])
+
+CURVE_KINDS = ('pushover', 'time_history')
+
+
+def _encode(value, dtype, field) -> bytes:
+    """
+    UTF-8 bytes of a string stored in a fixed-size field of `dtype`.
+
+    :raises ValueError: If the encoded string does not fit, instead of letting NumPy cut it silently
+                        (truncated names collide, and a cut inside a character cannot be decoded).
+    """
+    encoded = str(value).encode('utf-8')
+    size = dtype[field].itemsize
+    if len(encoded) > size:
+        raise ValueError(f"{field} '{value}' is {len(encoded)} bytes long in UTF-8; "
+                         f"at most {size} bytes can be stored.")
+    return encoded
+
+
+def _decode(frame):
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = frame[column].str.decode('utf-8')
+    return frame
+
+
+class ResultsWarehouse:
+    """
+    Single HDF5 store of extracted results across many models.
+
+    Curves (pushover and time histories) are stored column-wise: every x and y value goes into two
+    chunked, compressed 1-D datasets, and a small index table records the model, kind, result, stage,
+    selection sets, direction and the slice of every curve. Story masses and modal periods are
+    stored as tables with a model column. Queries load the index once and then read only the slices
+    of the selected curves, without opening the MPCO files again.
+
+    Curves are appended; storing a curve again under the same key adds a new copy and the latest one
+    is returned by the queries. Names are stored in fixed-size fields (128 UTF-8 bytes for model names,
+    64 for results and stages) and longer ones are rejected.
+    """
+    def __init__(self, path, mode='a', compression='gzip', compression_opts=4, chunk_size=65536):
+        """
+        Args:
+            path (str): Warehouse file (e.g. 'results.h5').
+            mode (str, optional): h5py file mode, 'r' for read-only access. Defaults to 'a'.
+            compression (str, optional): HDF5 compression filter. Defaults to 'gzip'.
+            compression_opts (int, optional): Compression level. Defaults to 4.
+            chunk_size (int, optional): Chunk length of the value columns. Defaults to 65536.
+        """
+        import h5py
+
+        self.path = os.fspath(path)
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.chunk_size = chunk_size
+        self.file = h5py.File(self.path, mode)
+        self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+    def __repr__(self):
+        return f"<ResultsWarehouse {self.path}, {len(self._curve_index())} curves>"
+
+    # Writing
+
+    def _table(self, name, dtype):
+        if name not in self.file:
+            self.file.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype, chunks=True,
+                                     compression=self.compression, compression_opts=self.compression_opts)
+        return self.file[name]
+
+    def _column(self, name):
+        if name not in self.file:
+            self.file.create_dataset(name, shape=(0,), maxshape=(None,), dtype=np.float64,
+                                     chunks=(self.chunk_size,), compression=self.compression,
+                                     compression_opts=self.compression_opts, shuffle=True)
+        return self.file[name]
+
+    @staticmethod
+    def _append(dataset, values):
+        start = dataset.shape[0]
+        dataset.resize((start + len(values),))
+        dataset[start:] = values
+        return start
+
+    def add_curve(self, model, kind, x_array, y_array, model_stage, selection_set_id=-1, direction=-1,
+                  results_name='', selection_set_id_x=-1):
+        """
+        Appends one curve.
+
+        Args:
+            model (str): Model name.
+            kind (str): 'pushover' or 'time_history'.
+            x_array, y_array (array-like): Curve values, same length.
+            model_stage (str): Model stage the curve was extracted from.
+            selection_set_id (int, optional): Selection set of the vertical axis.
+            direction (int, optional): Result component.
+            results_name (str, optional): Result of the vertical axis.
+            selection_set_id_x (int, optional): Selection set of the horizontal axis (pushover curves).
+        """
+        if kind not in CURVE_KINDS:
+            raise ValueError(f"Unknown curve kind '{kind}'. Valid options are {list(CURVE_KINDS)}.")
+        x_array = np.asarray(x_array, dtype=np.float64).ravel()
+        y_array = np.asarray(y_array, dtype=np.float64).ravel()
+        if x_array.shape != y_array.shape:
+            raise ValueError("`x_array` and `y_array` must have the same length.")
+
+        # Encoded before anything is written, so a name that does not fit leaves the file untouched
+        names = tuple(_encode(value, CURVE_INDEX_DTYPE, field) for value, field in
+                      ((model, 'model'), (kind, 'kind'), (results_name, 'results_name'), (model_stage, 'model_stage')))
+
+        offset = self._append(self._column('curves/x'), x_array)
+        self._append(self._column('curves/y'), y_array)
+
+        record = np.array([names + (selection_set_id, selection_set_id_x, direction, offset, x_array.size)],
+                          dtype=CURVE_INDEX_DTYPE)
+        self._append(self._table('curves/index', CURVE_INDEX_DTYPE), record)
+        self._index = None
+
+    def add_masses(self, model, lumped):
+        """
+        Stores the lumped story masses of a model (DataFrame with 'story' and the mass columns), replacing
+        any previous table of that model.
+        """
+        records = np.zeros(len(lumped), dtype=MASS_DTYPE)
+        records['model'] = _encode(model, MASS_DTYPE, 'model')
+        records['story'] = np.asarray(lumped['story'], dtype=np.float64)
+        for column in MASS_COLUMNS:
+            records[column] = np.asarray(lumped[column], dtype=np.float64)
+        self._replace_rows('masses', MASS_DTYPE, model, records)
+
+    def add_periods(self, model, periods):
+        """
+        Stores the modal periods of a model, replacing any previous ones.
+        """
+        periods = np.asarray(periods, dtype=np.float64).ravel()
+        records = np.zeros(periods.size, dtype=PERIOD_DTYPE)
+        records['model'] = _encode(model, PERIOD_DTYPE, 'model')
+        records['mode'] = np.arange(1, periods.size + 1)
+        records['period'] = periods
+        self._replace_rows('periods', PERIOD_DTYPE, model, records)
+
+    def _replace_rows(self, name, dtype, model, records):
+        table = self._table(name, dtype)
+        current = table[()]
+        keep = current[current['model'] != _encode(model, dtype, 'model')]
+        table.resize((keep.size + records.size,))
+        if keep.size:
+            table[:keep.size] = keep
+        table[keep.size:] = records
+
+    def add_model(self, model, pushovers=(), time_histories=(), n_periods=None, masses=True):
+        """
+        Extracts and stores the results of a Model.
+
+        Args:
+            model (Model): Model to export.
+            pushovers (iterable, optional): (selection_set_id_verticalAxis, selection_set_id_horizontalAxis,
+                direction) tuples.
+            time_histories (iterable, optional): (results_name, selection_set_id, direction) tuples.
+            n_periods (int, optional): Number of modal periods to store. Defaults to None (none).
+            masses (bool, optional): Store the lumped story masses when available. Defaults to True.
+        """
+        self.add_payload(model.name, model_payload(model, pushovers, time_histories, n_periods, masses))
+
+    def add_payload(self, name, payload):
+        """
+        Stores a payload built by `model_payload` (e.g. returned by a worker process).
+        """
+        for curve in payload['curves']:
+            self.add_curve(name, **curve)
+        if payload.get('masses') is not None:
+            self.add_masses(name, payload['masses'])
+        if payload.get('periods') is not None:
+            self.add_periods(name, payload['periods'])
+        self.file.flush()
+
+    # Queries
+
+    def _curve_index(self) -> pd.DataFrame:
+        if self._index is None:
+            if 'curves/index' in self.file:
+                index = _decode(pd.DataFrame(self.file['curves/index'][()]))
+                # Latest copy of every key wins
+                self._index = index.drop_duplicates(list(CURVE_KEY), keep='last')
+            else:
+                self._index = pd.DataFrame(np.zeros(0, dtype=CURVE_INDEX_DTYPE))
+        return self._index
+
+    def index(self, **filters) -> pd.DataFrame:
+        """
+        Curve index, optionally filtered by any of model, kind, results_name, model_stage, selection_set,
+        selection_set_x and direction. A filter value may be a scalar or a list of accepted values.
+        """
+        index = self._curve_index()
+        mask = np.ones(len(index), dtype=bool)
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column not in CURVE_KEY:
+                raise KeyError(f"Unknown filter '{column}'. Valid options are {list(CURVE_KEY)}.")
+            values = value if isinstance(value, (list, tuple, set, np.ndarray)) else [value]
+            mask &= index[column].isin(values).to_numpy()
+        return index[mask]
+
+    def curves(self, **filters):
+        """
+        Yields (record, x_array, y_array) for every curve matching the filters, reading only their slices.
+        """
+        selected = self.index(**filters).sort_values('offset')
+        x_column, y_column = self.file['curves/x'], self.file['curves/y']
+        for record in selected.itertuples(index=False):
+            window = slice(record.offset, record.offset + record.length)
+            yield record, x_column[window], y_column[window]
+
+    def curve(self, model, kind='pushover', **filters):
+        """
+        Returns a single curve as {'x_array', 'y_array'}.
+
+        :raises KeyError: If no curve, or more than one, matches.
+        """
+        matches = list(self.curves(model=model, kind=kind, **filters))
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} curves match {dict(model=model, kind=kind, **filters)}; expected 1.")
+        _, x_array, y_array = matches[0]
+        return {'x_array': x_array, 'y_array': y_array}
+
+    def stacked(self, **filters):
+        """
+        Matching curves stacked into NaN-padded 2-D arrays, with their index rows.
+
+        Returns:
+            tuple: (index DataFrame, x of shape (n_curves, max_length), y of the same shape).
+        """
+        rows, xs, ys = [], [], []
+        for record, x_array, y_array in self.curves(**filters):
+            rows.append(record)
+            xs.append(x_array)
+            ys.append(y_array)
+        length = max((x.size for x in xs), default=0)
+        x_out = np.full((len(xs), length), np.nan)
+        y_out = np.full((len(ys), length), np.nan)
+        for i, (x_array, y_array) in enumerate(zip(xs, ys)):
+            x_out[i, :x_array.size] = x_array
+            y_out[i, :y_array.size] = y_array
+        return pd.DataFrame(rows, columns=list(CURVE_INDEX_DTYPE.names)), x_out, y_out
+
+    def _rows(self, name, dtype, model):
+        if name not in self.file:
+            return pd.DataFrame(np.zeros(0, dtype=dtype))
+        frame = _decode(pd.DataFrame(self.file[name][()]))
+        if model is not None:
+            models = model if isinstance(model, (list, tuple, set)) else [model]
+            frame = frame[frame['model'].isin(models)]
+        return frame.reset_index(drop=True)
+
+    def masses(self, model=None) -> pd.DataFrame:
+        """
+        Lumped story masses, one row per model and story.
+        """
+        return self._rows('masses', MASS_DTYPE, model)
+
+    def periods(self, model=None) -> pd.DataFrame:
+        """
+        Modal periods, one row per model and mode.
+        """
+        return self._rows('periods', PERIOD_DTYPE, model)
+
+    def models(self):
+        """
+        Names of every model with stored results.
+        """
+        names = set(self._curve_index()['model'])
+        names.update(self.masses()['model'])
+        names.update(self.periods()['model'])
+        return sorted(names)
+
+
+def model_payload(model, pushovers=(), time_histories=(), n_periods=None, masses=True):
+    """
+    Extracts the results stored by `ResultsWarehouse.add_model`, as plain arrays and DataFrames that can
+    be returned by a worker process.
+    """
+    plot = model.plot
+    curves = []
+    for selection_set_v, selection_set_h, direction in pushovers:
+        results = plot.extract_pushover(selection_set_v, selection_set_h, direction)
+        parameters = plot.default_parameters_PO
+        curves.append(dict(kind='pushover', x_array=results['x_array'], y_array=results['y_array'],
+                           model_stage=parameters.model_stage, selection_set_id=selection_set_v,
+                           direction=direction, results_name=parameters.results_name_verticalAxis,
+                           selection_set_id_x=selection_set_h))
+    for results_name, selection_set_id, direction in time_histories:
+        results = plot.extract_time_history(results_name, selection_set_id, direction)
+        curves.append(dict(kind='time_history', x_array=results['x_array'], y_array=results['y_array'],
+                           model_stage=plot.default_parameters_TH.model_stage, selection_set_id=selection_set_id,
+                           direction=direction, results_name=results_name))
+
+    payload = {'curves': curves, 'masses': None, 'periods': None}
+    if masses and model.mass is not None:
+        payload['masses'] = model.mass._aggregated_mass_lumped()
+    if n_periods:
+        payload['periods'] = np.asarray(model.modal_report().periods(n_periods), dtype=np.float64)
+    return payload
@@ -1,3 +1,20 @@
-from .dynamicMass import Masses
+from typing import TYPE_CHECKING
 
-__all__ = ['Masses']
\ No newline at end of file
+from MPCO_Model import _lazy
+
+_LAZY_IMPORTS = {
+    'Masses': '.dynamicMass',
+    'StoryIndex': '.storyIndex',
+    'ModalReport': '.modalReport',
+    'SpatialIndex': '.spatialIndex',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
+
+
+if TYPE_CHECKING:
+    from .dynamicMass import Masses
+    from .storyIndex import StoryIndex
+    from .modalReport import ModalReport
+    from .spatialIndex import SpatialIndex
@@ -1,28 +1,155 @@
 import os
+import json
 import logging
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from typing import List, Optional
 
+from .storyIndex import StoryIndex
+from .spatialIndex import SpatialIndex
+from .modalReport import ModalReport
+from MPCO_Model.core.profiling import NULL_PROFILER
+
 
 class Masses:
     """
     In order to use this class, you need to have the OpenSees output files in a specific format.
     Add the getMass custom command to the STKO model to generate the nodeMassCoord.out file.
+
+    Parsed mass files are cached twice: in memory (shared by every Masses instance in the
+    process, the `MEMO_SIZE` most recently used files only) and on disk as a binary sidecar next to the text file. Both are keyed on the
+    file path, size and modification time, so editing or re-running the analysis invalidates them.
     """
-    def __init__(self, folder_path, stories=None):
+    COLUMNS = ['nodeID', 'xCrd', 'yCrd', 'zCrd', 'Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']
+    MASS_COLUMNS = ['Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']
+
+    # Sidecar layout version, bump it if the binary layout changes
+    CACHE_VERSION = 1
+    CACHE_SUFFIX = '.cache.npy'
+    CACHE_META_SUFFIX = '.cache.json'
+
+    # In-process memo: absolute path -> ((size, mtime_ns), DataFrame), least recently used first
+    MEMO_SIZE = 4
+    _memo = OrderedDict()
+    _memo_lock = threading.Lock()
+
+    def __init__(self, folder_path, stories=None, use_cache=True, profiler=None):
         """
         :param folder_path: Path to the directory containing OpenSees output files.
+        :param stories: Story elevations used for the lumped aggregations.
+        :param use_cache: If True, parsed mass files are memoized and stored in a binary sidecar.
+        :param profiler: Optional Profiler recording the parsing and aggregation stages.
         """
         if not os.path.isdir(folder_path):
             raise NotADirectoryError(f"The folder path '{folder_path}' is not a valid directory.")
         self.folder_path = folder_path
         self.stories=stories
+        self.use_cache = use_cache
+        self.profiler = profiler or NULL_PROFILER
+
+        # Story index built from the last mass file read: ((filepath, signature, stories), StoryIndex)
+        self._story_index = None
+        # Spatial index of the last mass file read: ((filepath, signature), SpatialIndex)
+        self._spatial_index = None
+
+    @classmethod
+    def _memo_get(cls, filepath, signature):
+        with cls._memo_lock:
+            cached = cls._memo.get(filepath)
+            if cached is None or cached[0] != signature:
+                return None
+            cls._memo.move_to_end(filepath)
+            return cached[1]
+
+    @classmethod
+    def _memo_put(cls, filepath, signature, df):
+        with cls._memo_lock:
+            cls._memo[filepath] = (signature, df)
+            cls._memo.move_to_end(filepath)
+            while len(cls._memo) > cls.MEMO_SIZE:
+                cls._memo.popitem(last=False)
+
+    @staticmethod
+    def _file_signature(filepath):
+        """
+        Returns the (size, mtime_ns) pair used to validate the cached copies of a file.
+        """
+        stat = os.stat(filepath)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def _frame_from_block(cls, block):
+        """
+        Builds the mass DataFrame on top of a (10, n) float64 block without copying the float columns.
+        Only the nodeID row is converted to integers.
+        """
+        df = pd.DataFrame(block[1:].T, columns=cls.COLUMNS[1:], copy=False)
+        df.insert(0, 'nodeID', block[0].astype(np.int64))
+        return df
+
+    def _read_sidecar(self, filepath, signature):
+        """
+        Loads the memory-mapped sidecar of `filepath` if it matches `signature`, otherwise returns None.
+        """
+        sidecar = filepath + self.CACHE_SUFFIX
+        meta_path = filepath + self.CACHE_META_SUFFIX
+        if not (os.path.exists(sidecar) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('version') != self.CACHE_VERSION
+                    or (meta.get('size'), meta.get('mtime_ns')) != signature):
+                return None
+            block = np.load(sidecar, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable mass cache '{sidecar}': {e}")
+            return None
+
+        if block.ndim != 2 or block.shape[0] != len(self.COLUMNS):
+            return None
+        return block
+
+    def _write_sidecar(self, filepath, signature, block):
+        """
+        Writes the binary sidecar of `filepath`. Failures (e.g. read-only folders) are only logged.
+        """
+        sidecar = filepath + self.CACHE_SUFFIX
+        meta_path = filepath + self.CACHE_META_SUFFIX
+        try:
+            # Write to temporary files first so a crash never leaves a half written cache behind
+            with open(sidecar + '.tmp', 'wb') as f:
+                np.save(f, block)
+            with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'version': self.CACHE_VERSION, 'size': signature[0], 'mtime_ns': signature[1]}, f)
+            os.replace(sidecar + '.tmp', sidecar)
+            os.replace(meta_path + '.tmp', meta_path)
+        except OSError as e:
+            logging.warning(f"Could not write mass cache '{sidecar}': {e}")
+
+    def clear_cache(self, filename='nodeMassCoord.out', results_path='results'):
+        """
+        Drops the in-memory copy and deletes the on-disk sidecar of a mass file.
+
+        :param filename: The name of the mass file (default = 'nodeMassCoord.out').
+        :param results_path: Path to the results directory (default = 'results').
+        """
+        filepath = os.path.abspath(os.path.join(self.folder_path, results_path, filename))
+        with self._memo_lock:
+            self._memo.pop(filepath, None)
+        for path in (filepath + self.CACHE_SUFFIX, filepath + self.CACHE_META_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
 
     def _get_masses(self, filename='nodeMassCoord.out', results_path='results'):
         """
         Reads the nodeMassCoord.out file (or any similarly formatted file) and returns a pandas DataFrame.
+
+        When `use_cache` is enabled the returned DataFrame is shared with other callers and may be
+        backed by a read-only memory map, so it must not be modified in place.
         
         Expected format in the file (one header line starting with '#'):
         # nodeID  xCrd  yCrd  zCrd  Mx  My  Mz  Mrx  Mry  Mrz
@@ -40,38 +167,107 @@ class Masses:
         filepath = os.path.join(self.folder_path, results_path, filename)
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"The file '{filepath}' does not exist.")
-        
+
+        if self.use_cache:
+            filepath = os.path.abspath(filepath)
+            signature = self._file_signature(filepath)
+
+            # In-process memo
+            cached = self._memo_get(filepath, signature)
+            if cached is not None:
+                return cached
+
+            # On-disk sidecar, memory mapped so nothing is copied on reload
+            with self.profiler.span('masses.read_sidecar', file=filepath):
+                block = self._read_sidecar(filepath, signature)
+            if block is not None:
+                logging.info(f"Loading cached masses: {filepath + self.CACHE_SUFFIX}")
+                df = self._frame_from_block(block)
+                self._memo_put(filepath, signature, df)
+                return df
+
         # Log the file reading
         logging.info(f"Reading file: {filepath}")
-        
-        # Define column names
-        col_names = ['nodeID', 'xCrd', 'yCrd', 'zCrd', 'Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']
-        
-        # Read the file using pandas
+
+        # Read the file using pandas, parsing every column as float64 directly so no extra copy is made
         try:
-            df = pd.read_csv(
-                filepath,
-                comment='#',
-                sep=r'\s+',
-                header=None,
-                names=col_names,
-                encoding='utf-8'
-            )
-            if df.empty:
+            with self.profiler.span('masses.parse', file=filepath):
+                parsed = pd.read_csv(
+                    filepath,
+                    comment='#',
+                    sep=r'\s+',
+                    header=None,
+                    names=self.COLUMNS,
+                    dtype=np.float64,
+                    encoding='utf-8'
+                )
+            if parsed.empty:
                 raise ValueError(f"The file '{filename}' is empty or improperly formatted.")
         except Exception as e:
             raise ValueError(f"Error reading '{filename}': {str(e)}")
-        
-        # Ensure correct data types
-        df = df.astype({
-            'nodeID': int,
-            'xCrd': float, 'yCrd': float, 'zCrd': float,
-            'Mx': float, 'My': float, 'Mz': float,
-            'Mrx': float, 'Mry': float, 'Mrz': float
-        })
-        
-        return df
+
+        # Store column-major so every column is a contiguous row of the block
+        block = np.ascontiguousarray(parsed.to_numpy(dtype=np.float64).T)
+        del parsed
+
+        if self.use_cache:
+            with self.profiler.span('masses.write_sidecar', file=filepath):
+                self._write_sidecar(filepath, signature, block)
+            df = self._frame_from_block(block)
+            self._memo_put(filepath, signature, df)
+            return df
+
+        return self._frame_from_block(block)
            
+    def story_index(self, filename='nodeMassCoord.out', results_path='results'):
+        """
+        Returns the StoryIndex that maps the nodes of the mass file to `self.stories`.
+
+        The index is built once per mass file and story definition and reused afterwards, so it can
+        also aggregate other nodal fields that follow the node order of the mass file.
+
+        :param filename: The name of the file to read (default = 'nodeMassCoord.out').
+        :param results_path: Path to the results directory (default = 'results').
+        :return: A StoryIndex instance.
+        """
+        if self.stories is None:
+            raise ValueError("Stories are not defined. Please define `stories` before using this method.")
+
+        filepath = os.path.abspath(os.path.join(self.folder_path, results_path, filename))
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"The file '{filepath}' does not exist.")
+
+        key = (filepath, self._file_signature(filepath), tuple(self.stories))
+        if self._story_index is not None and self._story_index[0] == key:
+            return self._story_index[1]
+
+        df = self._get_masses(filename, results_path)
+        index = StoryIndex(self.stories, df['zCrd'].to_numpy())
+        self._story_index = (key, index)
+        return index
+
+    def spatial_index(self, filename='nodeMassCoord.out', results_path='results'):
+        """
+        Returns the SpatialIndex over the node coordinates of the mass file, for geometric node selection.
+
+        The index is built once per mass file and reused afterwards; it does not need `stories`.
+
+        :param filename: The name of the file to read (default = 'nodeMassCoord.out').
+        :param results_path: Path to the results directory (default = 'results').
+        :return: A SpatialIndex instance.
+        """
+        filepath = os.path.abspath(os.path.join(self.folder_path, results_path, filename))
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"The file '{filepath}' does not exist.")
+
+        key = (filepath, self._file_signature(filepath))
+        if self._spatial_index is not None and self._spatial_index[0] == key:
+            return self._spatial_index[1]
+
+        index = SpatialIndex.from_masses(self, filename, results_path)
+        self._spatial_index = (key, index)
+        return index
+
     def _aggregated_mass(self, filename='nodeMassCoord.out', results_path='results', plot=False, scalingFactorPlot=0.00005):
         """
         Aggregates all masses (Mx, My, Mz, Mrx, Mry, Mrz) by a specified axis coordinate (x, y, or z).
@@ -92,6 +288,7 @@ class Masses:
         aggregated = df.groupby(coord_column)[['Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']].sum().reset_index()
 
         if plot:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(ncols=3, nrows=1, figsize=(10, 8))
 
             if self.stories is not None and len(self.stories) > 1:
@@ -145,35 +342,17 @@ class Masses:
         # Get the DataFrame with mass data
         df = self._get_masses(filename, results_path)
 
-        # Rename the chosen axis for grouping
-        coord_column = 'zCrd'
-
-        # Initialize a list to store the aggregated results
-        lumped_masses_list = []
-
-        # Iterate through each story level
-        for i, story in enumerate(self.stories):
-            if i == 0:
-                # First floor, include all masses <= current floor
-                filtered_nodes = df[df[coord_column] <= story]
-            else:
-                # Floors above the first, include masses > previous floor and <= current floor
-                floor_below = self.stories[i - 1]
-                filtered_nodes = df[(df[coord_column] > floor_below) & (df[coord_column] <= story)]
-
-            # Aggregate masses for the filtered nodes
-            aggregated_masses = filtered_nodes[['Mx', 'My', 'Mz', 'Mrx', 'Mry', 'Mrz']].sum()
-
-            # Append the results as a dictionary to the list
-            lumped_masses_list.append({'story': story, **aggregated_masses})
-
-        # Convert the list of dictionaries to a DataFrame
-        lumped_masses = pd.DataFrame(lumped_masses_list)
+        # Sum every mass component per story in a single pass
+        index = self.story_index(filename, results_path)
+        with self.profiler.span('masses.aggregate', n_nodes=len(df)):
+            lumped_masses = index.aggregate_frame(df, self.MASS_COLUMNS)
 
         # Ensure the story column matches the type of self.stories (usually float or int)
         lumped_masses['story'] = lumped_masses['story'].astype(type(self.stories[0]))
 
         if plot:
+            import matplotlib.pyplot as plt
+
             # Plot similar to the _aggregated_mass method
             fig, ax = plt.subplots(ncols=3, nrows=1, figsize=(10, 8))
 
@@ -211,6 +390,102 @@ class Masses:
 
         return lumped_masses
 
+    def stream_aggregated_masses(self, filename='nodeMassCoord.out', results_path='results',
+                                 chunksize=500_000, dtype=np.float64):
+        """
+        Streaming alternative to `_aggregated_mass` / `_aggregated_mass_lumped` for very large mass files.
+
+        The file is read in chunks of `chunksize` nodes and every chunk is folded into the per-zCrd and
+        per-story sums before the next one is read, so peak memory depends on `chunksize` and not on the
+        number of nodes. Only zCrd and the mass columns are parsed, and the caches are bypassed.
+
+        :param filename: The name of the file to read (default = 'nodeMassCoord.out').
+        :param results_path: Path to the results directory (default = 'results').
+        :param chunksize: Number of nodes parsed per chunk (default = 500 000).
+        :param dtype: dtype used to parse the mass columns of each chunk, e.g. np.float32 to halve the chunk
+                      memory. zCrd is always parsed as float64 so story bounds compare exactly, and the sums
+                      are always accumulated in float64.
+        :return: A dict with
+                 - 'by_coordinate': DataFrame with zCrd and the masses summed per zCrd value.
+                 - 'by_story': DataFrame with the lumped masses per story, or None if `stories` is not defined.
+        """
+        filepath = os.path.join(self.folder_path, results_path, filename)
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"The file '{filepath}' does not exist.")
+
+        logging.info(f"Streaming file: {filepath} (chunksize={chunksize})")
+
+        usecols = ['zCrd'] + self.MASS_COLUMNS
+        stories = None if self.stories is None else np.asarray(self.stories, dtype=np.float64)
+        by_story = None if stories is None else np.zeros((stories.size, len(self.MASS_COLUMNS)))
+        partial_by_coordinate = []
+        n_nodes = 0
+
+        try:
+            reader = pd.read_csv(
+                filepath,
+                comment='#',
+                sep=r'\s+',
+                header=None,
+                names=self.COLUMNS,
+                usecols=usecols,
+                dtype={'zCrd': np.float64, **{c: dtype for c in self.MASS_COLUMNS}},
+                encoding='utf-8',
+                chunksize=chunksize
+            )
+            with reader, self.profiler.span('masses.stream', file=filepath, chunksize=chunksize):
+                for chunk in reader:
+                    n_nodes += len(chunk)
+                    chunk = chunk.astype(np.float64)
+
+                    # The number of distinct elevations is small, so the partial sums stay small
+                    partial = chunk.groupby('zCrd')[self.MASS_COLUMNS].sum()
+                    partial_by_coordinate.append(partial)
+                    if len(partial_by_coordinate) > 1:
+                        partial_by_coordinate = [pd.concat(partial_by_coordinate).groupby(level=0).sum()]
+
+                    if by_story is not None:
+                        index = StoryIndex(stories, chunk['zCrd'].to_numpy())
+                        by_story += index.aggregate(chunk[self.MASS_COLUMNS].to_numpy(dtype=np.float64))
+        except Exception as e:
+            raise ValueError(f"Error reading '{filename}': {str(e)}")
+
+        if n_nodes == 0:
+            raise ValueError(f"The file '{filename}' is empty or improperly formatted.")
+
+        by_coordinate = partial_by_coordinate[0].sort_index().reset_index()
+
+        lumped_masses = None
+        if by_story is not None:
+            lumped_masses = pd.DataFrame(by_story, columns=self.MASS_COLUMNS)
+            lumped_masses.insert(0, 'story', np.asarray(self.stories))
+
+        return {'by_coordinate': by_coordinate, 'by_story': lumped_masses}
+
+    def modal_report(self, modal_filename: str = 'modal.txt') -> ModalReport:
+        """
+        Returns the parsed modal analysis report, cached until the file changes.
+
+        Parameters
+        ----------
+        modal_filename : str
+            Name of the modal report file (default is 'modal.txt').
+
+        Returns
+        -------
+        ModalReport
+            Structured report with periods, frequencies and participation data per mode.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the modal report file is not found.
+        ValueError
+            If the eigenvalue table could not be parsed.
+        """
+        with self.profiler.span('masses.modal_report', file=modal_filename):
+            return ModalReport.load(os.path.join(self.folder_path, modal_filename))
+
     def get_first_periods(self, n: int = 5, modal_filename: str = 'modal.txt') -> list[float]:
         """
         Reads the first `n` modal periods from the modal analysis report file.
@@ -234,26 +509,8 @@ class Masses:
         ValueError
             If the periods could not be parsed.
         """
-        filepath = os.path.join(self.folder_path, modal_filename)
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"Modal file '{filepath}' not found.")
-
-        periods = []
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and line[0].isdigit():
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        try:
-                            periods.append(float(parts[4]))  # 5th column = Period
-                            if len(periods) == n:
-                                break
-                        except ValueError:
-                            raise ValueError(f"Could not parse period from line: {line}")
-
-        if len(periods) < n:
-            raise ValueError(f"Only found {len(periods)} modal periods (expected {n}).")
-
-        return periods
\ No newline at end of file
+        report = self.modal_report(modal_filename)
+        if len(report) < n:
+            raise ValueError(f"Only found {len(report)} modal periods (expected {n}).")
+
+        return report.periods(n).tolist()
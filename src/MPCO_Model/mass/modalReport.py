@@ -0,0 +1,257 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+class ModalReport:
+    """
+    Structured view of the modal analysis report (modal.txt) written by OpenSees `modalProperties`.
+
+    The whole report is parsed once into a NumPy structured array with one record per mode:
+    mode, eigenvalue, omega, frequency, period, and, when the report contains them, the participation
+    factors (factor_<DOF>), the mass participation ratios (ratio_<DOF>) and their cumulative values
+    (cumulative_<DOF>). The `MEMO_SIZE` most recently used reports are cached per process by path, size
+    and mtime, so any later query is a plain array lookup.
+    """
+    EIGEN_COLUMNS = ['mode', 'eigenvalue', 'omega', 'frequency', 'period']
+    # Header names of the eigenvalue columns. MODE and PERIOD are required, the others are derived from
+    # the period when the header does not have them
+    EIGEN_HEADERS = {
+        'mode': ('MODE',),
+        'eigenvalue': ('LAMBDA', 'EIGENVALUE'),
+        'omega': ('OMEGA',),
+        'frequency': ('FREQUENCY', 'FREQ'),
+        'period': ('PERIOD',),
+    }
+
+    # Section title keywords -> column prefix of the per-mode tables, most specific first.
+    # The participation masses tables (MODAL PARTICIPATION MASSES) are not kept.
+    SECTION_PREFIXES = [
+        (('RATIO', 'CUMULATIVE'), 'cumulative_'),
+        (('RATIO',), 'ratio_'),
+        (('FACTOR',), 'factor_'),
+    ]
+
+    # In-process memo: absolute path -> ((size, mtime_ns), ModalReport), least recently used first
+    MEMO_SIZE = 16
+    _memo = OrderedDict()
+    _memo_lock = threading.Lock()
+
+    def __init__(self, records: np.ndarray, filepath: str = None):
+        self.records = records
+        self.filepath = filepath
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Returns the parsed report of `filepath`, reusing the cached one while the file is unchanged.
+
+        :raises FileNotFoundError: If the report does not exist.
+        :raises ValueError: If no eigenvalue table could be parsed.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Modal file '{filepath}' not found.")
+
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with cls._memo_lock:
+            cached = cls._memo.get(filepath)
+            if cached is not None and cached[0] == signature:
+                cls._memo.move_to_end(filepath)
+                return cached[1]
+
+        logging.info(f"Reading modal report: {filepath}")
+        with open(filepath, 'r', encoding='utf-8') as f:
+            report = cls(cls._parse(f.read().splitlines()), filepath)
+
+        with cls._memo_lock:
+            cls._memo[filepath] = (signature, report)
+            cls._memo.move_to_end(filepath)
+            while len(cls._memo) > cls.MEMO_SIZE:
+                cls._memo.popitem(last=False)
+        return report
+
+    @staticmethod
+    def _is_numeric(tokens):
+        try:
+            for token in tokens:
+                float(token)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def _tables(cls, lines):
+        """
+        Splits the report into numeric tables: [(section title, column names, list of row strings)].
+
+        Section titles are the `*` lines (e.g. `* 5. MODAL PARTICIPATION FACTORS:`). Column names come from
+        the MODE header line, commented or not. Other `#` lines (descriptions, dash rulers) are skipped.
+        """
+        tables = []
+        title, columns, rows = '', None, []
+
+        def close():
+            if rows:
+                tables.append((title, columns, rows))
+
+        for line in lines:
+            text = line.strip()
+            if not text:
+                continue
+
+            if text.startswith('*'):
+                close()
+                title, columns, rows = text.lstrip('*').strip().upper(), None, []
+                continue
+
+            commented = text.startswith('#')
+            text = text.lstrip('#').strip()
+            if not text:
+                continue
+            tokens = text.split()
+
+            if tokens[0].upper() == 'MODE':
+                close()
+                columns, rows = [t.upper() for t in tokens], []
+            elif commented or tokens[0] == '-' or not text.strip('- '):
+                # Descriptions, dash rulers and the units line below the column names
+                continue
+            elif cls._is_numeric(tokens[:1]):
+                # Only the first token is checked here, rows are converted table by table later
+                rows.append(text)
+            else:
+                close()
+                title, columns, rows = '', None, []
+        close()
+        return tables
+
+    @staticmethod
+    def _table_array(rows):
+        """
+        Parses the rows of a table with a single vectorized conversion.
+
+        :raises ValueError: If a row has a different number of values than the first one, or non-numeric values.
+        """
+        width = len(rows[0].split())
+        bad = next((r for r in rows if len(r.split()) != width), None)
+        if bad is None:
+            try:
+                return np.array(' '.join(rows).split(), dtype=np.float64).reshape(len(rows), width)
+            except ValueError:
+                bad = next(r for r in rows if not ModalReport._is_numeric(r.split()))
+        raise ValueError(f"Could not parse modal report line: {bad}")
+
+    @classmethod
+    def _eigen_values(cls, table, columns) -> np.ndarray:
+        """
+        Eigenvalue table as (n_modes, 5) columns in the order of `EIGEN_COLUMNS`.
+
+        With a header the columns are taken by name; legacy tables without one are read by position.
+
+        :raises ValueError: If the header has no MODE or PERIOD column, or a legacy table has fewer than 5 columns.
+        """
+        if columns is None:
+            if table.shape[1] < 5:
+                raise ValueError("The eigenvalue table of the modal report has fewer than 5 columns.")
+            return table[:, :5]
+
+        positions = {}
+        for name, headers in cls.EIGEN_HEADERS.items():
+            position = next((columns.index(h) for h in headers if h in columns), None)
+            if position is not None and position < table.shape[1]:
+                positions[name] = position
+        missing = [cls.EIGEN_HEADERS[name][0] for name in ('mode', 'period') if name not in positions]
+        if missing:
+            raise ValueError(f"The eigenvalue table of the modal report has no {' or '.join(missing)} column "
+                             f"(header: {' '.join(columns)}).")
+
+        period = table[:, positions['period']]
+        with np.errstate(divide='ignore'):
+            derived = {
+                'omega': 2 * np.pi / period,
+                'frequency': 1 / period,
+            }
+        derived['eigenvalue'] = derived['omega'] ** 2
+        return np.column_stack([table[:, positions[name]] if name in positions else derived[name]
+                                for name in cls.EIGEN_COLUMNS])
+
+    @classmethod
+    def _parse(cls, lines) -> np.ndarray:
+        tables = cls._tables(lines)
+
+        # Eigenvalue table: the one with a PERIOD column, or the first table with 5+ columns (legacy reports)
+        eigen = next((i for i, (_, columns, _) in enumerate(tables)
+                      if columns is not None and 'PERIOD' in columns), None)
+        if eigen is None:
+            eigen = next((i for i, (_, _, rows) in enumerate(tables) if len(rows[0].split()) >= 5), None)
+        if eigen is None:
+            raise ValueError("Could not find the eigenvalue table in the modal report.")
+
+        _, eigen_columns, eigen_rows = tables[eigen]
+        values = cls._eigen_values(cls._table_array(eigen_rows), eigen_columns)
+        modes = values[:, 0].astype(np.int64)
+
+        # Per-mode tables with named DOF columns (participation factors, mass ratios)
+        extra = {}
+        for i, (title, columns, rows) in enumerate(tables):
+            if columns is None or i == eigen:
+                continue
+            prefix = next((p for keywords, p in cls.SECTION_PREFIXES
+                           if all(keyword in title for keyword in keywords)), None)
+            if prefix is None:
+                continue
+            table = cls._table_array(rows)
+            positions = np.searchsorted(modes, table[:, 0].astype(np.int64))
+            positions = np.clip(positions, 0, modes.size - 1)
+            valid = modes[positions] == table[:, 0].astype(np.int64)
+            for j, name in enumerate(columns[1:table.shape[1]], start=1):
+                column = np.full(modes.size, np.nan)
+                column[positions[valid]] = table[valid, j]
+                extra.setdefault(prefix + name, column)
+
+        dtype = [('mode', np.int64)] + [(c, np.float64) for c in cls.EIGEN_COLUMNS[1:]] + [(c, np.float64) for c in extra]
+        records = np.empty(modes.size, dtype=dtype)
+        records['mode'] = modes
+        for j, name in enumerate(cls.EIGEN_COLUMNS[1:], start=1):
+            records[name] = values[:, j]
+        for name, column in extra.items():
+            records[name] = column
+        return records
+
+    def __len__(self):
+        return self.records.size
+
+    def __repr__(self):
+        return f"<ModalReport {len(self)} modes, columns={list(self.columns)}>"
+
+    @property
+    def columns(self):
+        return self.records.dtype.names
+
+    def column(self, name, n=None) -> np.ndarray:
+        """
+        Values of a column for the first `n` modes (all modes if None).
+
+        :raises KeyError: If the column is not in the report.
+        :raises ValueError: If the report has fewer than `n` modes.
+        """
+        if name not in self.columns:
+            raise KeyError(f"Column '{name}' not in the modal report. Available columns: {list(self.columns)}.")
+        if n is not None and n > len(self):
+            raise ValueError(f"Only found {len(self)} modes (expected {n}).")
+        return self.records[name][:n]
+
+    def periods(self, n=None) -> np.ndarray:
+        return self.column('period', n)
+
+    def frequencies(self, n=None) -> np.ndarray:
+        return self.column('frequency', n)
+
+    def to_frame(self, n=None) -> pd.DataFrame:
+        return pd.DataFrame(self.records[:n]).set_index('mode')
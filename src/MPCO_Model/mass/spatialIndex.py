@@ -0,0 +1,214 @@
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    Geometric queries over node coordinates that return node IDs, e.g. to select nodes without defining
+    selection sets in STKO. The IDs can be passed as `node_ids` to the extraction functions.
+
+    Three structures are built on first use, none of the queries scans every node:
+
+    - a KD-tree (scipy cKDTree) for nearest-node queries;
+    - the node order sorted along each axis, for slab queries (binary search);
+    - a uniform grid of occupied cells (about `cell_size` nodes each), for box and plane-proximity queries:
+      only the nodes of the cells that intersect the region are tested.
+
+    Every query returns sorted, unique node IDs.
+    """
+    def __init__(self, node_ids, xyz, cell_size=64):
+        """
+        :param node_ids: Node IDs, one per node.
+        :param xyz: Node coordinates, shape (n_nodes, 3) (or (n_nodes, 2) for plane models).
+        :param cell_size: Average number of nodes per grid cell.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        xyz = np.asarray(xyz, dtype=np.float64)
+        if xyz.ndim != 2 or xyz.shape[0] != node_ids.size:
+            raise ValueError("`xyz` must have shape (n_nodes, n_dimensions), aligned with `node_ids`.")
+
+        self.node_ids = node_ids
+        self.xyz = xyz
+        self.n_nodes, self.n_dimensions = xyz.shape
+        self.cell_size = int(cell_size)
+
+        self._tree = None
+        self._id_order = None
+        self._axis_order = {}
+        self._grid = None
+
+    @classmethod
+    def from_masses(cls, masses, filename='nodeMassCoord.out', results_path='results', **kwargs):
+        """
+        Index over the node coordinates of a mass file.
+
+        :param masses: Masses instance.
+        """
+        df = masses._get_masses(filename, results_path)
+        return cls(df['nodeID'].to_numpy(), df[['xCrd', 'yCrd', 'zCrd']].to_numpy(dtype=np.float64), **kwargs)
+
+    def __len__(self):
+        return self.n_nodes
+
+    def __repr__(self):
+        return f"<SpatialIndex {self.n_nodes} nodes>"
+
+    def _ids(self, positions) -> np.ndarray:
+        return np.unique(self.node_ids[positions])
+
+    def coordinates(self, node_ids) -> np.ndarray:
+        """
+        Coordinates of the given nodes, shape (n, n_dimensions).
+
+        :raises KeyError: If a node is not indexed.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        if self._id_order is None:
+            self._id_order = np.argsort(self.node_ids, kind='stable')
+        order = self._id_order
+        i = np.clip(np.searchsorted(self.node_ids[order], node_ids), 0, self.n_nodes - 1)
+        found = self.node_ids[order][i] == node_ids
+        if not np.all(found):
+            raise KeyError(f"Nodes {node_ids[~found][:10].tolist()} are not in the spatial index.")
+        return self.xyz[order[i]]
+
+    # Nearest nodes
+
+    @property
+    def tree(self):
+        """
+        scipy cKDTree over the coordinates, built on first access.
+        """
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self.xyz)
+        return self._tree
+
+    def nearest(self, points, k=1, max_distance=np.inf, return_distance=False):
+        """
+        Nearest node(s) to one or several points.
+
+        :param points: A point (n_dimensions,) or points (n_points, n_dimensions).
+        :param k: Number of neighbours per point.
+        :param max_distance: Neighbours farther than this are reported as ID -1.
+        :param return_distance: Also return the distances.
+        :return: Node IDs of shape (n_points, k) (squeezed like the input), and the distances if requested.
+                 Unlike the other queries the IDs follow the query order.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        distances, positions = self.tree.query(points, k=k, distance_upper_bound=max_distance)
+        missing = positions == self.n_nodes
+        ids = np.where(missing, -1, self.node_ids[np.minimum(positions, self.n_nodes - 1)])
+        return (ids, distances) if return_distance else ids
+
+    def radius(self, point, r):
+        """
+        Nodes within a distance `r` of a point.
+        """
+        return self._ids(np.asarray(self.tree.query_ball_point(np.asarray(point, dtype=np.float64), r), dtype=np.int64))
+
+    # Slabs
+
+    def _sorted_axis(self, axis):
+        if axis not in self._axis_order:
+            order = np.argsort(self.xyz[:, axis], kind='stable')
+            self._axis_order[axis] = (order, self.xyz[order, axis])
+        return self._axis_order[axis]
+
+    def _slab_positions(self, low, high, axis):
+        order, values = self._sorted_axis(axis)
+        return order[np.searchsorted(values, low, side='left'):np.searchsorted(values, high, side='right')]
+
+    def slab(self, low, high, axis=2):
+        """
+        Nodes with `low <= coordinate <= high` along an axis (default z).
+        """
+        return self._ids(self._slab_positions(low, high, axis))
+
+    def story_band(self, stories, story):
+        """
+        Nodes of the story at position `story`, with the same rule as `StoryIndex`:
+        `stories[story-1] < z <= stories[story]`, and `z <= stories[0]` for the first story.
+        """
+        stories = np.asarray(stories, dtype=np.float64)
+        order, values = self._sorted_axis(2)
+        start = 0 if story == 0 else np.searchsorted(values, stories[story - 1], side='right')
+        stop = np.searchsorted(values, stories[story], side='right')
+        return self._ids(order[start:stop])
+
+    def level(self, elevation, tolerance=1e-6):
+        """
+        Nodes at a floor elevation, within `tolerance`.
+        """
+        return self.slab(elevation - tolerance, elevation + tolerance, axis=2)
+
+    # Grid: boxes and planes
+
+    def _build_grid(self):
+        low, high = self.xyz.min(axis=0), self.xyz.max(axis=0)
+        extent = high - low
+        target = max(self.n_nodes / max(self.cell_size, 1), 1.0)
+        active = extent > 0
+        if np.any(active):
+            edge = (np.prod(extent[active]) / target) ** (1.0 / np.count_nonzero(active))
+        else:
+            edge = 1.0
+        edge = np.where(active, np.maximum(edge, extent / 1e6), 1.0)
+        shape = np.where(active, np.ceil(extent / edge), 1).astype(np.int64)
+        shape = np.maximum(shape, 1)
+
+        ijk = np.minimum(((self.xyz - low) / edge).astype(np.int64), shape - 1)
+        cell = np.ravel_multi_index(ijk.T, shape)
+        order = np.argsort(cell, kind='stable')
+        cells, starts = np.unique(cell[order], return_index=True)
+        stops = np.append(starts[1:], self.n_nodes)
+        lower = low + np.stack(np.unravel_index(cells, shape), axis=1) * edge
+        self._grid = (order, starts, stops, lower, lower + edge)
+
+    def _cell_positions(self, hit):
+        order, starts, stops, _, _ = self._grid
+        starts, stops = starts[hit], stops[hit]
+        if starts.size == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenated ranges of the hit cells without a Python loop
+        lengths = stops - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return order[np.arange(lengths.sum()) + offsets]
+
+    def box(self, low, high):
+        """
+        Nodes inside the axis-aligned box `low <= xyz <= high` (use ±inf for unbounded sides).
+        """
+        low = np.broadcast_to(np.asarray(low, dtype=np.float64), (self.n_dimensions,))
+        high = np.broadcast_to(np.asarray(high, dtype=np.float64), (self.n_dimensions,))
+        if self._grid is None:
+            self._build_grid()
+        _, _, _, cell_low, cell_high = self._grid
+        hit = np.all((cell_high >= low) & (cell_low <= high), axis=1)
+        candidates = self._cell_positions(hit)
+        inside = np.all((self.xyz[candidates] >= low) & (self.xyz[candidates] <= high), axis=1)
+        return self._ids(candidates[inside])
+
+    def near_plane(self, point, normal, tolerance):
+        """
+        Nodes within a distance `tolerance` of the plane through `point` with normal `normal`,
+        e.g. a frame line or a wall alignment.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        normal = np.asarray(normal, dtype=np.float64)
+
+        # Axis-aligned planes are slabs. Only exactly aligned normals: a slightly tilted plane drifts away
+        # from the slab over the model extent
+        if np.count_nonzero(normal) == 1:
+            axis = int(np.flatnonzero(normal)[0])
+            return self.slab(point[axis] - tolerance, point[axis] + tolerance, axis=axis)
+        normal = normal / np.linalg.norm(normal)
+
+        if self._grid is None:
+            self._build_grid()
+        _, _, _, cell_low, cell_high = self._grid
+        center, half = (cell_low + cell_high) / 2, (cell_high - cell_low) / 2
+        # A cell may hold nodes of the band if its center is within tolerance + its projected half size
+        hit = np.abs((center - point) @ normal) <= tolerance + np.abs(half) @ np.abs(normal)
+        candidates = self._cell_positions(hit)
+        distance = np.abs((self.xyz[candidates] - point) @ normal)
+        return self._ids(candidates[distance <= tolerance])
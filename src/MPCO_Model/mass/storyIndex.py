@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+class StoryIndex:
+    """
+    Maps every node to the story level it belongs to, so nodal quantities can be summed per story
+    in a single vectorized pass.
+
+    A node belongs to story `i` when `stories[i-1] < zCrd <= stories[i]`. The first story collects
+    every node with `zCrd <= stories[0]`, and nodes above the last story are not assigned to any story.
+
+    The index is built once (sorted search over the story elevations) and can be reused for any
+    nodal field that follows the same node order, e.g. masses, forces or inertial loads.
+    """
+    def __init__(self, stories, z):
+        """
+        :param stories: Story elevations, in ascending order.
+        :param z: Node z coordinates, one per node.
+        """
+        stories = np.asarray(stories, dtype=np.float64)
+        if stories.ndim != 1 or stories.size == 0:
+            raise ValueError("`stories` must be a non-empty 1D sequence of elevations.")
+        if np.any(np.diff(stories) <= 0):
+            raise ValueError("`stories` must be sorted in strictly ascending order.")
+
+        self.stories = stories
+        self.n_stories = stories.size
+
+        z = np.asarray(z, dtype=np.float64)
+        self.n_nodes = z.size
+
+        # side='left' gives stories[i-1] < z <= stories[i]; nodes above the roof get n_stories
+        story_of_node = np.searchsorted(stories, z, side='left')
+        story_of_node[story_of_node == self.n_stories] = -1
+        self.story_of_node = story_of_node
+
+        self.counts = np.bincount(story_of_node[story_of_node >= 0], minlength=self.n_stories)
+
+    def __len__(self):
+        return self.n_stories
+
+    def __repr__(self):
+        return f"<StoryIndex {self.n_stories} stories, {self.n_nodes} nodes>"
+
+    def mask(self, story):
+        """
+        Boolean mask over the nodes that belong to the story at position `story`.
+        """
+        return self.story_of_node == story
+
+    def node_positions(self, story):
+        """
+        Positions (not node IDs) of the nodes that belong to the story at position `story`.
+        """
+        return np.flatnonzero(self.story_of_node == story)
+
+    def aggregate(self, values):
+        """
+        Sums a nodal quantity per story.
+
+        :param values: Array of shape (n_nodes,) or (n_nodes, k), in the same node order used to build the index.
+        :return: Array of shape (n_stories,) or (n_stories, k) with the per-story sums.
+        """
+        values = np.asarray(values)
+        if values.shape[0] != self.n_nodes:
+            raise ValueError(f"Expected {self.n_nodes} nodal values, got {values.shape[0]}.")
+
+        # Nodes above the roof are routed to a trailing bin that is dropped at the end
+        bins = np.where(self.story_of_node >= 0, self.story_of_node, self.n_stories)
+
+        if values.ndim == 1:
+            return np.bincount(bins, weights=values, minlength=self.n_stories + 1)[:self.n_stories]
+
+        out = np.empty((self.n_stories, values.shape[1]), dtype=np.float64)
+        for j in range(values.shape[1]):
+            out[:, j] = np.bincount(bins, weights=values[:, j], minlength=self.n_stories + 1)[:self.n_stories]
+        return out
+
+    def aggregate_frame(self, df, columns):
+        """
+        Sums the given DataFrame columns per story.
+
+        :param df: DataFrame with one row per node, in the same order used to build the index.
+        :param columns: Columns to aggregate.
+        :return: A pandas DataFrame with a 'story' column followed by the aggregated columns.
+        """
+        columns = list(columns)
+        sums = self.aggregate(df[columns].to_numpy(dtype=np.float64))
+        result = pd.DataFrame(sums, columns=columns)
+        result.insert(0, 'story', self.stories)
+        return result
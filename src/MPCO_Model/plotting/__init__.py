@@ -1,7 +1,26 @@
-from .setup import PlotStyle
-from .plot import Plot
+from typing import TYPE_CHECKING
 
-__all__ = [
-           'PlotStyle',
-           'Plot'
-           ]
\ No newline at end of file
+from MPCO_Model import _lazy
+
+_LAZY_IMPORTS = {
+    'PlotStyle': '.setup',
+    'Plot': '.plot',
+    'ExportJob': '.export',
+    'ExportResult': '.export',
+    'export_figures': '.export',
+    'CurveWatcher': '.watch',
+    'WatchedAxis': '.watch',
+    'curve_density': '.density',
+    'curve_percentiles': '.density',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
+
+
+if TYPE_CHECKING:
+    from .setup import PlotStyle
+    from .plot import Plot
+    from .export import ExportJob, ExportResult, export_figures
+    from .watch import CurveWatcher, WatchedAxis
+    from .density import curve_density, curve_percentiles
@@ -0,0 +1,132 @@
+import numpy as np
+
+DECIMATION_METHODS = ('minmax', 'lttb')
+
+
+def axes_pixel_width(ax) -> int:
+    """
+    Width of a matplotlib Axes in display pixels, used as the number of decimation buckets.
+    """
+    return max(int(np.ceil(ax.get_window_extent().width)), 1)
+
+
+def axes_pixel_height(ax) -> int:
+    """
+    Height of a matplotlib Axes in display pixels.
+    """
+    return max(int(np.ceil(ax.get_window_extent().height)), 1)
+
+
+def minmax_decimate(x, y, n_buckets, include_x_extremes=False):
+    """
+    Min/max-per-bucket decimation.
+
+    The samples are split in `n_buckets` consecutive buckets and only the first and last samples
+    plus the minimum and maximum of every bucket are kept, in their original order. With one bucket
+    per pixel the drawn line is visually identical and every peak is kept exactly.
+
+    Args:
+        x (array-like): Abscissa, e.g. time or control displacement.
+        y (array-like): Ordinate.
+        n_buckets (int): Number of buckets, typically the axes width in pixels.
+        include_x_extremes (bool): Also keep the min/max of `x` per bucket. Use it for curves where
+            `x` is not monotonic, such as cyclic pushovers.
+
+    Returns:
+        tuple: The decimated (x, y) arrays.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = y.size
+    n_buckets = int(n_buckets)
+    if n_buckets < 1:
+        raise ValueError("`n_buckets` must be at least 1.")
+
+    # Nothing to gain below a few samples per bucket
+    if n <= 4 * n_buckets:
+        return x, y
+
+    bucket_size = n // n_buckets
+    n_full = bucket_size * n_buckets
+    offsets = np.arange(n_buckets) * bucket_size
+
+    def extremes(values):
+        blocks = values[:n_full].reshape(n_buckets, bucket_size)
+        picked = [offsets + np.argmin(blocks, axis=1), offsets + np.argmax(blocks, axis=1)]
+        if n_full < n:
+            tail = values[n_full:]
+            picked.append(np.array([n_full + np.argmin(tail), n_full + np.argmax(tail)]))
+        return picked
+
+    picked = [np.array([0, n - 1])] + extremes(y)
+    if include_x_extremes:
+        picked += extremes(x)
+
+    index = np.unique(np.concatenate(picked))
+    return x[index], y[index]
+
+
+def lttb_decimate(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets decimation (Steinarsson, 2013).
+
+    Keeps `n_out` samples that preserve the visual shape of the curve. The first and last samples are
+    always kept. LTTB keeps the most prominent points but, unlike `minmax_decimate`, does not guarantee
+    that every bucket extreme survives.
+
+    Args:
+        x (array-like): Abscissa.
+        y (array-like): Ordinate.
+        n_out (int): Number of samples to keep (at least 3).
+
+    Returns:
+        tuple: The decimated (x, y) arrays.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = y.size
+    n_out = int(n_out)
+    if n_out < 3:
+        raise ValueError("`n_out` must be at least 3.")
+    if n <= n_out:
+        return x, y
+
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+
+    # Bucket edges for the n - 2 interior samples
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Averages of every bucket, used as the third vertex of the triangle
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(xf[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(yf[1:n - 1], edges[:-1] - 1) / counts
+
+    index = np.empty(n_out, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            cx, cy = mean_x[i + 1], mean_y[i + 1]
+        else:
+            cx, cy = xf[-1], yf[-1]
+
+        # Twice the triangle area between the last kept point, each candidate and the next bucket average
+        area = np.abs((xf[a] - cx) * (yf[start:stop] - yf[a]) - (xf[a] - xf[start:stop]) * (cy - yf[a]))
+        a = start + int(np.argmax(area))
+        index[i + 1] = a
+
+    return x[index], y[index]
+
+
+def decimate(x, y, method, n_buckets, include_x_extremes=False):
+    """
+    Decimates a curve with one of `DECIMATION_METHODS` for a target of `n_buckets` pixels.
+    """
+    if method == 'minmax':
+        return minmax_decimate(x, y, n_buckets, include_x_extremes=include_x_extremes)
+    if method == 'lttb':
+        # Two samples per pixel, the same budget as min/max
+        return lttb_decimate(x, y, max(2 * n_buckets, 3))
+    raise ValueError(f"Unknown decimation method '{method}'. Valid options are {list(DECIMATION_METHODS)}.")
@@ -0,0 +1,131 @@
+import warnings
+
+import numpy as np
+
+from MPCO_Model.data.curves import pad_curves
+
+
+def _limits(values, limits):
+    if limits is not None:
+        return float(limits[0]), float(limits[1])
+    low, high = np.nanmin(values), np.nanmax(values)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return float(low), float(high)
+
+
+def curve_density(x, y, bins=(800, 600), x_range=None, y_range=None, oversample=None, chunk_curves=32):
+    """
+    Rasterizes many curves into a 2-D count image.
+
+    Every segment between consecutive samples is subdivided so it covers the pixels it crosses, and the
+    samples are accumulated with one `np.bincount` per chunk of `chunk_curves` curves. The cost depends on
+    the number of samples, and the memory of the subdivided samples on `chunk_curves`, not on the number
+    of curves.
+
+    Args:
+        x (array-like): Abscissas, 2-D (n_curves, n_points) NaN-padded or a list of 1-D arrays.
+        y (array-like): Ordinates, same layout as `x`.
+        bins (tuple, optional): Image size (n_x, n_y) in pixels. Defaults to (800, 600).
+        x_range, y_range (tuple, optional): Image limits. Default to the data limits.
+        oversample (int, optional): Subdivisions per segment. Defaults to the longest segment in pixels
+            (at most 16).
+        chunk_curves (int, optional): Curves subdivided and accumulated at a time. Defaults to 32.
+
+    Returns:
+        tuple: (density of shape (n_y, n_x), extent (x_min, x_max, y_min, y_max)).
+    """
+    x, y = pad_curves(x), pad_curves(y)
+    if x.shape != y.shape:
+        raise ValueError("`x` and `y` must have the same shape.")
+    n_x, n_y = int(bins[0]), int(bins[1])
+    x_min, x_max = _limits(x, x_range)
+    y_min, y_max = _limits(y, y_range)
+
+    # Sample positions in pixel units
+    px = (x - x_min) * (n_x / (x_max - x_min))
+    py = (y - y_min) * (n_y / (y_max - y_min))
+
+    t = None
+    if x.shape[1] > 1:
+        if oversample is None:
+            dx, dy = np.diff(px, axis=1), np.diff(py, axis=1)
+            longest = np.nanmax(np.maximum(np.abs(dx), np.abs(dy))) if np.isfinite(dx).any() else 1.0
+            oversample = int(np.clip(np.ceil(longest), 1, 16))
+            del dx, dy
+        t = np.arange(oversample) / oversample
+
+    density = np.zeros(n_x * n_y, dtype=np.int64)
+    for start in range(0, x.shape[0], max(int(chunk_curves), 1)):
+        cx, cy = px[start:start + chunk_curves], py[start:start + chunk_curves]
+        if t is not None:
+            # (n_chunk, n_segments, oversample) samples along every segment, plus the last sample of every curve
+            dx, dy = np.diff(cx, axis=1), np.diff(cy, axis=1)
+            cx = np.concatenate([(cx[:, :-1, None] + dx[..., None] * t).reshape(cx.shape[0], -1), cx[:, -1:]], axis=1)
+            cy = np.concatenate([(cy[:, :-1, None] + dy[..., None] * t).reshape(cy.shape[0], -1), cy[:, -1:]], axis=1)
+
+        cx, cy = cx.ravel(), cy.ravel()
+        # Samples on the upper edge belong to the last pixel
+        keep = np.isfinite(cx) & np.isfinite(cy) & (cx >= 0) & (cx <= n_x) & (cy >= 0) & (cy <= n_y)
+        i = np.minimum(cx[keep].astype(np.int64), n_x - 1)
+        j = np.minimum(cy[keep].astype(np.int64), n_y - 1)
+        density += np.bincount(j * n_x + i, minlength=n_x * n_y)
+    return density.reshape(n_y, n_x), (x_min, x_max, y_min, y_max)
+
+
+def curve_percentiles(x, y, percentiles=(16, 50, 84), n_points=200, x_range=None):
+    """
+    Percentile bands of many curves on a common abscissa.
+
+    Curves that share the same abscissa (e.g. time histories) are used as they are; otherwise every curve
+    is interpolated on `n_points` abscissas in one vectorized `np.interp` call, which requires the abscissa
+    of every curve to be increasing (e.g. monotonic pushovers). Each curve only contributes inside its
+    own abscissa range.
+
+    Args:
+        x (array-like): Abscissas, 2-D NaN-padded or a list of 1-D arrays.
+        y (array-like): Ordinates, same layout as `x`.
+        percentiles (sequence, optional): Percentiles to compute. Defaults to (16, 50, 84).
+        n_points (int, optional): Number of common abscissas when the curves do not share one. Defaults to 200.
+        x_range (tuple, optional): Range of the common abscissas. Defaults to the data limits.
+
+    Returns:
+        tuple: (grid of shape (n_grid,), bands of shape (len(percentiles), n_grid)).
+    """
+    x, y = pad_curves(x), pad_curves(y)
+    if x.shape != y.shape:
+        raise ValueError("`x` and `y` must have the same shape.")
+
+    shared = np.all(np.isfinite(x)) and np.all(x == x[:1])
+    if shared:
+        grid, values = x[0], y
+    else:
+        x_min, x_max = _limits(x, x_range)
+        grid = np.linspace(x_min, x_max, n_points)
+        n_curves = x.shape[0]
+
+        # Offset every curve into its own abscissa window so all the curves are one increasing array. The
+        # windows must hold the whole data, not only `x_range`, or neighbouring curves would overlap
+        valid = np.isfinite(x) & np.isfinite(y)
+        base = min(x_min, np.min(x[valid])) if valid.any() else x_min
+        top = max(x_max, np.max(x[valid])) if valid.any() else x_max
+        span = (top - base) * 2 + 1.0
+        rows = np.broadcast_to(np.arange(n_curves)[:, None], x.shape)
+        flat_x = ((x - base) + rows * span)[valid]
+        flat_y = y[valid]
+        order = np.argsort(flat_x, kind='stable')
+        flat_x, flat_y = flat_x[order], flat_y[order]
+
+        queries = ((grid - base)[None, :] + np.arange(n_curves)[:, None] * span)
+        values = np.interp(queries.ravel(), flat_x, flat_y).reshape(n_curves, n_points)
+
+        # Outside its own range a curve does not contribute
+        low = np.where(valid, x, np.inf).min(axis=1)
+        high = np.where(valid, x, -np.inf).max(axis=1)
+        values[(grid[None, :] < low[:, None]) | (grid[None, :] > high[:, None])] = np.nan
+
+    # Abscissas no curve reaches give NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        bands = np.nanpercentile(values, percentiles, axis=0)
+    return grid, np.atleast_2d(bands)
@@ -0,0 +1,192 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from MPCO_Model.dataclass.plotProperties import Pushover_plot_parameters, TH_parameters_plot_parameters
+
+EXPORT_FORMATS = ('png', 'svg', 'pdf')
+PLOT_KINDS = ('pushover', 'time_history')
+
+
+@dataclass
+class ExportJob:
+    """
+    One figure to export: a model directory, the kind of plot and its extraction parameters.
+
+    `params` are forwarded to `Plot.extract_pushover` or `Plot.extract_time_history`. The files are
+    written as `<output_dir>/<filename>.<format>`; `output_dir` defaults to the model directory.
+    """
+    directory: str
+    kind: str = 'pushover'
+    params: dict = field(default_factory=dict)
+    filename: str = None
+    output_dir: str = None
+    formats: Tuple[str, ...] = ('svg',)
+    title: str = None
+    color: str = 'black'
+    decimate: Optional[str] = 'minmax'
+
+
+@dataclass
+class ExportResult:
+    """
+    Outcome and timings (seconds) of one export job.
+    """
+    directory: str
+    files: list
+    extract_time: float
+    render_time: float
+    total_time: float
+    error: Optional[str] = None
+
+
+# Per-worker state: the style is applied once and the Figure/Line2D are reused across jobs
+_WORKER = {}
+
+
+def _init_worker(apply_style, figsize, dpi, recorder_name, stories, dataset_kwargs, select_backend=True):
+    """
+    Process initializer: selects the Agg backend, applies PlotStyle once and builds the reusable figure.
+    The figure is drawn on its own Agg canvas, so it never depends on the pyplot backend.
+    """
+    import matplotlib
+    if select_backend:
+        matplotlib.use('Agg', force=True)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if apply_style:
+        from MPCO_Model.plotting.setup import PlotStyle
+        PlotStyle().apply()
+
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    line, = ax.plot([], [])
+
+    _WORKER.clear()
+    _WORKER.update(
+        figure=figure,
+        ax=ax,
+        line=line,
+        model=None,
+        recorder_name=recorder_name,
+        stories=stories,
+        dataset_kwargs=dataset_kwargs,
+    )
+
+
+def _worker_model(directory):
+    """
+    Model of the current job. The last opened model is kept so consecutive jobs on it skip reopening.
+    """
+    from MPCO_Model.core.collection import open_model
+
+    model = _WORKER['model']
+    if model is None or os.path.abspath(model.directory) != os.path.abspath(directory):
+        model = open_model(directory, _WORKER['recorder_name'], _WORKER['stories'], _WORKER['dataset_kwargs'])
+        _WORKER['model'] = model
+    return model
+
+
+def _extract(model, job):
+    if job.kind == 'pushover':
+        parameters = Pushover_plot_parameters()
+        results = model.plot.extract_pushover(**job.params)
+        labels = (parameters.results_name_horizontalAxis, parameters.results_name_verticalAxis)
+    elif job.kind == 'time_history':
+        parameters = TH_parameters_plot_parameters()
+        results = model.plot.extract_time_history(**job.params)
+        labels = (parameters.results_name_horizontalAxis, job.params.get('results_name_verticalAxis', 'DISPLACEMENT'))
+    else:
+        raise ValueError(f"Unknown plot kind '{job.kind}'. Valid options are {list(PLOT_KINDS)}.")
+    return results['x_array'], results['y_array'], labels, parameters
+
+
+def _render_job(job: ExportJob) -> ExportResult:
+    """
+    Worker entry point: extracts the curve, updates the reused Line2D in place and writes every format.
+    """
+    from MPCO_Model.plotting.decimation import axes_pixel_width, decimate
+
+    start = time.perf_counter()
+    try:
+        model = _worker_model(job.directory)
+        x_array, y_array, labels, parameters = _extract(model, job)
+        extracted = time.perf_counter()
+
+        figure, ax, line = _WORKER['figure'], _WORKER['ax'], _WORKER['line']
+        if job.decimate is not None:
+            x_array, y_array = decimate(x_array, y_array, job.decimate, axes_pixel_width(ax),
+                                        include_x_extremes=job.kind == 'pushover')
+
+        line.set_data(x_array, y_array)
+        line.set_color(job.color)
+        line.set_linestyle(parameters.linestyle)
+        line.set_linewidth(parameters.linewidth)
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_xlabel(labels[0])
+        ax.set_ylabel(labels[1])
+        ax.set_title(job.title or model.name)
+
+        output_dir = job.output_dir or model.directory
+        os.makedirs(output_dir, exist_ok=True)
+        filename = job.filename or f"{'PO' if job.kind == 'pushover' else 'TH'}_{job.params.get('direction', 1)}"
+        files = []
+        for fmt in job.formats:
+            if fmt not in EXPORT_FORMATS:
+                raise ValueError(f"Unknown format '{fmt}'. Valid options are {list(EXPORT_FORMATS)}.")
+            path = os.path.join(output_dir, f"{filename}.{fmt}")
+            figure.savefig(path, format=fmt)
+            files.append(path)
+
+        end = time.perf_counter()
+        return ExportResult(job.directory, files, extracted - start, end - extracted, end - start)
+    except Exception as e:
+        return ExportResult(job.directory, [], 0.0, 0.0, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+
+def export_figures(jobs, max_workers=None, apply_style=True, figsize=(10, 6), dpi=100,
+                   recorder_name='results', stories=None, dataset_kwargs=None):
+    """
+    Renders and writes many figures with the Agg backend in a process pool.
+
+    Every worker applies PlotStyle once and keeps a single Figure whose Line2D is updated with `set_data`
+    for each job, instead of building a new figure per plot. Jobs are sent in order, so consecutive jobs
+    on the same model reuse the opened dataset. A failing job does not stop the others; its error is
+    reported in the result.
+
+    Args:
+        jobs (list[ExportJob]): Figures to export.
+        max_workers (int, optional): Process pool size. 0 or 1 renders in the current process.
+        apply_style (bool, optional): Apply PlotStyle in every worker. Defaults to True.
+        figsize (tuple, optional): Figure size in inches. Defaults to (10, 6).
+        dpi (int, optional): Resolution of raster formats. Defaults to 100.
+        recorder_name (str, optional): MPCO recorder name used to open the models.
+        stories (list, optional): Story elevations passed to every Model.
+        dataset_kwargs (dict, optional): Extra keyword arguments passed to MPCODataSet.
+
+    Returns:
+        list[ExportResult]: One result per job, in job order, with the written files and timings.
+    """
+    jobs = list(jobs)
+    initargs = (apply_style, figsize, dpi, recorder_name, stories, dataset_kwargs)
+
+    if max_workers is not None and max_workers <= 1:
+        # Keep the caller's backend and style untouched
+        import matplotlib
+        with matplotlib.rc_context():
+            try:
+                _init_worker(*initargs, select_backend=False)
+                return [_render_job(job) for job in jobs]
+            finally:
+                _WORKER.clear()
+
+    # Contiguous chunks keep the jobs of a model on the same worker
+    n_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * n_workers))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=chunksize))
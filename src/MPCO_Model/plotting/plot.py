@@ -1,23 +1,426 @@
 import itertools
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
-from STKO_to_python import MPCODataSet
-import matplotlib.pyplot as plt
+import numpy as np
 
 from MPCO_Model.dataclass.plotProperties import Pushover_plot_parameters, TH_parameters_plot_parameters
+from MPCO_Model.data.nodalResults import extract_axis, extract_batch, BatchResults, TIME_RESULTS
+from MPCO_Model.plotting.decimation import axes_pixel_width, axes_pixel_height, decimate as decimate_curve
+from MPCO_Model.plotting.density import curve_density, curve_percentiles
+from MPCO_Model.core.profiling import NULL_PROFILER
+from MPCO_Model.data.selectionIndex import SelectionIndex
 
 if TYPE_CHECKING:
     from STKO_to_python import MPCODataSet
 
+
+def _stage_number(model_stage):
+    """
+    Sort key of 'MODEL_STAGE[k]' names: k, or the name itself for other names.
+    """
+    match = re.search(r'\[(\d+)\]', str(model_stage))
+    return (0, int(match.group(1)), '') if match else (1, 0, str(model_stage))
+
+
+def _continuous_time(times):
+    """
+    Concatenates the time vectors of consecutive stages into a non-decreasing pseudo-time. A stage whose
+    time starts before the end of the previous one is shifted by the end of the previous stage.
+    """
+    out, end = [], None
+    for time in times:
+        time = np.asarray(time, dtype=np.float64)
+        if end is not None and time.size and time[0] < end:
+            time = time + end
+        out.append(time)
+        if time.size:
+            end = time[-1]
+    return np.concatenate(out) if out else np.empty(0)
+
 class Plot:
-    def __init__(self, dataset: "MPCODataSet"):
+    def __init__(self, dataset: "MPCODataSet", cache_size: int = 128, profiler=None, index=None):
         self.dataset = dataset
+        self.profiler = profiler or NULL_PROFILER
+        # Selection set resolution, shared with the Model when built from it
+        self.index = index or SelectionIndex(dataset)
 
         # Call the default plot parameters
         self.default_parameters_PO = Pushover_plot_parameters()
         self.default_parameters_TH = TH_parameters_plot_parameters()
 
+        # Bounded LRU of extracted axes:
+        # (model_stage, results_name, selection_set_id, direction, operation, scaling_factor) -> array
+        self.cache_size = cache_size
+        self._axis_cache = OrderedDict()
+        # The cache is shared by the threads of `extract_stages`
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """
+        Drops every extracted array held by the LRU cache.
+        """
+        with self._cache_lock:
+            self._axis_cache.clear()
+
+    def _extract_axis(self, model_stage, results_name, selection_set_id=None, direction=None,
+                      values_operation='Sum', scaling_factor=1.0):
+        """
+        Returns one extracted axis, going through the bounded LRU cache.
+
+        The cached arrays are shared between callers and flagged read-only.
+        """
+        if results_name in TIME_RESULTS:
+            # The abscissa only depends on the stage
+            selection_set_id, direction, values_operation = None, None, None
+
+        key = (model_stage, results_name, selection_set_id, direction, values_operation, scaling_factor)
+        with self._cache_lock:
+            values = self._axis_cache.get(key)
+            if values is not None:
+                self._axis_cache.move_to_end(key)
+                return values
+
+        with self.profiler.span('plot.extract_axis', results_name=results_name,
+                                selection_set_id=selection_set_id, direction=direction):
+            values = extract_axis(
+                self.dataset,
+                model_stage=model_stage,
+                results_name=results_name,
+                direction=direction,
+                values_operation=values_operation,
+                scaling_factor=scaling_factor,
+                selection_set_id=selection_set_id,
+                index=self.index,
+            )
+        values.flags.writeable = False
+
+        with self._cache_lock:
+            self._axis_cache[key] = values
+            while len(self._axis_cache) > self.cache_size:
+                self._axis_cache.popitem(last=False)
+        return values
+
+    def extract_pushover(
+        self,
+        selection_set_id_verticalAxis: int = 2,
+        selection_set_id_horizontalAxis: int = 1,
+        direction: int = 1,
+        model_stage: str = None,
+    ):
+        """
+        Extracts the pushover curve arrays without creating any matplotlib figure.
+
+        Args:
+            selection_set_id_verticalAxis (int):
+                The ID of the selection set for the vertical axis (e.g., base reactions).
+            selection_set_id_horizontalAxis (int):
+                The ID of the selection set for the horizontal axis (e.g., control displacement).
+            direction (int):
+                The component direction used for both axes.
+            model_stage (str, optional):
+                Model stage to read. Defaults to the pushover parameters stage.
+
+        Returns:
+            dict: `x_array` (displacement) and `y_array` (reaction), as read-only arrays.
+        """
+        parameters = self.default_parameters_PO
+        model_stage = model_stage or parameters.model_stage
+
+        y_array = self._extract_axis(
+            model_stage,
+            parameters.results_name_verticalAxis,
+            selection_set_id_verticalAxis,
+            direction,
+            parameters.values_operation_verticalAxis,
+            parameters.scaling_factor_verticalAxis,
+        )
+        x_array = self._extract_axis(
+            model_stage,
+            parameters.results_name_horizontalAxis,
+            selection_set_id_horizontalAxis,
+            direction,
+            parameters.values_operation_horizontalAxis,
+            parameters.scaling_factor_horizontalAxis,
+        )
+        return {'x_array': x_array, 'y_array': y_array}
+
+    def extract_time_history(
+        self,
+        results_name_verticalAxis: str = 'DISPLACEMENT',
+        selection_set_id_verticalAxis: int = 1,
+        direction: int = 1,
+        model_stage: str = None,
+    ):
+        """
+        Extracts the time history arrays without creating any matplotlib figure.
+
+        Args:
+            results_name_verticalAxis (str):
+                The name of the result to extract over time (e.g., 'DISPLACEMENT', 'ACCELERATION').
+            selection_set_id_verticalAxis (int):
+                The ID of the selection set containing the nodes of interest.
+            direction (int):
+                The result component to extract.
+            model_stage (str, optional):
+                Model stage to read. Defaults to the time history parameters stage.
+
+        Returns:
+            dict: `x_array` (time) and `y_array` (response), as read-only arrays.
+        """
+        parameters = self.default_parameters_TH
+        model_stage = model_stage or parameters.model_stage
+
+        y_array = self._extract_axis(
+            model_stage,
+            results_name_verticalAxis,
+            selection_set_id_verticalAxis,
+            direction,
+            parameters.values_operation_verticalAxis,
+            parameters.scaling_factor_verticalAxis,
+        )
+        x_array = self._extract_axis(model_stage, parameters.results_name_horizontalAxis)
+        return {'x_array': x_array, 'y_array': y_array}
+
+    def extract_nodes(self, node_ids, results_name: str = 'DISPLACEMENT', direction: int = 1,
+                      values_operation: str = 'Sum', scaling_factor: float = 1.0, model_stage: str = None):
+        """
+        Extracts a time history reduced over explicit node IDs, e.g. the result of a SpatialIndex query,
+        instead of a selection set. The results are not cached.
+
+        Args:
+            node_ids (array-like): Nodes to reduce.
+            results_name (str, optional): Nodal result name. Defaults to 'DISPLACEMENT'.
+            direction (int, optional): Result component. Defaults to 1.
+            values_operation (str, optional): Reduction over the nodes. Defaults to 'Sum'.
+            scaling_factor (float, optional): Factor applied to the reduced values. Defaults to 1.0.
+            model_stage (str, optional): Model stage. Defaults to the time history parameters stage.
+
+        Returns:
+            dict: `x_array` (time) and `y_array` (reduced result).
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64).ravel()
+        if node_ids.size == 0:
+            raise ValueError("No nodes to extract.")
+        model_stage = model_stage or self.default_parameters_TH.model_stage
+
+        with self.profiler.span('plot.extract_nodes', results_name=results_name, n_nodes=node_ids.size):
+            y_array = extract_axis(
+                self.dataset,
+                model_stage=model_stage,
+                results_name=results_name,
+                direction=direction,
+                values_operation=values_operation,
+                scaling_factor=scaling_factor,
+                node_ids=node_ids,
+                index=self.index,
+            )
+        x_array = self._extract_axis(model_stage, self.default_parameters_TH.results_name_horizontalAxis)
+        return {'x_array': x_array, 'y_array': y_array}
+
+    def model_stages(self):
+        """
+        Model stages of the dataset, in analysis order.
+        """
+        stages = getattr(self.dataset, 'model_stages', None)
+        if not stages:
+            stages = list(dict.fromkeys(self.dataset.time.index.get_level_values(0)))
+        return sorted(stages, key=_stage_number)
+
+    def extract_stages(self, kind: str = 'time_history', model_stages=None, max_workers: int = None, **kwargs):
+        """
+        Extracts a curve over several model stages (e.g. gravity -> pushover -> dynamic) and concatenates them.
+
+        Every stage is submitted to a thread pool up front, so the HDF5 reads of the next stages are
+        prefetched while the previous ones are reduced, and the results are concatenated in stage order.
+        The stage times are made continuous: a stage whose time restarts is shifted to begin where the
+        previous stage ended.
+
+        Args:
+            kind (str, optional): 'time_history' or 'pushover'. Defaults to 'time_history'.
+            model_stages (list or str, optional): Stages to extract, or None / 'all' for every stage of the dataset.
+            max_workers (int, optional): Thread pool size. Defaults to the number of stages (at most 8).
+            **kwargs: Forwarded to `extract_time_history` or `extract_pushover` (selection sets, direction, ...).
+
+        Returns:
+            dict: `x_array`, `y_array`, `time` (continuous pseudo-time), `stage` (stage position of every
+            step), `model_stages` and `stage_bounds` (start of every stage in the arrays, plus the total length).
+        """
+        extractors = {'time_history': self.extract_time_history, 'pushover': self.extract_pushover}
+        if kind not in extractors:
+            raise ValueError(f"Unknown kind '{kind}'. Valid options are {list(extractors)}.")
+        if model_stages is None or model_stages == 'all':
+            model_stages = self.model_stages()
+        elif isinstance(model_stages, str):
+            model_stages = [model_stages]
+        model_stages = list(model_stages)
+        if not model_stages:
+            raise ValueError("No model stages to extract.")
+
+        def extract(stage):
+            results = extractors[kind](model_stage=stage, **kwargs)
+            time = results['x_array'] if kind == 'time_history' else self._extract_axis(stage, 'TIME')
+            return results['x_array'], results['y_array'], time
+
+        with self.profiler.span('plot.extract_stages', kind=kind, n_stages=len(model_stages)):
+            workers = max_workers or min(len(model_stages), 8)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # All the stages are submitted at once: the later ones are read while the first are consumed
+                parts = list(executor.map(extract, model_stages))
+
+        lengths = [len(y) for _, y, _ in parts]
+        time = _continuous_time([t for _, _, t in parts])
+        x_array = np.concatenate([x for x, _, _ in parts])
+        if kind == 'time_history':
+            x_array = time
+        return {
+            'x_array': x_array,
+            'y_array': np.concatenate([y for _, y, _ in parts]),
+            'time': time,
+            'stage': np.repeat(np.arange(len(model_stages)), lengths),
+            'model_stages': model_stages,
+            'stage_bounds': np.concatenate([[0], np.cumsum(lengths)]),
+        }
+
+    def extract_batch(self, requests, model_stage: str = None) -> BatchResults:
+        """
+        Extracts many time histories at once, reading every result dataset a single time.
+
+        Requests for the same result are grouped, so X/Y/Z displacement, velocity and acceleration for
+        20 selection sets cost three reads instead of 180. The nodes are reduced with the time history
+        parameters (`default_parameters_TH`), and every extracted curve is also stored in the LRU cache
+        so later `time_history_plot` calls are served from memory.
+
+        Args:
+            requests (iterable):
+                Tuples (results_name, selection_set_id, direction); `direction` may be a sequence.
+            model_stage (str, optional):
+                Model stage to read. Defaults to the time history parameters stage.
+
+        Returns:
+            BatchResults: Labelled array of shape (result/selection set pairs, components, time).
+        """
+        parameters = self.default_parameters_TH
+        model_stage = model_stage or parameters.model_stage
+
+        with self.profiler.span('plot.extract_batch', model_stage=model_stage):
+            batch = extract_batch(
+                self.dataset,
+                model_stage,
+                requests,
+                values_operation=parameters.values_operation_verticalAxis,
+                scaling_factor=parameters.scaling_factor_verticalAxis,
+                index=self.index,
+            )
+
+        # Seed the LRU cache with every extracted curve
+        with self._cache_lock:
+            for i, (results_name, selection_set_id) in enumerate(batch.rows):
+                for j, direction in enumerate(batch.components):
+                    key = (model_stage, results_name, selection_set_id, direction,
+                           parameters.values_operation_verticalAxis, parameters.scaling_factor_verticalAxis)
+                    values = batch.data[i, j].copy()
+                    values.flags.writeable = False
+                    self._axis_cache[key] = values
+            while len(self._axis_cache) > self.cache_size:
+                self._axis_cache.popitem(last=False)
+
+        return batch
+
+
+    def watch_pushover(
+        self,
+        selection_set_id_verticalAxis: int = 2,
+        selection_set_id_horizontalAxis: int = 1,
+        direction: int = 1,
+        color: str = 'black',
+        ax=None,
+        figsize=(10, 6),
+        title: str = None,
+    ):
+        """
+        Starts watching the pushover curve of an analysis that is still running.
+
+        The returned watcher draws the steps written so far and, on every `poll()` (or inside `watch()`),
+        reads only the new steps from the MPCO files and updates the same Line2D in place.
+
+        Args:
+            selection_set_id_verticalAxis (int): Selection set of the base reactions.
+            selection_set_id_horizontalAxis (int): Selection set of the control displacement.
+            direction (int): The component direction used for both axes.
+            color (str, optional): Line color. Defaults to 'black'.
+            ax (matplotlib.axes.Axes, optional): Axes to draw on. If None, a new figure is created.
+            figsize (tuple, optional): Size of the figure if `ax` is not provided. Defaults to (10, 6).
+            title (str, optional): Legend label. Defaults to the model name.
+
+        Returns:
+            CurveWatcher: The watcher, with the line attached.
+        """
+        from MPCO_Model.plotting.watch import CurveWatcher, WatchedAxis
+
+        parameters = self.default_parameters_PO
+        watcher = CurveWatcher(
+            self.dataset,
+            parameters.model_stage,
+            WatchedAxis(parameters.results_name_horizontalAxis, selection_set_id_horizontalAxis, direction,
+                        parameters.values_operation_horizontalAxis, parameters.scaling_factor_horizontalAxis),
+            WatchedAxis(parameters.results_name_verticalAxis, selection_set_id_verticalAxis, direction,
+                        parameters.values_operation_verticalAxis, parameters.scaling_factor_verticalAxis),
+            index=self.index,
+        )
+        ax = self._watch_axes(watcher, ax, figsize, color, parameters, title)
+        ax.set_xlabel(parameters.results_name_horizontalAxis)
+        ax.set_ylabel(parameters.results_name_verticalAxis)
+        return watcher
+
+    def watch_time_history(
+        self,
+        results_name_verticalAxis: str = 'DISPLACEMENT',
+        selection_set_id_verticalAxis: int = 1,
+        direction: int = 1,
+        color: str = 'black',
+        ax=None,
+        figsize=(10, 6),
+        title: str = None,
+    ):
+        """
+        Starts watching a time history of an analysis that is still running. See `watch_pushover`.
+
+        Returns:
+            CurveWatcher: The watcher, with the line attached.
+        """
+        from MPCO_Model.plotting.watch import CurveWatcher, WatchedAxis
+
+        parameters = self.default_parameters_TH
+        watcher = CurveWatcher(
+            self.dataset,
+            parameters.model_stage,
+            WatchedAxis(parameters.results_name_horizontalAxis),
+            WatchedAxis(results_name_verticalAxis, selection_set_id_verticalAxis, direction,
+                        parameters.values_operation_verticalAxis, parameters.scaling_factor_verticalAxis),
+            index=self.index,
+        )
+        ax = self._watch_axes(watcher, ax, figsize, color, parameters, title)
+        ax.set_xlabel(parameters.results_name_horizontalAxis)
+        ax.set_ylabel(results_name_verticalAxis)
+        return watcher
+
+    def _watch_axes(self, watcher, ax, figsize, color, parameters, title):
+        if ax is None:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=figsize)
+
+        line, = ax.plot([], [], color=color, linestyle=parameters.linestyle, linewidth=parameters.linewidth,
+                        label=title or self.dataset.info.name)
+        watcher.attach(line)
+        ax.legend()
+        with self.profiler.span('plot.watch_poll', n_steps=watcher.n_steps):
+            watcher.poll()
+        return ax
 
     def pushover_plot(
         self,
@@ -29,6 +432,7 @@ class Plot:
         figsize=(10, 6),
         title: str = None,
         save_svg:bool = False,
+        decimate: str = None,
     ):
         """
         Plots a pushover curve (e.g., base shear vs top displacement) from the given model dataset.
@@ -58,6 +462,9 @@ class Plot:
                 Title or label for the curve (also used in the legend). Defaults to the model name.
             save_path (str, optional): 
                 Path to save the figure. If provided, the figure is saved as SVG.
+            decimate (str, optional):
+                Level-of-detail mode for long curves, 'minmax' or 'lttb'. The drawn line is decimated
+                to the axes width in pixels; the returned results keep every step. Defaults to None.
 
         Returns:
             matplotlib.axes.Axes: 
@@ -67,36 +474,42 @@ class Plot:
         parameters=self.default_parameters_PO
 
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(figsize=figsize)
 
         label = title or self.dataset.info.name
 
-        # Plot using STKO_to_python base plotter
-        ax, results = self.dataset.plot.plot_nodal_results(
-            model_stage=parameters.model_stage,
-            results_name_verticalAxis=parameters.results_name_verticalAxis,
+        # Draw from the extraction cache
+        results = self.extract_pushover(
             selection_set_id_verticalAxis=selection_set_id_verticalAxis,
-            direction_verticalAxis=direction,
-            values_operation_verticalAxis=parameters.values_operation_verticalAxis,
-            scaling_factor_verticalAxis=parameters.scaling_factor_verticalAxis,
-            results_name_horizontalAxis=parameters.results_name_horizontalAxis,
             selection_set_id_horizontalAxis=selection_set_id_horizontalAxis,
-            direction_horizontalAxis=direction,
-            values_operation_horizontalAxis=parameters.values_operation_horizontalAxis,
-            scaling_factor_horizontalAxis=parameters.scaling_factor_horizontalAxis,
-            ax=ax,
-            label=label,
-            color=color,
-            linetype=parameters.linestyle,
-            linewidth=parameters.linewidth,
+            direction=direction,
         )
+        x_array, y_array = results['x_array'], results['y_array']
+        with self.profiler.span('plot.draw', kind='pushover', n_points=len(x_array)):
+            if decimate is not None:
+                # Pushover curves may reverse in x (cyclic loading), keep the x extremes as well
+                x_array, y_array = decimate_curve(x_array, y_array, decimate, axes_pixel_width(ax), include_x_extremes=True)
+
+            ax.plot(
+                x_array,
+                y_array,
+                color=color,
+                linestyle=parameters.linestyle,
+                linewidth=parameters.linewidth,
+                label=label,
+            )
+            ax.set_xlabel(parameters.results_name_horizontalAxis)
+            ax.set_ylabel(parameters.results_name_verticalAxis)
+            ax.legend()
 
         if save_svg:
             save_path = self.dataset.hdf5_directory
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            os.makedirs(save_path, exist_ok=True)
             fig=ax.get_figure()
             filename = 'PO_'+str(direction)+'.svg'
-            fig.savefig(save_path + filename, format='svg')
+            with self.profiler.span('plot.savefig', file=filename):
+                fig.savefig(os.path.join(save_path, filename), format='svg')
 
         return ax, results
 
@@ -108,7 +521,8 @@ class Plot:
                           ax=None,
                           figsize=(10, 6),
                           title: str = None,
-                          save_svg: bool = False):
+                          save_svg: bool = False,
+                          decimate: str = None):
             """
             Plots a time history response (e.g., displacement, acceleration) at a given selection set.
 
@@ -134,6 +548,10 @@ class Plot:
                 save_path (str, optional): 
                     Directory path to save the figure. If provided, the figure is saved as SVG with
                     filename `TH_<direction>.svg`.
+                decimate (str, optional):
+                    Level-of-detail mode for long records, 'minmax' (exact peaks) or 'lttb'. The drawn
+                    line is decimated to the axes width in pixels; the returned results keep every step.
+                    Defaults to None.
 
             Returns:
                 tuple:
@@ -145,37 +563,146 @@ class Plot:
             parameters=self.default_parameters_TH
 
             if ax is None:
+                import matplotlib.pyplot as plt
                 fig, ax = plt.subplots(figsize=figsize)
 
             label = title or self.dataset.info.name
 
-            # Plot using STKO_to_python base plotter
-            ax, results = self.dataset.plot.plot_nodal_results(
-                model_stage=parameters.model_stage,
+            # Draw from the extraction cache
+            results = self.extract_time_history(
                 results_name_verticalAxis=results_name_verticalAxis,
                 selection_set_id_verticalAxis=selection_set_id_verticalAxis,
-                direction_verticalAxis=direction,
-                values_operation_verticalAxis=parameters.values_operation_verticalAxis,
-                scaling_factor_verticalAxis=parameters.scaling_factor_verticalAxis,
-                results_name_horizontalAxis=parameters.results_name_horizontalAxis,
-                ax=ax,
-                label=label,
-                color=color,
-                linetype=parameters.linestyle,
-                linewidth=parameters.linewidth
+                direction=direction,
             )
+            x_array, y_array = results['x_array'], results['y_array']
+            with self.profiler.span('plot.draw', kind='time_history', n_points=len(x_array)):
+                if decimate is not None:
+                    x_array, y_array = decimate_curve(x_array, y_array, decimate, axes_pixel_width(ax))
+
+                ax.plot(
+                    x_array,
+                    y_array,
+                    color=color,
+                    linestyle=parameters.linestyle,
+                    linewidth=parameters.linewidth,
+                    label=label,
+                )
+                ax.set_xlabel(parameters.results_name_horizontalAxis)
+                ax.set_ylabel(results_name_verticalAxis)
+                ax.legend()
 
             if save_svg:
                 save_path = self.dataset.hdf5_directory
-                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                os.makedirs(save_path, exist_ok=True)
                 fig=ax.get_figure()
                 filename = 'TH_'+str(direction)+'.svg'
-                fig.savefig(save_path + filename, format='svg')
+                with self.profiler.span('plot.savefig', file=filename):
+                    fig.savefig(os.path.join(save_path, filename), format='svg')
 
             return ax, results
 
+    def density_plot(self,
+                     x_array,
+                     y_array,
+                     ax=None,
+                     figsize=(10, 6),
+                     bins=None,
+                     x_range=None,
+                     y_range=None,
+                     cmap: str = 'viridis',
+                     log: bool = True,
+                     percentiles=(16, 50, 84),
+                     band_color: str = 'white',
+                     colorbar: bool = True,
+                     xlabel: str = None,
+                     ylabel: str = None,
+                     title: str = None,
+                     save_svg: bool = False):
+        """
+        Plots many curves (e.g., the pushovers or time histories of an IDA) as one density image.
 
+        The curves are rasterized with NumPy accumulation (see `curve_density`) and drawn as a single image
+        artist, so the cost and the SVG size do not grow with the number of curves. Percentile bands
+        (see `curve_percentiles`) can be drawn on top.
+
+        Args:
+            x_array (array-like):
+                Abscissas, a 2-D NaN-padded array (e.g. `ModelCollection.pushover()['x_array']`) or a list of 1-D arrays.
+            y_array (array-like):
+                Ordinates, same layout as `x_array`.
+            ax (matplotlib.axes.Axes, optional):
+                Optional Axes object to plot on. If None, a new figure and axes will be created.
+            figsize (tuple, optional):
+                Size of the figure if `ax` is not provided. Defaults to (10, 6).
+            bins (tuple, optional):
+                Image size (n_x, n_y). Defaults to the axes size in pixels.
+            x_range, y_range (tuple, optional):
+                Limits of the image. Default to the data limits.
+            cmap (str, optional):
+                Colormap of the density. Defaults to 'viridis'.
+            log (bool, optional):
+                Logarithmic color scale, so single curves stay visible next to dense regions. Defaults to True.
+            percentiles (sequence, optional):
+                Percentile bands drawn on top, the middle one solid. None or empty draws none. Defaults to (16, 50, 84).
+            band_color (str, optional):
+                Color of the percentile bands. Defaults to 'white'.
+            colorbar (bool, optional):
+                Adds a colorbar with the number of curve samples per pixel. Defaults to True.
+            xlabel, ylabel, title (str, optional):
+                Axis labels and title.
+            save_svg (bool, optional):
+                Saves the figure as `DENSITY.svg` in the dataset directory.
 
+        Returns:
+            tuple:
+                - ax (matplotlib.axes.Axes): The matplotlib Axes object containing the plot.
+                - results (dict): `density`, `extent`, and `grid` and `bands` when percentiles are requested.
+        """
+        if ax is None:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=figsize)
 
+        if bins is None:
+            bins = (axes_pixel_width(ax), axes_pixel_height(ax))
+
+        with self.profiler.span('plot.density', bins=tuple(bins)):
+            density, extent = curve_density(x_array, y_array, bins=bins, x_range=x_range, y_range=y_range)
+            results = {'density': density, 'extent': extent}
+
+            if log:
+                from matplotlib.colors import LogNorm
+                image = np.ma.masked_equal(density, 0)
+                norm = LogNorm(vmin=1, vmax=max(int(density.max()), 1))
+            else:
+                image, norm = density, None
+            artist = ax.imshow(image, origin='lower', aspect='auto', extent=extent, cmap=cmap, norm=norm,
+                               interpolation='nearest')
+            if colorbar:
+                ax.get_figure().colorbar(artist, ax=ax, label='Samples per pixel')
+
+            if percentiles:
+                grid, bands = curve_percentiles(x_array, y_array, percentiles=percentiles, x_range=x_range)
+                results.update(grid=grid, bands=bands)
+                middle = len(percentiles) // 2
+                for i, (p, band) in enumerate(zip(percentiles, bands)):
+                    ax.plot(grid, band, color=band_color, linewidth=1.5 if i == middle else 1.0,
+                            linestyle='-' if i == middle else '--', label=f"P{p:g}")
+                ax.legend()
+
+            ax.set_xlim(extent[0], extent[1])
+            ax.set_ylim(extent[2], extent[3])
+            if xlabel:
+                ax.set_xlabel(xlabel)
+            if ylabel:
+                ax.set_ylabel(ylabel)
+            if title:
+                ax.set_title(title)
 
+        if save_svg:
+            save_path = self.dataset.hdf5_directory
+            os.makedirs(save_path, exist_ok=True)
+            fig = ax.get_figure()
+            with self.profiler.span('plot.savefig', file='DENSITY.svg'):
+                fig.savefig(os.path.join(save_path, 'DENSITY.svg'), format='svg')
 
+        return ax, results
@@ -0,0 +1,189 @@
+import logging
+import time as _time
+from dataclasses import dataclass
+
+import numpy as np
+
+from MPCO_Model.data.mpcoFiles import NodalResultStream
+from MPCO_Model.data.nodalResults import TIME_RESULTS
+from MPCO_Model.data.selectionIndex import SelectionIndex
+
+
+@dataclass
+class WatchedAxis:
+    """
+    One axis of a watched curve: a nodal result reduced over a selection set, or 'TIME' / 'STEP'.
+    """
+    results_name: str
+    selection_set_id: int = None
+    direction: int = None
+    values_operation: str = 'Sum'
+    scaling_factor: float = 1.0
+
+
+class _GrowingArray:
+    """
+    Append-only float array with amortized O(1) appends (capacity doubling).
+    """
+    def __init__(self, capacity=1024):
+        self._data = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, values):
+        needed = self.size + len(values)
+        if needed > self._data.size:
+            data = np.empty(max(needed, 2 * self._data.size))
+            data[:self.size] = self._data[:self.size]
+            self._data = data
+        self._data[self.size:needed] = values
+        self.size = needed
+
+    @property
+    def values(self):
+        return self._data[:self.size]
+
+
+class CurveWatcher:
+    """
+    Incremental reader of a curve whose analysis is still running.
+
+    The watcher remembers how many steps it has read; every `poll` streams only the steps written since
+    the last one (see `NodalResultStream.start_step`), appends them to in-memory arrays and, when a
+    Line2D is attached, updates it in place. The step count of every partition is kept between polls and
+    only the names of the new steps are probed (see `count_steps`), so the cost of a refresh depends on
+    the number of new steps, not on the length of the analysis.
+
+    The MPCO files are reopened read-only on every poll. If the writer keeps them locked, set the
+    environment variable HDF5_USE_FILE_LOCKING=FALSE before starting Python.
+    """
+    def __init__(self, dataset, model_stage, x_axis: WatchedAxis, y_axis: WatchedAxis, chunk_size=1000, index=None):
+        """
+        Args:
+            dataset (MPCODataSet): Dataset whose files are being written.
+            model_stage (str): Model stage to follow.
+            x_axis (WatchedAxis): Horizontal axis.
+            y_axis (WatchedAxis): Vertical axis.
+            chunk_size (int, optional): Steps read per chunk when catching up. Defaults to 1000.
+            index (SelectionIndex, optional): Resolves the selection sets and rows once for every poll.
+                Defaults to a new index of `dataset`.
+        """
+        self.dataset = dataset
+        self.model_stage = model_stage
+        self.axes = (x_axis, y_axis)
+        self.chunk_size = chunk_size
+        self.n_steps = 0
+        self.line = None
+        self.index = index or SelectionIndex(dataset)
+        # Steps seen per partition file, one dict per axis
+        self._step_counts = ({}, {})
+
+        self._x = _GrowingArray()
+        self._y = _GrowingArray()
+        # Node IDs of every nodal axis, resolved once
+        self._groups = [None if a.results_name in TIME_RESULTS else self.index.node_ids(a.selection_set_id)
+                        for a in self.axes]
+
+    @property
+    def x_array(self) -> np.ndarray:
+        return self._x.values
+
+    @property
+    def y_array(self) -> np.ndarray:
+        return self._y.values
+
+    def attach(self, line):
+        """
+        Attaches a matplotlib Line2D updated in place on every poll.
+        """
+        self.line = line
+        line.set_data(self.x_array, self.y_array)
+        return line
+
+    def _read_new(self):
+        """
+        Reads the steps after `n_steps` for both axes. Returns (time, [x_values, y_values]).
+        """
+        time, values = None, [None, None]
+        for i, axis in enumerate(self.axes):
+            if axis.results_name in TIME_RESULTS:
+                continue
+            stream = NodalResultStream(self.dataset, self.model_stage, axis.results_name, [self._groups[i]],
+                                       operation=axis.values_operation, chunk_size=self.chunk_size,
+                                       start_step=self.n_steps, index=self.index,
+                                       step_counts=self._step_counts[i], selection_set_ids=[axis.selection_set_id])
+            time_chunks, value_chunks = [], []
+            for _, chunk_time, chunk_values in stream:
+                time_chunks.append(chunk_time)
+                value_chunks.append(chunk_values[0, axis.direction] * axis.scaling_factor)
+            values[i] = np.concatenate(value_chunks) if value_chunks else np.empty(0)
+            if time is None:
+                time = np.concatenate(time_chunks) if time_chunks else np.empty(0)
+
+        if time is None:
+            raise ValueError("At least one axis must be a nodal result.")
+
+        # Both axes may not see the same number of new steps if the writer added one in between
+        n_new = min(v.size for v in values if v is not None)
+        time = time[:n_new]
+        for i, axis in enumerate(self.axes):
+            if axis.results_name == 'TIME':
+                values[i] = time
+            elif axis.results_name == 'STEP':
+                values[i] = np.arange(self.n_steps, self.n_steps + n_new, dtype=np.float64)
+            else:
+                values[i] = values[i][:n_new]
+        return time, values
+
+    def poll(self) -> int:
+        """
+        Reads the new steps, appends them and refreshes the attached line.
+
+        Returns:
+            int: Number of new steps (0 if nothing new was written or the files could not be opened).
+        """
+        try:
+            _, (x_new, y_new) = self._read_new()
+        except OSError as e:
+            logging.warning(f"Could not read the MPCO files while watching: {e}")
+            return 0
+
+        n_new = x_new.size
+        if n_new == 0:
+            return 0
+        self._x.extend(x_new)
+        self._y.extend(y_new)
+        self.n_steps += n_new
+
+        if self.line is not None:
+            self.line.set_data(self.x_array, self.y_array)
+            ax = self.line.axes
+            if ax is not None:
+                ax.relim()
+                ax.autoscale_view()
+                ax.figure.canvas.draw_idle()
+        return n_new
+
+    def watch(self, interval=2.0, max_polls=None, idle_polls=None):
+        """
+        Polls every `interval` seconds until `max_polls` polls were made, or `idle_polls` consecutive polls
+        found nothing new (e.g. the analysis finished). With an attached line in an interactive figure,
+        matplotlib's event loop keeps running between polls.
+
+        Returns:
+            int: Total number of steps read.
+        """
+        polls, idle = 0, 0
+        while max_polls is None or polls < max_polls:
+            n_new = self.poll()
+            polls += 1
+            idle = 0 if n_new else idle + 1
+            if idle_polls is not None and idle >= idle_polls:
+                break
+            if interval <= 0:
+                continue
+            if self.line is not None and self.line.figure is not None:
+                # Keeps GUI figures responsive; plain sleep on non-interactive canvases
+                self.line.figure.canvas.start_event_loop(interval)
+            else:
+                _time.sleep(interval)
+        return self.n_steps
@@ -0,0 +1,38 @@
+import pytest
+
+from MPCO_Model.core import collection
+from MPCO_Model.core.model import Model
+from MPCO_Model.data.synthetic import SyntheticDataSet, write_synthetic_model
+
+
+@pytest.fixture(scope='session')
+def synthetic_model(tmp_path_factory):
+    """
+    Small synthetic model directory shared by the tests: (folder_path, stories).
+    """
+    folder_path = str(tmp_path_factory.mktemp('synthetic'))
+    stories = write_synthetic_model(folder_path, n_nodes=120, n_stories=4, n_steps=40, n_modes=6, partitions=3)
+    return folder_path, stories
+
+
+@pytest.fixture
+def dataset(synthetic_model):
+    folder_path, stories = synthetic_model
+    return SyntheticDataSet(folder_path, stories)
+
+
+@pytest.fixture
+def synthetic_open(synthetic_model, monkeypatch):
+    """
+    Opens the models of ModelCollection and export_figures from synthetic files instead of an MPCODataSet,
+    and records the opened directories.
+    """
+    opened = []
+
+    def open_model(directory, recorder_name='results', stories=None, dataset_kwargs=None, snapshot=False):
+        opened.append(directory)
+        stories = stories if stories is not None else synthetic_model[1]
+        return Model(SyntheticDataSet(directory, stories), stories=stories)
+
+    monkeypatch.setattr(collection, 'open_model', open_model)
+    return opened
@@ -0,0 +1,96 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from MPCO_Model.core.collection import TASKS, ModelCollection, TaskError, _stack
+from MPCO_Model.core.model import Model
+from MPCO_Model.data.synthetic import write_modal_report, write_synthetic_model
+
+
+def test_modal_periods_task_without_stories(dataset):
+    model = Model(dataset)
+    assert model.mass is None
+    periods = TASKS['modal_periods'](model, n=4)['periods']
+    np.testing.assert_allclose(periods, 1.5 / np.array([1, 3, 5, 7]), rtol=1e-5)
+
+
+def test_modal_periods_task_custom_file(dataset):
+    write_modal_report(dataset.hdf5_directory, 2, first_period=0.8, filename='modal_x.txt')
+    periods = TASKS['modal_periods'](Model(dataset), n=2, modal_filename='modal_x.txt')['periods']
+    np.testing.assert_allclose(periods, [0.8, 0.8 / 3], rtol=1e-5)
+
+
+STEPS = {'short': 25, 'long': 40, 'mid': 32}
+
+fork_only = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                               reason='the synthetic open_model patch only reaches forked workers')
+
+
+@pytest.fixture(scope='module')
+def model_directories(tmp_path_factory):
+    directories = []
+    for seed, (name, n_steps) in enumerate(STEPS.items()):
+        folder_path = str(tmp_path_factory.mktemp(name))
+        stories = write_synthetic_model(folder_path, n_nodes=60, n_stories=3, n_steps=n_steps, n_modes=4,
+                                        partitions=2, seed=seed)
+        directories.append(folder_path)
+    return directories, stories
+
+
+def collection_of(model_directories, max_workers, extra=()):
+    directories, stories = model_directories
+    names = list(STEPS) + [f'extra_{i}' for i in range(len(extra))]
+    return ModelCollection(list(directories) + list(extra), names=names, stories=stories, max_workers=max_workers)
+
+
+def test_stack_pads_with_nan():
+    stacked = _stack([np.arange(3.0), np.arange(5.0), np.float64(7.0)])
+    assert stacked.shape == (3, 5)
+    np.testing.assert_array_equal(stacked[0], [0.0, 1.0, 2.0, np.nan, np.nan])
+    np.testing.assert_array_equal(stacked[2], [7.0, np.nan, np.nan, np.nan, np.nan])
+    assert _stack([np.ones((2, 3)), np.ones((2, 3))]).shape == (2, 2, 3)
+
+
+@pytest.mark.parametrize('max_workers', [0, pytest.param(2, marks=fork_only)])
+def test_run_stacks_in_collection_order(model_directories, synthetic_open, max_workers):
+    models = collection_of(model_directories, max_workers)
+    stacked = models.pushover(direction=1)
+
+    assert stacked.names == list(STEPS)
+    assert stacked['x_array'].shape == stacked['y_array'].shape == (3, max(STEPS.values()))
+    for name, n_steps in STEPS.items():
+        expected = models.model(name).plot.extract_pushover(direction=1)
+        row = stacked.get(name)
+        np.testing.assert_allclose(row['y_array'][:n_steps], expected['y_array'])
+        assert np.all(np.isnan(row['x_array'][n_steps:]))
+
+    periods = models.modal_periods(n=3)['periods']
+    assert periods.shape == (3, 3)
+
+
+@pytest.mark.parametrize('max_workers', [0, pytest.param(2, marks=fork_only)])
+def test_imap_orders(model_directories, synthetic_open, max_workers):
+    models = collection_of(model_directories, max_workers)
+    assert [name for name, _ in models.imap('time_history_peaks')] == list(STEPS)
+    completed = dict(models.imap('time_history_peaks', ordered=False, selection_set_id_verticalAxis=2))
+    assert sorted(completed) == sorted(STEPS)
+    assert all(result['peak'] >= abs(result['min']) for result in completed.values())
+    with pytest.raises(ValueError):
+        next(models.imap('unknown'))
+
+
+@pytest.mark.parametrize('max_workers', [0, pytest.param(2, marks=fork_only)])
+def test_task_errors(model_directories, synthetic_open, tmp_path, max_workers):
+    models = collection_of(model_directories, max_workers, extra=[str(tmp_path / 'missing')])
+    with pytest.raises(RuntimeError, match="model 'extra_0'"):
+        models.time_history_peaks()
+
+    stacked = models.time_history_peaks(errors='collect')
+    assert list(stacked.errors) == ['extra_0']
+    assert stacked['peak'].shape == (4,)
+    assert np.isnan(stacked.get('extra_0')['peak'])
+    assert np.all(np.isfinite(stacked['peak'][:3]))
+
+    results = dict(models.imap('time_history_peaks', errors='collect'))
+    assert isinstance(results['extra_0'], TaskError) and results['extra_0'].task == 'time_history_peaks'
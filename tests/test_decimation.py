@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from MPCO_Model.plotting.decimation import decimate, lttb_decimate, minmax_decimate
+
+
+def signal(n=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0.0, 10.0, n)
+    return x, np.sin(x) + 0.1 * rng.normal(size=n)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    x, y = signal()
+    n_buckets = 100
+    xd, yd = minmax_decimate(x, y, n_buckets)
+    assert xd.size <= 2 * n_buckets + 2
+    assert xd[0] == x[0] and xd[-1] == x[-1]
+    assert np.all(np.diff(xd) > 0)
+    size = y.size // n_buckets
+    blocks = y[:size * n_buckets].reshape(n_buckets, size)
+    assert np.all(np.isin(blocks.max(axis=1), yd))
+    assert np.all(np.isin(blocks.min(axis=1), yd))
+
+
+def test_minmax_x_extremes_for_cyclic_curves():
+    t = np.linspace(0.0, 6 * np.pi, 5000)
+    x, y = np.sin(t) * t, np.cos(t)
+    xd, _ = minmax_decimate(x, y, 20, include_x_extremes=True)
+    assert xd.max() == x.max() and xd.min() == x.min()
+
+
+def test_short_curves_unchanged():
+    x, y = signal(50)
+    for method in ('minmax', 'lttb'):
+        xd, yd = decimate(x, y, method, 100)
+        np.testing.assert_array_equal(xd, x)
+        np.testing.assert_array_equal(yd, y)
+
+
+def test_lttb():
+    x, y = signal()
+    xd, yd = lttb_decimate(x, y, 300)
+    assert xd.size == 300
+    assert xd[0] == x[0] and xd[-1] == x[-1]
+    assert np.all(np.diff(xd) > 0)
+    # Kept samples are original samples
+    np.testing.assert_array_equal(yd, y[np.searchsorted(x, xd)])
+    with pytest.raises(ValueError):
+        lttb_decimate(x, y, 2)
+
+
+def test_unknown_method():
+    x, y = signal(100)
+    with pytest.raises(ValueError):
+        decimate(x, y, 'every_other', 10)
@@ -0,0 +1,76 @@
+import os
+
+import matplotlib
+import numpy as np
+
+from MPCO_Model.data.curves import pad_curves
+from MPCO_Model.plotting.density import curve_density, curve_percentiles
+from MPCO_Model.plotting.plot import Plot
+
+matplotlib.use('Agg')
+
+
+def curves(n_curves=50, n_points=200, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0.0, 1.0, n_points)
+    y = rng.uniform(0.5, 2.0, size=(n_curves, 1)) * np.sin(2 * np.pi * x)
+    return np.broadcast_to(x, y.shape).copy(), y
+
+
+def test_pad_curves():
+    padded = pad_curves([[1, 2, 3], [4]])
+    assert padded.shape == (2, 3)
+    np.testing.assert_array_equal(padded[1], [4, np.nan, np.nan])
+
+
+def test_density_independent_of_chunks():
+    x, y = curves()
+    one, extent = curve_density(x, y, bins=(64, 48), chunk_curves=1)
+    many, extent_many = curve_density(x, y, bins=(64, 48), chunk_curves=1000)
+    np.testing.assert_array_equal(one, many)
+    assert extent == extent_many
+    assert one.shape == (48, 64)
+
+
+def test_density_counts_every_sample():
+    # A horizontal line crossing every pixel of one row
+    x = np.array([[0.0, 1.0]])
+    y = np.array([[0.5, 0.5]])
+    density, _ = curve_density(x, y, bins=(10, 4), x_range=(0, 1), y_range=(0, 1))
+    assert density.sum() == 11
+    assert np.count_nonzero(density[2]) == 10
+    assert density[[0, 1, 3]].sum() == 0
+
+
+def test_percentiles_shared_abscissa():
+    x, y = curves()
+    grid, bands = curve_percentiles(x, y, percentiles=(16, 50, 84))
+    np.testing.assert_array_equal(grid, x[0])
+    np.testing.assert_allclose(bands, np.percentile(y, [16, 50, 84], axis=0))
+
+
+def test_percentiles_interpolated():
+    # Curves with their own abscissas: y = a * x sampled differently
+    slopes = np.array([1.0, 2.0, 3.0])
+    xs = [np.linspace(0, 1, n) for n in (11, 21, 41)]
+    grid, bands = curve_percentiles(xs, [a * x for a, x in zip(slopes, xs)], percentiles=(50,), n_points=5)
+    np.testing.assert_allclose(grid, np.linspace(0, 1, 5))
+    np.testing.assert_allclose(bands[0], 2.0 * grid)
+
+
+
+def test_percentiles_narrow_x_range():
+    # An x_range narrower than the curves must not mix neighbouring curves
+    xs = [np.linspace(0, 10, 15), np.linspace(0, 9.5, 12)]
+    ys = [np.zeros(15), np.full(12, 100.0)]
+    grid, bands = curve_percentiles(xs, ys, percentiles=(0, 100), n_points=5, x_range=(0, 2))
+    np.testing.assert_allclose(grid, np.linspace(0, 2, 5))
+    np.testing.assert_allclose(bands, [np.zeros(5), np.full(5, 100.0)])
+
+
+def test_density_plot_saves_in_directory(dataset, tmp_path):
+    dataset.hdf5_directory = str(tmp_path / 'figures')
+    x, y = curves(10, 50)
+    _, results = Plot(dataset).density_plot(x, y, bins=(32, 24), save_svg=True)
+    assert results['density'].shape == (24, 32)
+    assert os.path.exists(os.path.join(dataset.hdf5_directory, 'DENSITY.svg'))
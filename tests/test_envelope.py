@@ -0,0 +1,85 @@
+import h5py
+import numpy as np
+import pytest
+
+from MPCO_Model.analysis.elementEnvelope import element_envelopes
+from MPCO_Model.analysis.envelope import EnvelopeReducer
+
+STAGE = 'MODEL_STAGE[5]'
+
+
+def test_reducer_matches_full_reduction():
+    values = np.random.default_rng(0).normal(size=(4, 3, 50))
+    reducer = EnvelopeReducer((4, 3))
+    for start in range(0, 50, 7):
+        reducer.update(values[:, :, start:start + 7])
+    assert reducer.n_steps == 50
+    np.testing.assert_array_equal(reducer.max, values.max(axis=-1))
+    np.testing.assert_array_equal(reducer.min, values.min(axis=-1))
+    np.testing.assert_array_equal(reducer.abs_max, np.abs(values).max(axis=-1))
+    np.testing.assert_array_equal(reducer.step_of_max, values.argmax(axis=-1))
+    np.testing.assert_array_equal(reducer.step_of_min, values.argmin(axis=-1))
+    np.testing.assert_array_equal(reducer.step_of_abs_max, np.abs(values).argmax(axis=-1))
+
+
+def test_reducer_frame_and_shape_check():
+    reducer = EnvelopeReducer(3)
+    reducer.update(np.array([[1.0, -5.0], [2.0, 0.0], [0.0, 3.0]]), step_offset=10)
+    frame = reducer.to_frame(index=['a', 'b', 'c'], time=np.arange(12) * 0.5)
+    assert list(frame['step_of_abs_max']) == [11, 10, 11]
+    assert list(frame['time_of_abs_max']) == [5.5, 5.0, 5.5]
+    with pytest.raises(ValueError):
+        reducer.update(np.zeros((2, 5)))
+
+
+class _Dataset:
+    def __init__(self, folder_path):
+        self.hdf5_directory = folder_path
+        self.recorder_name = 'results'
+
+
+def write_element_results(folder_path, steps_per_partition, n_components=3, seed=0):
+    rng = np.random.default_rng(seed)
+    full = []
+    for part, n_steps in enumerate(steps_per_partition):
+        ids = np.arange(part * 100 + 1, part * 100 + 8)
+        values = rng.normal(size=(ids.size, n_components, n_steps))
+        with h5py.File(f"{folder_path}/results.part-{part}.mpco", 'w') as f:
+            group = f.create_group(f"{STAGE}/RESULTS/ON_ELEMENTS/force/5-ElasticBeam3d[1:0:0]")
+            group['ID'] = ids.reshape(-1, 1)
+            for step in range(n_steps):
+                block = group.create_dataset(f"DATA/STEP_{step}", data=values[:, :, step])
+                block.attrs['TIME'] = np.array([0.1 * step])
+        full.append((ids, values))
+    return full
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'chunk_steps': 4, 'chunk_elements': 3}, {'max_workers': 2}])
+def test_element_envelopes(tmp_path, kwargs):
+    full = write_element_results(str(tmp_path), [20, 20])
+    envelope, = element_envelopes(_Dataset(str(tmp_path)), STAGE, 'force', **kwargs).values()
+    ids = np.concatenate([i for i, _ in full])
+    values = np.concatenate([v for _, v in full])
+    np.testing.assert_array_equal(envelope.element_ids, ids)
+    np.testing.assert_allclose(envelope.max, values.max(axis=-1))
+    np.testing.assert_array_equal(envelope.step_of_abs_max, np.abs(values).argmax(axis=-1))
+    np.testing.assert_allclose(envelope.time_of_abs_max, 0.1 * envelope.step_of_abs_max)
+    assert envelope.to_frame().shape == (ids.size * 3, 7)
+
+
+def test_partitions_truncated_to_common_steps(tmp_path):
+    # The second partition is ahead, e.g. while the analysis is still running
+    full = write_element_results(str(tmp_path), [12, 20])
+    envelope, = element_envelopes(_Dataset(str(tmp_path)), STAGE, 'force').values()
+    assert envelope.n_steps == 12
+    values = np.concatenate([v[:, :, :12] for _, v in full])
+    np.testing.assert_allclose(envelope.abs_max, np.abs(values).max(axis=-1))
+    assert envelope.step_of_abs_max.max() < 12
+
+
+def test_element_filter(tmp_path):
+    write_element_results(str(tmp_path), [5, 5])
+    envelopes = element_envelopes(_Dataset(str(tmp_path)), STAGE, 'force', groups=['ElasticBeam'], element_ids=[2, 101])
+    np.testing.assert_array_equal(envelopes['5-ElasticBeam3d[1:0:0]'].element_ids, [2, 101])
+    with pytest.raises(KeyError):
+        element_envelopes(_Dataset(str(tmp_path)), STAGE, 'force', groups=['Truss'])
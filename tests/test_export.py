@@ -0,0 +1,23 @@
+import os
+
+from MPCO_Model.plotting.export import ExportJob, export_figures
+
+
+def test_export_in_process(synthetic_model, synthetic_open, tmp_path):
+    folder_path, _ = synthetic_model
+    jobs = [
+        ExportJob(folder_path, 'time_history', {'selection_set_id_verticalAxis': set_id, 'direction': 1},
+                  filename=f'TH_{set_id}', output_dir=str(tmp_path), formats=('svg', 'png'))
+        for set_id in (1, 2)
+    ]
+    jobs.append(ExportJob(folder_path, 'modal', output_dir=str(tmp_path)))
+    results = export_figures(jobs, max_workers=0)
+
+    assert [r.error for r in results[:2]] == [None, None]
+    for set_id, result in zip((1, 2), results):
+        assert result.files == [os.path.join(str(tmp_path), f'TH_{set_id}.{fmt}') for fmt in ('svg', 'png')]
+        assert all(os.path.getsize(f) > 0 for f in result.files)
+    # A failing job is reported without stopping the others
+    assert results[2].files == [] and 'Unknown plot kind' in results[2].error
+    # Consecutive jobs on the same model reuse it
+    assert synthetic_open == [folder_path]
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import MPCO_Model
+from MPCO_Model import analysis, mass
+
+
+def test_lazy_attribute_is_cached_in_package():
+    value = mass.StoryIndex
+    assert vars(mass)['StoryIndex'] is value
+    assert value.__module__ == 'MPCO_Model.mass.storyIndex'
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError, match='has no attribute'):
+        analysis.not_a_name
+
+
+def test_dir_lists_lazy_names():
+    assert set(MPCO_Model.__all__) <= set(dir(MPCO_Model))
+    assert 'EnvelopeReducer' in dir(analysis)
+
+
+def test_import_does_not_pull_heavy_modules():
+    code = ("import sys, MPCO_Model, MPCO_Model.analysis, MPCO_Model.plotting; "
+            "print(sorted(m for m in ('pandas', 'matplotlib', 'scipy') if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(MPCO_Model.__file__)))
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == '[]'
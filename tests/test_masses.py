@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from MPCO_Model.data.synthetic import synthetic_stories, write_mass_file
+from MPCO_Model.mass.dynamicMass import Masses
+from MPCO_Model.mass.storyIndex import StoryIndex
+
+
+@pytest.fixture
+def mass_model(tmp_path):
+    stories = synthetic_stories(4, story_height=3.7)
+    write_mass_file(str(tmp_path), 500, stories)
+    return str(tmp_path), stories
+
+
+def test_story_index_bounds():
+    index = StoryIndex([0.0, 3.0, 6.0], [-1.0, 0.0, 1.0, 3.0, 3.5, 6.0, 7.0])
+    np.testing.assert_array_equal(index.story_of_node, [0, 0, 1, 1, 2, 2, -1])
+    np.testing.assert_array_equal(index.counts, [2, 2, 2])
+    np.testing.assert_allclose(index.aggregate(np.arange(7.0)), [1.0, 5.0, 9.0])
+    with pytest.raises(ValueError):
+        StoryIndex([3.0, 0.0], [1.0])
+
+
+def test_story_index_matches_masks(mass_model):
+    folder_path, stories = mass_model
+    df = Masses(folder_path, stories=stories, use_cache=False)._get_masses()
+    index = StoryIndex(stories, df['zCrd'].to_numpy())
+    sums = index.aggregate(df[Masses.MASS_COLUMNS].to_numpy())
+    for story in range(len(stories)):
+        expected = df.loc[index.mask(story), Masses.MASS_COLUMNS].to_numpy().sum(axis=0)
+        np.testing.assert_allclose(sums[story], expected)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_stream_matches_in_memory(mass_model, dtype):
+    folder_path, stories = mass_model
+    masses = Masses(folder_path, stories=stories, use_cache=False)
+    df = masses._get_masses()
+    streamed = masses.stream_aggregated_masses(chunksize=64, dtype=dtype)
+
+    expected = StoryIndex(stories, df['zCrd'].to_numpy()).aggregate(df[Masses.MASS_COLUMNS].to_numpy())
+    np.testing.assert_allclose(streamed['by_story'][Masses.MASS_COLUMNS].to_numpy(), expected, rtol=1e-6)
+    np.testing.assert_allclose(streamed['by_coordinate']['zCrd'], stories)
+
+
+def test_stream_float32_story_bounds(tmp_path):
+    # 3.7 and 7.4 are not representable in float32, the nodes must still land on their own level
+    results = tmp_path / 'results'
+    results.mkdir()
+    (results / 'nodeMassCoord.out').write_text(
+        '# nodeID xCrd yCrd zCrd Mx My Mz Mrx Mry Mrz\n'
+        '1 0 0 3.7 1 0 0 0 0 0\n'
+        '2 0 0 7.4 2 0 0 0 0 0\n')
+    streamed = Masses(str(tmp_path), stories=[0.0, 3.7, 7.4]).stream_aggregated_masses(dtype=np.float32)
+    np.testing.assert_allclose(streamed['by_story']['Mx'], [0.0, 1.0, 2.0])
+
+
+def test_memo_keeps_most_recent_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(Masses, 'MEMO_SIZE', 2)
+    monkeypatch.setattr(Masses, '_memo', type(Masses._memo)())
+    stories = synthetic_stories(2)
+    folders = []
+    for i in range(3):
+        folder = tmp_path / f'model_{i}'
+        folder.mkdir()
+        write_mass_file(str(folder), 20, stories)
+        folders.append(str(folder))
+
+    first = Masses(folders[0])._get_masses()
+    Masses(folders[1])._get_masses()
+    assert Masses(folders[0])._get_masses() is first
+    Masses(folders[2])._get_masses()
+
+    # The second file was the least recently used one
+    assert len(Masses._memo) == 2
+    assert not any(folders[1] in path for path in Masses._memo)
+    assert Masses(folders[0])._get_masses() is first
+
+
+def test_sidecar_matches_text_file_and_is_invalidated(mass_model, monkeypatch):
+    folder_path, stories = mass_model
+    monkeypatch.setattr(Masses, '_memo', type(Masses._memo)())
+    filepath = os.path.join(folder_path, 'results', 'nodeMassCoord.out')
+    parsed = Masses(folder_path, use_cache=False)._get_masses()
+
+    Masses(folder_path)._get_masses()
+    assert os.path.exists(filepath + Masses.CACHE_SUFFIX)
+    Masses._memo.clear()
+    # Loaded from the sidecar, the text file is not parsed again
+    with monkeypatch.context() as m:
+        m.setattr(pd, 'read_csv', None)
+        cached = Masses(folder_path)._get_masses()
+    pd.testing.assert_frame_equal(cached, parsed)
+
+    # Rewriting the text file invalidates both copies
+    with open(filepath, 'a') as f:
+        f.write('9999 0 0 0 5 0 0 0 0 0\n')
+    reread = Masses(folder_path)._get_masses()
+    assert len(reread) == len(parsed) + 1
+
+    Masses(folder_path).clear_cache()
+    assert not os.path.exists(filepath + Masses.CACHE_SUFFIX)
+    assert not Masses._memo
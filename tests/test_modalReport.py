@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+
+from MPCO_Model.data.synthetic import write_modal_report
+from MPCO_Model.mass.modalReport import ModalReport
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def test_synthetic_report(tmp_path):
+    report = ModalReport.load(write_modal_report(str(tmp_path), 4, first_period=1.5))
+    np.testing.assert_allclose(report.periods(), 1.5 / np.array([1, 3, 5, 7]), rtol=1e-5)
+    np.testing.assert_allclose(report.column('ratio_MX'), 80.0 / np.arange(1, 5) ** 2, rtol=1e-5)
+    np.testing.assert_allclose(report.column('cumulative_MY'), np.cumsum(75.0 / np.arange(1, 5) ** 2), rtol=1e-5)
+
+
+def test_opensees_report():
+    report = ModalReport.load(os.path.join(DATA, 'modal_real.txt'))
+    assert len(report) == 3
+    np.testing.assert_allclose(report.periods(), [1.25790, 0.610102, 0.422206])
+    np.testing.assert_allclose(report.frequencies(2), [0.794978, 1.63907])
+    # Description and dash lines inside a section keep its title and columns
+    np.testing.assert_allclose(report.column('factor_MX'), [1.27, -0.4, 0.1])
+    np.testing.assert_allclose(report.column('ratio_MY'), [0.833333, 77.7778, 11.1111])
+    # The cumulative mass ratios, not the cumulative participation masses
+    np.testing.assert_allclose(report.column('cumulative_RMZ'), [14.8148, 18.5185, 92.5926])
+    assert not any(c.startswith('masses') for c in report.columns)
+
+
+def test_missing_modes(tmp_path):
+    report = ModalReport.load(write_modal_report(str(tmp_path), 3))
+    with pytest.raises(ValueError):
+        report.periods(5)
+    with pytest.raises(KeyError):
+        report.column('factor_MX')
+
+
+def test_malformed_eigenvalue_row(tmp_path):
+    with open(os.path.join(DATA, 'modal_real.txt'), encoding='utf-8') as f:
+        text = f.read()
+    filepath = tmp_path / 'modal.txt'
+    filepath.write_text(text.replace('0.610102', 'nan?'), encoding='utf-8')
+    with pytest.raises(ValueError, match='Could not parse'):
+        ModalReport.load(str(filepath))
+
+
+def test_cached_until_modified(tmp_path):
+    filepath = write_modal_report(str(tmp_path), 3)
+    assert ModalReport.load(filepath) is ModalReport.load(filepath)
+    write_modal_report(str(tmp_path), 5)
+    assert len(ModalReport.load(filepath)) == 5
+
+
+def test_memo_keeps_most_recent_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(ModalReport, 'MEMO_SIZE', 2)
+    monkeypatch.setattr(ModalReport, '_memo', type(ModalReport._memo)())
+    paths = [write_modal_report(str(tmp_path), 3, filename=f'modal_{i}.txt') for i in range(3)]
+
+    first = ModalReport.load(paths[0])
+    ModalReport.load(paths[1])
+    assert ModalReport.load(paths[0]) is first
+    ModalReport.load(paths[2])
+    assert list(ModalReport._memo) == [os.path.abspath(p) for p in (paths[0], paths[2])]
+
+
+def write_report(tmp_path, text):
+    filepath = tmp_path / 'modal.txt'
+    filepath.write_text(text, encoding='utf-8')
+    return str(filepath)
+
+
+def test_eigen_columns_by_header_name(tmp_path):
+    filepath = write_report(tmp_path, (
+        '* 1. EIGENVALUE ANALYSIS:\n'
+        '#  MODE   PERIOD   LAMBDA\n'
+        '   1      2.0      9.8696\n'
+        '   2      0.5      157.914\n'))
+    report = ModalReport.load(filepath)
+    np.testing.assert_allclose(report.periods(), [2.0, 0.5])
+    np.testing.assert_allclose(report.column('eigenvalue'), [9.8696, 157.914])
+    # Missing columns are derived from the period
+    np.testing.assert_allclose(report.frequencies(), [0.5, 2.0])
+    np.testing.assert_allclose(report.column('omega'), [np.pi, 4 * np.pi])
+
+
+def test_eigen_header_without_period_raises(tmp_path):
+    # Taking the columns by position would read the frequencies as periods
+    filepath = write_report(tmp_path, (
+        '#  MODE  LAMBDA   OMEGA    T        FREQUENCY\n'
+        '   1     9.8696   3.14159  2.0      0.5\n'))
+    with pytest.raises(ValueError, match='no PERIOD column'):
+        ModalReport.load(filepath)
+
+
+def test_headerless_legacy_table(tmp_path):
+    filepath = write_report(tmp_path, (
+        'Eigenvalues\n'
+        '1 9.8696 3.14159 0.5 2.0\n'
+        '2 157.914 12.5664 2.0 0.5\n'))
+    np.testing.assert_allclose(ModalReport.load(filepath).periods(), [2.0, 0.5])
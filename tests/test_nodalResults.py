@@ -0,0 +1,68 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from MPCO_Model.data.mpcoFiles import partition_files
+from MPCO_Model.data.nodalResults import extract_axis, extract_batch
+from MPCO_Model.data.selectionIndex import SelectionIndex
+
+STAGE = 'MODEL_STAGE[5]'
+
+
+def test_batch_matches_single_extractions(dataset):
+    requests = [('DISPLACEMENT', 1, [0, 1]), ('DISPLACEMENT', 3, 0), ('ACCELERATION', 2, 1)]
+    batch = extract_batch(dataset, STAGE, requests, values_operation='Max', index=SelectionIndex(dataset))
+    assert batch.data.shape == (3, 2, 40)
+    for results_name, set_id, direction in [('DISPLACEMENT', 1, 0), ('DISPLACEMENT', 1, 1),
+                                            ('DISPLACEMENT', 3, 0), ('ACCELERATION', 2, 1)]:
+        expected = extract_axis(dataset, STAGE, results_name, set_id, direction, values_operation='Max')
+        np.testing.assert_allclose(batch.get(results_name, set_id, direction), expected)
+
+
+def with_time_steps(dataset, n_steps):
+    index = pd.MultiIndex.from_product([[STAGE], np.arange(n_steps)], names=['MODEL_STAGE', 'STEP'])
+    dataset.time = pd.DataFrame({'TIME': np.arange(n_steps) * 0.01}, index=index)
+    return dataset
+
+
+def test_fewer_steps_than_time_warns(dataset, caplog):
+    with caplog.at_level(logging.WARNING):
+        batch = extract_batch(with_time_steps(dataset, 45), STAGE, [('DISPLACEMENT', 1, 0)])
+    assert "'DISPLACEMENT'" in caplog.text and '40 steps' in caplog.text and '45 time steps' in caplog.text
+    assert np.all(np.isfinite(batch.data[0, 0, :40]))
+    assert np.all(np.isnan(batch.data[0, 0, 40:]))
+
+
+def test_more_steps_than_time_raises(dataset):
+    with pytest.raises(ValueError, match='40 steps'):
+        extract_batch(with_time_steps(dataset, 30), STAGE, [('DISPLACEMENT', 1, 0)])
+
+
+def _no_dataframe_reads(dataset, monkeypatch):
+    def get_nodal_results(*args, **kwargs):
+        raise AssertionError('get_nodal_results should not be called with a SelectionIndex')
+
+    monkeypatch.setattr(dataset.nodes, 'get_nodal_results', get_nodal_results)
+
+
+@pytest.mark.parametrize('operation', ['Sum', 'Mean', 'Max', 'Min'])
+def test_indexed_extraction_reads_cached_rows(dataset, monkeypatch, operation):
+    expected = extract_axis(dataset, STAGE, 'DISPLACEMENT', 2, 1, values_operation=operation)
+    requests = [('DISPLACEMENT', 2, 1), ('DISPLACEMENT', 3, [0, 1])]
+    expected_batch = extract_batch(dataset, STAGE, requests, values_operation=operation)
+
+    index = SelectionIndex(dataset)
+    _no_dataframe_reads(dataset, monkeypatch)
+    np.testing.assert_allclose(
+        extract_axis(dataset, STAGE, 'DISPLACEMENT', 2, 1, values_operation=operation, index=index), expected)
+    np.testing.assert_allclose(extract_batch(dataset, STAGE, requests, values_operation=operation, index=index).data,
+                               expected_batch.data)
+    # The rows of the selection sets are resolved once per partition and shared
+    assert len(index._set_rows) == 2 * len(partition_files(dataset))
+
+
+def test_indexed_extraction_checks_direction(dataset):
+    with pytest.raises(KeyError, match='Direction 7'):
+        extract_axis(dataset, STAGE, 'DISPLACEMENT', 2, 7, index=SelectionIndex(dataset))
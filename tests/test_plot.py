@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from MPCO_Model.data.mpcoFiles import partition_files
+from MPCO_Model.plotting.plot import Plot
+
+
+def _mean_history(dataset, selection_set_id, direction, results_name='DISPLACEMENT'):
+    df = dataset.nodes.get_nodal_results(results_name, 'MODEL_STAGE[5]', selection_set_id=selection_set_id)
+    return df[direction].groupby(level='step').mean().to_numpy()
+
+
+def test_extract_time_history_is_headless_and_cached(dataset):
+    plot = Plot(dataset)
+    results = plot.extract_time_history(selection_set_id_verticalAxis=2, direction=1)
+    np.testing.assert_allclose(results['y_array'], _mean_history(dataset, 2, 1))
+    np.testing.assert_allclose(results['x_array'], dataset.time['TIME'].to_numpy())
+    assert not results['y_array'].flags.writeable
+
+    again = plot.extract_time_history(selection_set_id_verticalAxis=2, direction=1)
+    assert again['y_array'] is results['y_array']
+    plot.clear_cache()
+    assert plot.extract_time_history(selection_set_id_verticalAxis=2, direction=1)['y_array'] is not results['y_array']
+
+
+def test_axis_cache_is_bounded(dataset):
+    plot = Plot(dataset, cache_size=2)
+    first = plot.extract_time_history(selection_set_id_verticalAxis=1, direction=0)['y_array']
+    for set_id in (2, 3):
+        plot.extract_time_history(selection_set_id_verticalAxis=set_id, direction=0)
+    assert len(plot._axis_cache) == 2
+    assert plot.extract_time_history(selection_set_id_verticalAxis=1, direction=0)['y_array'] is not first
+
+
+def test_extract_nodes_matches_selection_set(dataset):
+    plot = Plot(dataset)
+    node_ids = dataset.selection_set[3]['NODES']
+    by_nodes = plot.extract_nodes(node_ids, direction=1, values_operation='Mean')
+    np.testing.assert_allclose(by_nodes['y_array'], _mean_history(dataset, 3, 1))
+    with pytest.raises(ValueError):
+        plot.extract_nodes([])
+
+
+def test_stage_helpers():
+    from MPCO_Model.plotting.plot import _continuous_time, _stage_number
+
+    stages = ['MODEL_STAGE[10]', 'custom', 'MODEL_STAGE[2]']
+    assert sorted(stages, key=_stage_number) == ['MODEL_STAGE[2]', 'MODEL_STAGE[10]', 'custom']
+    np.testing.assert_allclose(_continuous_time([[0.0, 1.0], [0.0, 0.5], [2.0, 3.0]]),
+                               [0.0, 1.0, 1.0, 1.5, 2.0, 3.0])
+
+
+def test_extract_stages_concatenates_in_order(dataset):
+    plot = Plot(dataset)
+    single = plot.extract_time_history(selection_set_id_verticalAxis=2, direction=1)
+    n = single['y_array'].size
+    assert plot.model_stages() == ['MODEL_STAGE[5]']
+
+    # The same stage twice behaves like two stages whose time restarts
+    results = plot.extract_stages('time_history', ['MODEL_STAGE[5]'] * 2, selection_set_id_verticalAxis=2,
+                                  direction=1)
+    np.testing.assert_array_equal(results['y_array'], np.tile(single['y_array'], 2))
+    np.testing.assert_array_equal(results['stage_bounds'], [0, n, 2 * n])
+    np.testing.assert_array_equal(results['stage'], np.repeat([0, 1], n))
+    assert np.all(np.diff(results['time']) >= 0)
+    np.testing.assert_allclose(results['time'][n:], single['x_array'] + single['x_array'][-1])
+    np.testing.assert_array_equal(results['x_array'], results['time'])
+
+    with pytest.raises(ValueError):
+        plot.extract_stages('modal')
+    with pytest.raises(ValueError):
+        plot.extract_stages(model_stages=[])
+
+
+def test_plots_save_inside_model_directory(dataset, tmp_path):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # No trailing separator: the files must still land inside the directory, which is created
+    dataset.results_partitions = dict(enumerate(partition_files(dataset)))
+    dataset.hdf5_directory = str(tmp_path / 'figures')
+    plot = Plot(dataset)
+    for method, filename in ((plot.pushover_plot, 'PO_1.svg'), (plot.time_history_plot, 'TH_1.svg')):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        method(direction=1, ax=figure.add_subplot(), save_svg=True)
+        assert os.path.exists(os.path.join(dataset.hdf5_directory, filename))
+    assert sorted(os.listdir(tmp_path)) == ['figures']
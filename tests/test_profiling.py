@@ -0,0 +1,59 @@
+import threading
+import tracemalloc
+
+import numpy as np
+
+from MPCO_Model.core.profiling import NULL_PROFILER, Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    with NULL_PROFILER.span('noop'):
+        pass
+    assert NULL_PROFILER.records == []
+
+
+def test_nested_spans_peak_memory():
+    profiler = Profiler(enabled=True)
+    with profiler.span('outer', file='x'):
+        with profiler.span('inner'):
+            block = np.ones(2_000_000)
+            del block
+        small = np.ones(1000)
+        del small
+    assert not tracemalloc.is_tracing()
+
+    inner, outer = profiler.records
+    assert inner['parent'] == 'outer' and inner['depth'] == 1
+    assert outer['file'] == 'x'
+    assert inner['peak_memory'] >= 16_000_000
+    # The parent keeps the peak reached in its children
+    assert outer['peak_memory'] >= inner['peak_memory']
+    assert outer['wall_time'] >= inner['wall_time']
+
+
+def test_overlapping_threads_do_not_report_peaks():
+    profiler = Profiler(enabled=True)
+    inside, release = threading.Barrier(2), threading.Event()
+
+    def work():
+        with profiler.span('thread'):
+            inside.wait()
+            release.wait()
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    with profiler.span('main'):
+        inside.wait()
+        release.set()
+        thread.join()
+    assert not tracemalloc.is_tracing()
+
+    records = {r['name']: r for r in profiler.records}
+    assert records['main']['peak_memory'] is None
+    assert records['thread']['peak_memory'] is None
+    assert records['main']['thread'] != records['thread']['thread']
+
+    # Spans after the overlap report their peak again
+    with profiler.span('alone'):
+        pass
+    assert profiler.records[-1]['peak_memory'] is not None
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from MPCO_Model.analysis.pushover import bilinearize, performance_points
+
+
+def elastic_plastic(n=101, dy=1.0, Vy=100.0, du=5.0):
+    x = np.linspace(0.0, du, n)
+    return x, np.minimum(x / dy, 1.0) * Vy
+
+
+def test_ec8_equal_energy():
+    x, y = elastic_plastic()
+    curves = bilinearize([x], [y], method='EC8', design_shear=50.0)
+    np.testing.assert_allclose(curves.Vy, 100.0)
+    np.testing.assert_allclose(curves.du, 5.0)
+    np.testing.assert_allclose(curves.energy, 450.0)
+    np.testing.assert_allclose(curves.dy, 1.0)
+    np.testing.assert_allclose(curves.ductility, 5.0)
+    np.testing.assert_allclose(curves.overstrength, 2.0)
+
+
+def test_asce41_hardening():
+    x = np.linspace(0.0, 5.0, 501)
+    y = np.where(x <= 1.0, 100.0 * x, 100.0 + 10.0 * (x - 1.0))
+    curves = bilinearize([x], [y], method='ASCE41')
+    np.testing.assert_allclose(curves.Vy, 100.0, rtol=1e-6)
+    np.testing.assert_allclose(curves.dy, 1.0, rtol=1e-6)
+    np.testing.assert_allclose(curves.Ke, 100.0, rtol=1e-6)
+    np.testing.assert_allclose(curves.alpha, 0.1, rtol=1e-6)
+    with pytest.raises(ValueError):
+        bilinearize([x], [y], method='FEMA440')
+
+
+def test_ultimate_point_after_strength_drop():
+    x = np.linspace(0.0, 6.0, 61)
+    y = np.where(x <= 1.0, 100.0 * x, np.where(x <= 4.0, 100.0, 100.0 - 30.0 * (x - 4.0)))
+    curves = bilinearize([x], [y], ultimate_drop=0.2)
+    # Last point before the shear falls below 80
+    assert y[curves.ultimate_index[0] + 1] < 80.0 <= y[curves.ultimate_index[0]]
+    np.testing.assert_allclose(curves.du, x[curves.ultimate_index[0]])
+
+
+def test_batch_directions_and_padding():
+    x, y = elastic_plastic()
+    short_x, short_y = elastic_plastic(n=41, du=2.0)
+    # Negative push, base reactions with the opposite sign of the displacements, shorter curve
+    batch = bilinearize([x, -x, x, short_x], [y, y, -y, short_y])
+    np.testing.assert_allclose(batch.dy[:3], 1.0)
+    np.testing.assert_allclose(batch.Vy[:3], 100.0)
+    np.testing.assert_array_equal(batch.sign, [1, -1, 1, 1])
+    np.testing.assert_array_equal(batch.shear_sign, [1, 1, -1, 1])
+    np.testing.assert_allclose(batch.du[3], 2.0)
+
+    bx, by = batch.curves()
+    np.testing.assert_allclose(bx[1], [0.0, -1.0, -5.0])
+    np.testing.assert_allclose(by[2], [0.0, -100.0, -100.0])
+    np.testing.assert_allclose(batch.shear_at(0.5), [50.0, 50.0, 50.0, 50.0])
+
+
+def test_performance_points_n2():
+    x, y = elastic_plastic()
+    curves = bilinearize([x, x, x], [y, y, y])
+    periods = np.linspace(0.05, 4.0, 400)
+    Sa = np.stack([np.full(periods.size, 50.0), np.full(periods.size, 200.0), np.full(periods.size, 1000.0)])
+    points = performance_points(curves, periods, Sa, m_star=1.0, Tc=[2.0, 2.0, 4.0])
+
+    T_star = 2 * np.pi / 10.0
+    np.testing.assert_allclose(points.T_star, T_star)
+    np.testing.assert_allclose(points.d_elastic, Sa[:, 0] / 100.0)
+    # Elastic: equal displacement
+    np.testing.assert_allclose(points.d_target[0], 0.5)
+    np.testing.assert_allclose(points.V_target[0], 50.0)
+    # Short period, yielding: N2 amplification
+    np.testing.assert_allclose(points.d_target[1], 1.0 + 2.0 / T_star)
+    # Amplification capped at 3 times the elastic demand, beyond the ultimate point
+    np.testing.assert_allclose(points.d_target[2], 30.0)
+    np.testing.assert_array_equal(points.exceeded, [False, False, True])
+    assert np.isnan(points.V_target[2])
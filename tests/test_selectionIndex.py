@@ -0,0 +1,63 @@
+import h5py
+import numpy as np
+
+from MPCO_Model.data.mpcoFiles import NODAL_RESULTS_PATH, NodalResultStream, node_rows, partition_files
+from MPCO_Model.data.selectionIndex import SelectionIndex
+from MPCO_Model.data.synthetic import SyntheticDataSet, write_synthetic_model
+
+STAGE = 'MODEL_STAGE[5]'
+
+
+def test_rows_match_node_rows(dataset):
+    index = SelectionIndex(dataset)
+    nodes = index.node_ids(2)
+    assert not nodes.flags.writeable
+    path = NODAL_RESULTS_PATH.format(model_stage=STAGE, results_name='DISPLACEMENT')
+    resolved = index.set_rows(STAGE, 'DISPLACEMENT', 2)
+    for filepath, rows in zip(partition_files(dataset), resolved):
+        with h5py.File(filepath, 'r') as f:
+            np.testing.assert_array_equal(rows, node_rows(f[path], nodes)[0])
+    # Unknown nodes are ignored
+    assert index.rows(partition_files(dataset)[0], STAGE, 'DISPLACEMENT', [10 ** 9]).size == 0
+
+
+def test_missing_result_is_not_cached(tmp_path):
+    stories = write_synthetic_model(str(tmp_path), n_nodes=30, n_stories=2, n_steps=5, partitions=2)
+    dataset = SyntheticDataSet(str(tmp_path), stories)
+    index = SelectionIndex(dataset)
+    assert index.partition_rows(STAGE, 'EXTRA', [1, 2, 3]) == [None, None]
+
+    # The result appears later (e.g. written by a running analysis)
+    filepath = partition_files(dataset)[1]
+    with h5py.File(filepath, 'a') as f:
+        f[NODAL_RESULTS_PATH.format(model_stage=STAGE, results_name='EXTRA') + '/ID'] = np.array([[3], [1]])
+    rows = index.partition_rows(STAGE, 'EXTRA', [1, 2, 3])
+    assert rows[0] is None
+    np.testing.assert_array_equal(rows[1], [0, 1])
+
+
+def test_partition_count_change(tmp_path):
+    stories = write_synthetic_model(str(tmp_path), n_nodes=30, n_stories=2, n_steps=5, partitions=3)
+    dataset = SyntheticDataSet(str(tmp_path), stories)
+    files = partition_files(dataset)
+    # Only the first two partitions written so far
+    dataset.results_partitions = dict(enumerate(files[:2]))
+    index = SelectionIndex(dataset)
+    assert len(index.set_rows(STAGE, 'DISPLACEMENT', 0)) == 2
+
+    dataset.results_partitions = dict(enumerate(files))
+    resolved = index.set_rows(STAGE, 'DISPLACEMENT', 0)
+    assert len(resolved) == 3
+    assert sum(rows.size for rows in resolved) == 30
+
+
+def test_stream_with_index(dataset):
+    index = SelectionIndex(dataset)
+    groups = [index.node_ids(level) for level in (1, 2, 3)]
+    plain = list(NodalResultStream(dataset, STAGE, 'DISPLACEMENT', groups, chunk_size=16))
+    indexed = list(NodalResultStream(dataset, STAGE, 'DISPLACEMENT', groups, chunk_size=16, index=index))
+    assert len(plain) == len(indexed) == 3
+    for (s1, t1, v1), (s2, t2, v2) in zip(plain, indexed):
+        assert s1 == s2
+        np.testing.assert_array_equal(t1, t2)
+        np.testing.assert_array_equal(v1, v2)
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import uuid
+
+import numpy as np
+import pytest
+
+from MPCO_Model.data.sharedResults import SharedResults, SharedResultsView, _catalog_lock
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def test_publish_and_read():
+    with SharedResults() as shared:
+        shared.publish('a', np.arange(6.0).reshape(2, 3), unit='m')
+        with SharedResultsView(shared.prefix) as view:
+            np.testing.assert_array_equal(view.get('a'), np.arange(6.0).reshape(2, 3))
+            assert view.metadata('a') == {'unit': 'm'}
+            assert view.keys() == ['a']
+
+
+def test_lock_times_out_while_held():
+    prefix = f"test_{uuid.uuid4().hex}"
+    with _catalog_lock(prefix):
+        with pytest.raises(TimeoutError):
+            with _catalog_lock(prefix, timeout=0.05):
+                pass
+    with _catalog_lock(prefix, timeout=0.05):
+        pass
+
+
+def test_lock_released_when_holder_dies():
+    prefix = f"test_{uuid.uuid4().hex}"
+    # The holder is killed without releasing the lock
+    code = ("import os; from MPCO_Model.data.sharedResults import _catalog_lock\n"
+            f"with _catalog_lock('{prefix}'):\n"
+            "    os._exit(1)\n")
+    subprocess.run([sys.executable, '-c', code], env={**os.environ, 'PYTHONPATH': SRC}, check=False)
+    with _catalog_lock(prefix, timeout=0.5):
+        pass
@@ -0,0 +1,58 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from MPCO_Model.data.mpcoFiles import partition_files
+from MPCO_Model.data.snapshot import SnapshotDataSet, read_snapshot, snapshot_path, write_snapshot
+from MPCO_Model.data.synthetic import SyntheticDataSet
+
+
+@pytest.fixture
+def model_copy(synthetic_model, tmp_path):
+    folder_path, stories = synthetic_model
+    copy = str(tmp_path / 'model')
+    shutil.copytree(folder_path, copy)
+    return copy, stories
+
+
+def test_snapshot_round_trip(model_copy):
+    folder_path, stories = model_copy
+    dataset = SyntheticDataSet(folder_path, stories)
+    assert write_snapshot(dataset) == snapshot_path(folder_path)
+
+    snapshot = read_snapshot(folder_path)
+    assert snapshot.name == dataset.info.name
+    assert snapshot.model_stages == dataset.model_stages
+    assert snapshot.masses_available
+    assert snapshot.partitions == partition_files(dataset)
+    pd.testing.assert_frame_equal(snapshot.time, dataset.time, check_index_type=False)
+    assert snapshot.selection_set.keys() == dataset.selection_set.keys()
+    for set_id, entry in dataset.selection_set.items():
+        assert snapshot.selection_set[set_id]['SET_NAME'] == entry['SET_NAME']
+        np.testing.assert_array_equal(snapshot.selection_set[set_id]['NODES'], entry['NODES'])
+
+    restored = SnapshotDataSet(snapshot)
+    assert restored.results_partitions == dict(enumerate(partition_files(dataset)))
+    assert restored._dataset is None
+
+
+def test_snapshot_invalidated_by_file_changes(model_copy):
+    folder_path, stories = model_copy
+    write_snapshot(SyntheticDataSet(folder_path, stories))
+    assert read_snapshot(folder_path) is not None
+
+    mass_file = os.path.join(folder_path, 'results', 'nodeMassCoord.out')
+    stat = os.stat(mass_file)
+    os.utime(mass_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_snapshot(folder_path) is None
+    assert read_snapshot(folder_path, recorder_name='other') is None
+
+
+def test_unreadable_snapshot_is_ignored(model_copy):
+    folder_path, _ = model_copy
+    with open(snapshot_path(folder_path), 'wb') as f:
+        f.write(b'not an npz')
+    assert read_snapshot(folder_path) is None
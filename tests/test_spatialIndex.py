@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from MPCO_Model.data.synthetic import node_coordinates, synthetic_stories
+from MPCO_Model.mass.spatialIndex import SpatialIndex
+
+
+@pytest.fixture(scope='module')
+def nodes():
+    stories = synthetic_stories(5, story_height=3.5)
+    node_ids, xyz = node_coordinates(2000, stories, seed=3)
+    return node_ids, xyz, stories
+
+
+@pytest.fixture(scope='module')
+def index(nodes):
+    node_ids, xyz, _ = nodes
+    return SpatialIndex(node_ids, xyz, cell_size=16)
+
+
+def test_nearest_and_radius(nodes, index):
+    node_ids, xyz, _ = nodes
+    points = np.array([[5.0, 5.0, 3.5], [29.0, 1.0, 17.5]])
+    distances = np.linalg.norm(xyz[None, :, :] - points[:, None, :], axis=2)
+    np.testing.assert_array_equal(index.nearest(points), node_ids[np.argmin(distances, axis=1)])
+    np.testing.assert_array_equal(index.nearest(points[0], max_distance=1e-9), -1)
+    np.testing.assert_array_equal(index.radius(points[0], 4.0), node_ids[distances[0] <= 4.0])
+
+
+def test_coordinates(nodes, index):
+    node_ids, xyz, _ = nodes
+    np.testing.assert_array_equal(index.coordinates(node_ids[[7, 3]]), xyz[[7, 3]])
+    with pytest.raises(KeyError):
+        index.coordinates([0])
+
+
+def test_slabs_and_story_bands(nodes, index):
+    node_ids, xyz, stories = nodes
+    z = xyz[:, 2]
+    np.testing.assert_array_equal(index.slab(3.0, 7.0), node_ids[(z >= 3.0) & (z <= 7.0)])
+    np.testing.assert_array_equal(index.slab(10.0, 20.0, axis=0), node_ids[(xyz[:, 0] >= 10.0) & (xyz[:, 0] <= 20.0)])
+    np.testing.assert_array_equal(index.level(stories[2]), node_ids[z == stories[2]])
+    np.testing.assert_array_equal(index.story_band(stories, 0), node_ids[z <= stories[0]])
+    for story in range(1, len(stories)):
+        expected = node_ids[(z > stories[story - 1]) & (z <= stories[story])]
+        np.testing.assert_array_equal(index.story_band(stories, story), expected)
+
+
+def test_box(nodes, index):
+    node_ids, xyz, _ = nodes
+    low, high = np.array([4.0, 11.0, 3.0]), np.array([17.0, 23.0, 14.0])
+    expected = node_ids[np.all((xyz >= low) & (xyz <= high), axis=1)]
+    np.testing.assert_array_equal(index.box(low, high), expected)
+    np.testing.assert_array_equal(index.box([-np.inf, -np.inf, 7.0], np.inf), node_ids[xyz[:, 2] >= 7.0])
+
+
+@pytest.mark.parametrize('normal', [
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, -2.0],
+    [1.0, 1.0, 0.0],
+    [0.3, -0.2, 1.0],
+    # Nearly horizontal: over a 30 m plan it drifts 3 mm away from the z = 3.5 slab
+    [1e-4, 0.0, 1.0],
+])
+def test_near_plane_matches_brute_force(nodes, index, normal):
+    node_ids, xyz, _ = nodes
+    point = np.array([15.0, 15.0, 3.5])
+    tolerance = 1e-3 if normal[0] == 1e-4 else 0.8
+    unit = np.asarray(normal) / np.linalg.norm(normal)
+    expected = node_ids[np.abs((xyz - point) @ unit) <= tolerance]
+    np.testing.assert_array_equal(index.near_plane(point, normal, tolerance), expected)
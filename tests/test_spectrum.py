@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from scipy import signal
+
+from MPCO_Model.analysis.spectrum import floor_response_spectra, period_grid, response_spectrum, uniform_record
+from MPCO_Model.core.model import Model
+
+
+def record(n=800, dt=0.01, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * dt
+    return t, np.sin(2 * np.pi * 1.3 * t) * np.exp(-0.3 * t) + 0.2 * rng.normal(size=n)
+
+
+def reference(acceleration, t, period, zeta):
+    # Exact response to the piecewise-linear record (first-order hold)
+    omega = 2 * np.pi / period
+    system = signal.StateSpace([[0, 1], [-omega ** 2, -2 * zeta * omega]], [[0], [-1]],
+                               [[1, 0], [0, 1], [-omega ** 2, -2 * zeta * omega]], [[0], [0], [0]])
+    _, y, _ = signal.lsim(system, acceleration, t, interp=True)
+    return np.abs(y).max(axis=0)
+
+
+def test_nigam_jennings_matches_state_space():
+    t, acceleration = record()
+    periods, damping = np.array([0.1, 0.5, 1.0, 2.5]), np.array([0.0, 0.05, 0.2])
+    spectrum = response_spectrum(acceleration, periods, damping=damping, dt=0.01)
+    assert spectrum.Sa.shape == (3, 4)
+    for i, zeta in enumerate(damping):
+        for j, period in enumerate(periods):
+            Sd, Sv, Sa = reference(acceleration, t, period, zeta)
+            np.testing.assert_allclose(spectrum.Sd[i, j], Sd, rtol=1e-6)
+            np.testing.assert_allclose(spectrum.Sv[i, j], Sv, rtol=1e-6)
+            np.testing.assert_allclose(spectrum.Sa[i, j], Sa, rtol=1e-6)
+    np.testing.assert_allclose(spectrum.PSa, spectrum.Sd * (2 * np.pi / periods) ** 2)
+
+
+def test_invalid_oscillators():
+    _, acceleration = record(50)
+    with pytest.raises(ValueError):
+        response_spectrum(acceleration, [0.0, 1.0], dt=0.01)
+    with pytest.raises(ValueError):
+        response_spectrum(acceleration, [1.0], damping=1.0, dt=0.01)
+
+
+def test_variable_time_step_is_resampled():
+    t = np.concatenate([np.arange(0, 1, 0.01), 1 + np.arange(0, 1, 0.02)])
+    acceleration, dt = uniform_record(np.sin(t), time=t)
+    assert dt == pytest.approx(0.01)
+    np.testing.assert_allclose(acceleration, np.sin(np.arange(0, t[-1] + 0.005, 0.01)), atol=1e-3)
+
+
+def test_floor_spectra_match_single_records():
+    records = np.stack([record(seed=s)[1] for s in range(3)])
+    periods = period_grid([0.37], [0.2, 1.0])
+    np.testing.assert_allclose(periods, [0.2, 0.37, 1.0])
+    spectra = floor_response_spectra(records, periods, damping=[0.02, 0.05], dt=0.01, max_workers=2)
+    assert spectra.Sa.shape == (3, 2, 3)
+    for floor, acceleration in enumerate(records):
+        single = response_spectrum(acceleration, periods, damping=[0.02, 0.05], dt=0.01)
+        np.testing.assert_allclose(spectra.Sa[floor], single.Sa)
+
+
+def test_model_floor_spectra_without_stories(dataset):
+    # The modal periods are read from modal.txt, no mass file or stories needed
+    model = Model(dataset)
+    assert model.mass is None
+    spectra = model.floor_spectra([1, 2], direction=0, periods=[0.1, 1.0], model_stage='MODEL_STAGE[5]')
+    np.testing.assert_allclose(spectra.marks, model.modal_report().periods(3))
+    assert spectra.Sa.shape == (2, 1, 5)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from MPCO_Model.analysis.storyOperator import StoryOperator
+from MPCO_Model.analysis.storyResponse import story_drifts, story_shears
+from MPCO_Model.data.nodalResults import nodal_block
+from MPCO_Model.data.synthetic import node_coordinates
+
+STAGE = 'MODEL_STAGE[5]'
+
+
+@pytest.fixture
+def operator(synthetic_model):
+    _, stories = synthetic_model
+    node_ids, xyz = node_coordinates(120, stories)
+    return StoryOperator(node_ids, xyz[:, 2], stories, weights=np.ones(node_ids.size))
+
+
+def test_apply_matches_masks(operator):
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(operator.n_nodes, 3, 7))
+    levels = operator.index.story_of_node
+    expected = np.stack([values[levels == i].sum(axis=0) for i in range(operator.n_levels)])
+    np.testing.assert_allclose(operator.apply(values), expected)
+
+    subset = operator.node_ids[::3]
+    np.testing.assert_allclose(operator.apply(values[::3], subset),
+                               np.stack([values[::3][levels[::3] == i].sum(axis=0) for i in range(operator.n_levels)]))
+    with pytest.raises(KeyError):
+        operator.positions([10 ** 9])
+
+
+def test_shears_and_moments(operator):
+    # One unit force per node: the shear of a story is the number of nodes on its upper level and above
+    forces = np.ones((operator.n_nodes, 1))
+    counts = operator.index.counts
+    shears = operator.story_shears(forces)[:, 0]
+    assert shears.shape == (operator.n_levels - 1,)
+    np.testing.assert_allclose(shears, np.cumsum(counts[::-1])[::-1][1:])
+
+    moments = operator.overturning_moments(forces)[:, 0]
+    for i, level in enumerate(operator.stories):
+        above = operator.z > level
+        np.testing.assert_allclose(moments[i], np.sum(operator.z[above] - level))
+
+
+def test_shear_convention_matches_stream(dataset, synthetic_model, operator):
+    _, stories = synthetic_model
+    levels = list(range(1, len(stories) + 1))
+    node_ids, block = nodal_block(dataset, 'REACTION_FORCE', STAGE, node_ids=operator.node_ids)
+    streamed = story_shears(dataset, stories, levels, 'REACTION_FORCE', 0, STAGE, chunk_size=16)
+    np.testing.assert_allclose(streamed.stories, operator.stories[1:])
+    np.testing.assert_allclose(streamed.histories, operator.story_shears(block, node_ids)[:, 0], atol=1e-9)
+
+
+def test_drifts_match_block(dataset, synthetic_model, operator):
+    _, stories = synthetic_model
+    levels = list(range(1, len(stories) + 1))
+    node_ids, block = nodal_block(dataset, 'DISPLACEMENT', STAGE, node_ids=operator.node_ids)
+    mean = operator.weighted_average(block, node_ids)[:, 0]
+    expected = np.diff(mean, axis=0) / np.diff(stories)[:, None]
+    drifts = story_drifts(dataset, stories, levels, 0, STAGE, chunk_size=16)
+    np.testing.assert_allclose(drifts.histories, expected, atol=1e-12)
+    np.testing.assert_allclose(drifts.envelope['abs_max'], np.abs(expected).max(axis=1))
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from MPCO_Model.analysis.storyResponse import story_drifts
+
+
+def _level_means(dataset, n_levels, direction, stage='MODEL_STAGE[5]'):
+    means = []
+    for level in range(n_levels):
+        df = dataset.nodes.get_nodal_results('DISPLACEMENT', stage, selection_set_id=level + 1)
+        means.append(df[direction].groupby(level='step').mean().to_numpy())
+    return np.array(means)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 1000])
+def test_story_drifts_match_level_means(dataset, synthetic_model, chunk_size):
+    _, stories = synthetic_model
+    level_sets = list(range(1, len(stories) + 1))
+    response = story_drifts(dataset, stories, level_sets, direction=0, model_stage='MODEL_STAGE[5]',
+                            chunk_size=chunk_size)
+
+    expected = np.diff(_level_means(dataset, len(stories), 0), axis=0) / np.diff(stories)[:, None]
+    np.testing.assert_allclose(response.histories, expected)
+    np.testing.assert_allclose(response.stories, stories[1:])
+    np.testing.assert_allclose(response.time, dataset.time['TIME'].to_numpy())
+    np.testing.assert_allclose(response.envelope['max'].to_numpy(), expected.max(axis=1))
+    np.testing.assert_allclose(response.envelope['min'].to_numpy(), expected.min(axis=1))
+
+
+def test_story_drifts_validate_levels(dataset, synthetic_model):
+    _, stories = synthetic_model
+    with pytest.raises(ValueError, match='one selection set per level'):
+        story_drifts(dataset, stories, [1, 2], direction=0, model_stage='MODEL_STAGE[5]')
+    with pytest.raises(ValueError, match='ascending'):
+        story_drifts(dataset, stories[::-1], list(range(1, len(stories) + 1)), direction=0,
+                     model_stage='MODEL_STAGE[5]')
@@ -0,0 +1,79 @@
+import importlib.util
+import os
+
+import h5py
+import numpy as np
+
+from MPCO_Model.data.mpcoFiles import NODAL_RESULTS_PATH, count_steps, partition_files, step_keys, step_time
+from MPCO_Model.data.synthetic import SyntheticDataSet, write_synthetic_model
+from MPCO_Model.mass.dynamicMass import Masses
+from MPCO_Model.mass.modalReport import ModalReport
+
+STAGE = 'MODEL_STAGE[5]'
+RESULTS = ('DISPLACEMENT', 'VELOCITY', 'ACCELERATION', 'REACTION_FORCE')
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+def test_layout_matches_readers(tmp_path):
+    folder_path = str(tmp_path)
+    stories = write_synthetic_model(folder_path, n_nodes=50, n_stories=3, n_steps=6, n_modes=4, partitions=2)
+    dataset = SyntheticDataSet(folder_path, stories)
+
+    files = partition_files(dataset)
+    assert [os.path.basename(f) for f in files] == ['results.part-0.mpco', 'results.part-1.mpco']
+
+    all_ids = []
+    for filepath in files:
+        with h5py.File(filepath, 'r') as f:
+            for results_name in RESULTS:
+                group = f[NODAL_RESULTS_PATH.format(model_stage=STAGE, results_name=results_name)]
+                ids = group['ID'][()]
+                assert ids.ndim == 2 and ids.shape[1] == 1 and np.issubdtype(ids.dtype, np.integer)
+                data = group['DATA']
+                keys = step_keys(data)
+                assert keys == [f'STEP_{i}' for i in range(6)]
+                assert count_steps(data) == 6
+                assert all(data[k].shape == (ids.shape[0], 3) for k in keys)
+                np.testing.assert_allclose([step_time(data[k]) for k in keys], np.arange(6) * 0.01)
+            all_ids.append(ids.ravel())
+    # Every node is in exactly one partition
+    np.testing.assert_array_equal(np.sort(np.concatenate(all_ids)), np.arange(1, 51))
+
+    np.testing.assert_allclose(dataset.time.loc[STAGE]['TIME'], np.arange(6) * 0.01)
+    np.testing.assert_array_equal(dataset.selection_set[0]['NODES'], np.arange(1, 51))
+
+    # The mass file is aligned with the MPCO nodes and the level selection sets
+    masses = Masses(folder_path, stories=stories, use_cache=False)._get_masses()
+    np.testing.assert_array_equal(masses['nodeID'], np.arange(1, 51))
+    z = masses.set_index('nodeID')['zCrd']
+    for level, elevation in enumerate(stories):
+        np.testing.assert_allclose(z.loc[dataset.selection_set[level + 1]['NODES']], elevation)
+
+    report = ModalReport.load(os.path.join(folder_path, 'modal.txt'))
+    assert len(report) == 4
+    assert np.all(np.diff(report.periods()) < 0)
+
+
+def _run_benchmarks_module():
+    spec = importlib.util.spec_from_file_location('run_benchmarks', os.path.join(BENCHMARKS, 'run_benchmarks.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_benchmarks_save_and_compare(tmp_path, capsys):
+    run_benchmarks = _run_benchmarks_module()
+    baseline = str(tmp_path / 'baseline.json')
+    args = ['--nodes', '60', '--stories', '3', '--steps', '8', '--modes', '3', '--repeat', '1',
+            '--baseline', baseline, '--workdir', str(tmp_path / 'model')]
+    os.makedirs(tmp_path / 'model')
+
+    assert run_benchmarks.main(args + ['--save-baseline']) == 0
+    assert os.path.exists(baseline)
+    # A tolerance large enough that timing noise never fails the smoke test
+    assert run_benchmarks.main(args + ['--tolerance', '1000', '--output', str(tmp_path / 'run.json')]) == 0
+    assert 'No regressions against the baseline.' in capsys.readouterr().out
+
+    slower = {'case': {'seconds': 1.0, 'peak_mb': 10.0}}
+    assert run_benchmarks.compare(slower, {'case': {'seconds': 0.1, 'peak_mb': 10.0}}, 0.25) == [
+        'case: 1000.0 ms vs baseline 100.0 ms']
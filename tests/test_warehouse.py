@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from MPCO_Model.core.model import Model
+from MPCO_Model.data.warehouse import ResultsWarehouse
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    with ResultsWarehouse(str(tmp_path / 'results.h5'), chunk_size=16) as warehouse:
+        yield warehouse
+
+
+def test_curves_round_trip(warehouse):
+    rng = np.random.default_rng(0)
+    stored = {}
+    for model in ('A', 'B'):
+        for direction in (1, 2):
+            x, y = np.cumsum(rng.random(30 + direction)), rng.random(30 + direction)
+            warehouse.add_curve(model, 'pushover', x, y, 'MODEL_STAGE[5]', selection_set_id=3, direction=direction,
+                                results_name='DISPLACEMENT', selection_set_id_x=4)
+            stored[model, direction] = (x, y)
+    warehouse.add_curve('A', 'time_history', [0.0, 0.1], [1.0, 2.0], 'MODEL_STAGE[6]', results_name='ACCELERATION')
+
+    for (model, direction), (x, y) in stored.items():
+        curve = warehouse.curve(model, direction=direction)
+        np.testing.assert_array_equal(curve['x_array'], x)
+        np.testing.assert_array_equal(curve['y_array'], y)
+    assert len(warehouse.index(kind='pushover', model=['A', 'B'])) == 4
+    assert len(warehouse.index(model_stage='MODEL_STAGE[6]')) == 1
+    with pytest.raises(KeyError):
+        warehouse.curve('A')
+    with pytest.raises(KeyError, match='Unknown filter'):
+        warehouse.index(unknown=1)
+
+    index, x, y = warehouse.stacked(kind='pushover', direction=1)
+    assert list(index['model']) == ['A', 'B']
+    assert x.shape == (2, 31)
+    np.testing.assert_array_equal(y[1], stored['B', 1][1])
+
+
+def test_latest_copy_wins(warehouse):
+    warehouse.add_curve('A', 'pushover', [0.0, 1.0], [0.0, 1.0], 'MODEL_STAGE[5]')
+    warehouse.add_curve('A', 'pushover', [0.0, 1.0, 2.0], [0.0, 2.0, 3.0], 'MODEL_STAGE[5]')
+    np.testing.assert_array_equal(warehouse.curve('A')['y_array'], [0.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        warehouse.add_curve('A', 'pushover', [0.0], [0.0, 1.0], 'MODEL_STAGE[5]')
+    with pytest.raises(ValueError):
+        warehouse.add_curve('A', 'modal', [0.0], [0.0], 'MODEL_STAGE[5]')
+
+
+def test_masses_and_periods_replace_per_model(warehouse, tmp_path):
+    lumped = pd.DataFrame({'story': [3.0, 6.0], 'Mx': [1.0, 2.0], 'My': [1.0, 2.0], 'Mz': [0.0, 0.0],
+                           'Mrx': [0.0, 0.0], 'Mry': [0.0, 0.0], 'Mrz': [0.0, 0.0]})
+    warehouse.add_payload('A', {'curves': [], 'masses': lumped, 'periods': [1.2, 0.4, 0.2]})
+    warehouse.add_payload('B', {'curves': [], 'periods': [0.9]})
+    warehouse.add_periods('A', [1.1, 0.3])
+
+    np.testing.assert_array_equal(warehouse.periods('A')['period'], [1.1, 0.3])
+    np.testing.assert_array_equal(warehouse.periods('B')['mode'], [1])
+    np.testing.assert_array_equal(warehouse.masses('A')['Mx'], [1.0, 2.0])
+    assert warehouse.masses('B').empty
+    assert warehouse.models() == ['A', 'B']
+
+    warehouse.close()
+    with ResultsWarehouse(str(tmp_path / 'results.h5'), mode='r') as reopened:
+        assert reopened.models() == ['A', 'B']
+
+
+def test_long_names_are_rejected(warehouse):
+    name = 'é' * 64
+    warehouse.add_curve(name, 'pushover', [0.0], [1.0], 'MODEL_STAGE[5]')
+    assert warehouse.models() == [name]
+
+    # 'x' + 64 'é' is 129 bytes: cut at 128 it would not decode, and would collide with a shorter name
+    for long_name in ('x' + name, 'a' * 129):
+        with pytest.raises(ValueError, match='at most 128 bytes'):
+            warehouse.add_curve(long_name, 'pushover', [0.0], [1.0], 'MODEL_STAGE[5]')
+        with pytest.raises(ValueError, match='at most 128 bytes'):
+            warehouse.add_periods(long_name, [1.0])
+    with pytest.raises(ValueError, match='at most 64 bytes'):
+        warehouse.add_curve('A', 'pushover', [0.0], [1.0], 'S' * 65)
+    # Nothing of the rejected curves was written
+    assert warehouse.file['curves/x'].shape == (1,)
+    assert warehouse.models() == [name]
+
+
+def test_model_payload_round_trip(dataset, synthetic_model, warehouse):
+    _, stories = synthetic_model
+    model = Model(dataset, stories=stories)
+    warehouse.add_model(model, pushovers=[(2, 1, 1)], time_histories=[('DISPLACEMENT', 3, 0)], n_periods=4)
+    name = model.name
+
+    pushover = model.plot.extract_pushover(2, 1, 1)
+    stored = warehouse.curve(name, 'pushover', selection_set=2, selection_set_x=1, direction=1)
+    np.testing.assert_array_equal(stored['x_array'], pushover['x_array'])
+    np.testing.assert_array_equal(stored['y_array'], pushover['y_array'])
+
+    history = model.plot.extract_time_history('DISPLACEMENT', 3, 0)
+    stored = warehouse.curve(name, 'time_history', results_name='DISPLACEMENT', selection_set=3)
+    np.testing.assert_array_equal(stored['x_array'], history['x_array'])
+    np.testing.assert_array_equal(stored['y_array'], history['y_array'])
+
+    np.testing.assert_allclose(warehouse.periods(name)['period'], model.modal_report().periods(4))
+    lumped = model.mass._aggregated_mass_lumped()
+    np.testing.assert_allclose(warehouse.masses(name)['Mx'], lumped['Mx'])
+    np.testing.assert_allclose(warehouse.masses(name)['story'], lumped['story'])
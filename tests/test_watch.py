@@ -0,0 +1,50 @@
+import h5py
+import numpy as np
+
+from MPCO_Model.data.mpcoFiles import NODAL_RESULTS_PATH, NodalResultStream, count_steps, partition_files
+from MPCO_Model.data.synthetic import SyntheticDataSet, write_synthetic_model
+from MPCO_Model.plotting.watch import CurveWatcher, WatchedAxis
+
+STAGE = 'MODEL_STAGE[5]'
+PATH = NODAL_RESULTS_PATH.format(model_stage=STAGE, results_name='DISPLACEMENT')
+
+
+def append_steps(dataset, n_new):
+    for filepath in partition_files(dataset):
+        with h5py.File(filepath, 'a') as f:
+            data = f[PATH]['DATA']
+            n = count_steps(data)
+            for step in range(n, n + n_new):
+                block = data.create_dataset(f"STEP_{step}", data=np.full(data['STEP_0'].shape, float(step)))
+                block.attrs['TIME'] = np.array([0.01 * step])
+                block.attrs['STEP'] = np.array([step])
+
+
+def test_count_steps(dataset):
+    with h5py.File(partition_files(dataset)[0], 'r') as f:
+        data = f[PATH]['DATA']
+        assert count_steps(data) == 40
+        assert count_steps(data, known=25) == 40
+        # A count above the steps written (rewritten file) is discarded
+        assert count_steps(data, known=100) == 40
+
+
+def test_watcher_reads_new_steps_only(tmp_path):
+    stories = write_synthetic_model(str(tmp_path), n_nodes=40, n_stories=3, n_steps=20, partitions=2)
+    dataset = SyntheticDataSet(str(tmp_path), stories)
+    watcher = CurveWatcher(dataset, STAGE, WatchedAxis('TIME'),
+                           WatchedAxis('DISPLACEMENT', selection_set_id=0, direction=0, values_operation='Max'))
+    assert watcher.poll() == 20
+    assert watcher.poll() == 0
+
+    append_steps(dataset, 5)
+    assert watcher.poll() == 5
+    assert watcher.n_steps == 25
+    np.testing.assert_allclose(watcher.y_array[20:], np.arange(20, 25))
+    np.testing.assert_allclose(watcher.x_array[20:], 0.01 * np.arange(20, 25))
+
+    # Same values as a full read
+    (_, time, values), = NodalResultStream(dataset, STAGE, 'DISPLACEMENT', [dataset.selection_set[0]['NODES']],
+                                           operation='Max')
+    np.testing.assert_allclose(watcher.x_array, time)
+    np.testing.assert_allclose(watcher.y_array, values[0, 0])